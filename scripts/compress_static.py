@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Write precompressed .gz and .br siblings of the unfold_modal static assets.
+
+Run after editing any CSS/JS file under unfold_modal/static (requires the
+``brotli`` package):
+
+    python scripts/compress_static.py
+
+``--check`` only verifies that every sibling decompresses to its source
+(exit code 1 otherwise), e.g. for CI.
+"""
+
+import argparse
+import gzip
+import sys
+from pathlib import Path
+
+import brotli
+
+STATIC_ROOT = Path(__file__).resolve().parent.parent / "unfold_modal" / "static"
+EXTENSIONS = {".css", ".js"}
+
+
+def iter_assets():
+    for path in sorted(STATIC_ROOT.rglob("*")):
+        if path.suffix in EXTENSIONS and path.is_file():
+            yield path
+
+
+def compressed_variants(data):
+    # mtime=0 keeps the gzip output reproducible
+    return {
+        ".gz": gzip.compress(data, compresslevel=9, mtime=0),
+        ".br": brotli.compress(data, mode=brotli.MODE_TEXT, quality=11),
+    }
+
+
+def decompress(suffix, data):
+    return gzip.decompress(data) if suffix == ".gz" else brotli.decompress(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args(argv)
+
+    stale = []
+    for path in iter_assets():
+        source = path.read_bytes()
+        for suffix, data in compressed_variants(source).items():
+            target = path.with_name(path.name + suffix)
+            if args.check:
+                if not target.exists() or decompress(suffix, target.read_bytes()) != source:
+                    stale.append(target)
+            elif not target.exists() or target.read_bytes() != data:
+                target.write_bytes(data)
+                print(f"Wrote {target.relative_to(STATIC_ROOT)}")
+
+    for target in stale:
+        print(f"Out of date: {target.relative_to(STATIC_ROOT)}", file=sys.stderr)
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
 from django.contrib import admin
 
 from unfold.admin import ModelAdmin, TabularInline
+from unfold_modal.mixins import (
+    AutocompleteCacheMixin,
+    PopupAutocompleteMixin,
+    PopupConditionalGetMixin,
+    PopupLookupCacheMixin,
+)
 
 from .models import (
     Author,
@@ -29,13 +35,17 @@ class TagAdmin(ModelAdmin):
 
 
 @admin.register(Author)
-class AuthorAdmin(ModelAdmin):
+class AuthorAdmin(AutocompleteCacheMixin, ModelAdmin):
+    """Autocomplete target; results are cached by CachedAutocompleteJsonView."""
+
     list_display = ["name"]
     search_fields = ["name"]
 
 
 @admin.register(Publisher)
-class PublisherAdmin(ModelAdmin):
+class PublisherAdmin(PopupLookupCacheMixin, ModelAdmin):
+    """raw_id_fields target; lookup pages are cached server-side."""
+
     list_display = ["name", "address"]
     search_fields = ["name"]
 
@@ -86,21 +96,27 @@ class ChapterAdmin(ModelAdmin):
 
 
 @admin.register(Country)
-class CountryAdmin(ModelAdmin):
+class CountryAdmin(PopupConditionalGetMixin, ModelAdmin):
     """
     Level C admin for nested modal testing.
     Needs search_fields for potential autocomplete usage.
+    Popup change views answer revalidation with 304 (no version field on
+    the model, so the name is used as version).
     """
 
     list_display = ["name"]
     search_fields = ["name"]
 
+    def get_popup_version(self, request, obj):
+        return obj.name
+
 
 @admin.register(City)
-class CityAdmin(ModelAdmin):
+class CityAdmin(PopupAutocompleteMixin, ModelAdmin):
     """
     Level B admin for nested modal testing.
-    FK to Country uses normal select (has add link to trigger modal).
+    FK to Country uses normal select (has add link to trigger modal);
+    in popups it becomes an autocomplete above the row threshold.
     """
 
     list_display = ["name", "country"]
@@ -124,10 +140,11 @@ class VenueAdmin(ModelAdmin):
 
 
 @admin.register(Event)
-class EventAdmin(ModelAdmin):
+class EventAdmin(PopupAutocompleteMixin, ModelAdmin):
     """
     Long-form admin to exercise iframe scrolling.
     Many fields organized in fieldsets.
+    Large venue/category selects become autocompletes in popups.
     """
 
     list_display = ["title", "date", "start_time", "venue", "organizer", "is_public"]
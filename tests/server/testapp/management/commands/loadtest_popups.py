@@ -0,0 +1,160 @@
+"""Concurrent load test of the popup endpoints against a running local server."""
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from testapp.models import Country
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of sorted ``values``."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+class Session:
+    """An admin session with its own cookie jar."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+
+    @property
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, path, data=None):
+        """Send a request and return (status code, final URL)."""
+        body = None
+        headers = {"Referer": self.base_url + path}
+        if data is not None:
+            body = urlencode({"csrfmiddlewaretoken": self.csrf_token, **data}).encode()
+        request = Request(self.base_url + path, data=body, headers=headers)
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status, response.url
+        except HTTPError as exc:
+            return exc.code, exc.url
+
+    def login(self, username, password):
+        login_url = reverse("admin:login")
+        self.request(login_url)
+        _, url = self.request(
+            f"{login_url}?next={reverse('admin:index')}",
+            {"username": username, "password": password},
+        )
+        return login_url not in url
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the popup endpoints (config.js, add/change popups, lookups, "
+        "popup_response) with concurrent admin sessions and report throughput "
+        "and latency percentiles. Start the server first, e.g. "
+        "`manage.py seed_testapp --superuser loadtest:loadtest` and "
+        "`manage.py runserver`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--username", default="loadtest")
+        parser.add_argument("--password", default="loadtest")
+        parser.add_argument("--sessions", type=int, default=20)
+        parser.add_argument(
+            "--iterations", type=int, default=10, help="Scenario runs per session."
+        )
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def get_scenario(self):
+        """Return the (name, path, data) requests run by every iteration."""
+        country = Country.objects.order_by("pk").first()
+        if country is None:
+            raise CommandError("No countries found; run seed_testapp first.")
+
+        return [
+            ("config.js", reverse("unfold_modal:config_js"), None),
+            ("add popup", reverse("admin:testapp_city_add") + "?_popup=1", None),
+            (
+                "change popup",
+                reverse("admin:testapp_country_change", args=[country.pk]) + "?_popup=1",
+                None,
+            ),
+            (
+                "lookup",
+                reverse("admin:testapp_publisher_changelist") + "?_to_field=id&_popup=1",
+                None,
+            ),
+            (
+                "popup_response",
+                reverse("admin:testapp_tag_add") + "?_popup=1",
+                {"name": "Load test", "_popup": "1"},
+            ),
+        ]
+
+    def run_session(self, scenario, options):
+        """Log in and run the scenario; return (name, seconds, ok) samples."""
+        session = Session(options["base_url"], options["timeout"])
+        if not session.login(options["username"], options["password"]):
+            raise CommandError(f"Login failed for {options['username']!r}")
+
+        samples = []
+        for _ in range(options["iterations"]):
+            for name, path, data in scenario:
+                start = time.perf_counter()
+                status, _ = session.request(path, data)
+                samples.append((name, time.perf_counter() - start, status == 200))
+        return samples
+
+    def handle(self, *args, **options):
+        scenario = self.get_scenario()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["sessions"]) as executor:
+            futures = [
+                executor.submit(self.run_session, scenario, options)
+                for _ in range(options["sessions"])
+            ]
+            samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter() - start
+
+        self.report(samples, elapsed, options["sessions"])
+
+    def report(self, samples, elapsed, sessions):
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        for name, seconds, ok in samples:
+            timings[name].append(seconds * 1000)
+            errors[name] += not ok
+
+        self.stdout.write(
+            f"{len(samples)} requests from {sessions} sessions in {elapsed:.2f}s "
+            f"({len(samples) / elapsed:.1f} req/s)"
+        )
+        self.stdout.write(
+            f"{'endpoint':<16} {'count':>6} {'errors':>6} {'mean':>8} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  (ms)"
+        )
+        for name, values in timings.items():
+            values.sort()
+            self.stdout.write(
+                f"{name:<16} {len(values):>6} {errors[name]:>6} "
+                f"{sum(values) / len(values):>8.1f} {percentile(values, 50):>8.1f} "
+                f"{percentile(values, 90):>8.1f} {percentile(values, 99):>8.1f} "
+                f"{values[-1]:>8.1f}"
+            )
@@ -0,0 +1,135 @@
+"""Seed the test app with large datasets for scaling checks."""
+
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from testapp.models import (
+    Author,
+    Book,
+    Category,
+    Chapter,
+    City,
+    Country,
+    Publisher,
+    Tag,
+)
+
+
+def batched(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed large volumes of test data (e.g. --publishers 1000000 "
+        "--cities 50000 --chapters-per-book 500) to surface scaling issues "
+        "in lookup modals, big FK selects and deep inline formsets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--publishers", type=int, default=10_000)
+        parser.add_argument("--countries", type=int, default=200)
+        parser.add_argument("--cities", type=int, default=5_000)
+        parser.add_argument("--authors", type=int, default=1_000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--tags", type=int, default=200)
+        parser.add_argument("--books", type=int, default=100)
+        parser.add_argument("--chapters-per-book", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument(
+            "--clear", action="store_true", help="Delete existing test app data first."
+        )
+        parser.add_argument(
+            "--superuser",
+            metavar="USERNAME:PASSWORD",
+            help="Create (or reset) a superuser, e.g. for loadtest_popups.",
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+
+        if options["clear"]:
+            for model in (Chapter, Book, City, Country, Publisher, Author, Tag, Category):
+                model.objects.all().delete()
+
+        self.seed(Category, options["categories"], lambda i: Category(name=f"Category {i}"))
+        self.seed(Tag, options["tags"], lambda i: Tag(name=f"Tag {i}"))
+        self.seed(Author, options["authors"], lambda i: Author(name=f"Author {i}"))
+        self.seed(
+            Publisher,
+            options["publishers"],
+            lambda i: Publisher(name=f"Publisher {i}", address=f"{i} Main Street"),
+        )
+        self.seed(Country, options["countries"], lambda i: Country(name=f"Country {i}"))
+
+        country_ids = list(Country.objects.values_list("pk", flat=True))
+        if country_ids:
+            self.seed(
+                City,
+                options["cities"],
+                lambda i: City(
+                    name=f"City {i}", country_id=country_ids[i % len(country_ids)]
+                ),
+            )
+
+        self.seed_books(options["books"], options["chapters_per_book"])
+
+        if options["superuser"]:
+            username, _, password = options["superuser"].partition(":")
+            self.create_superuser(username, password)
+
+    def seed(self, model, count, build):
+        """Bulk-create ``count`` objects built by ``build(index)``."""
+        if count <= 0:
+            return
+        start = model.objects.count()
+        objects = (build(i) for i in range(start, start + count))
+        with transaction.atomic():
+            for batch in batched(objects, self.batch_size):
+                model.objects.bulk_create(batch)
+        self.stdout.write(f"Created {count} {model._meta.verbose_name_plural}")
+
+    def seed_books(self, count, chapters_per_book):
+        """Create books with related objects and ``chapters_per_book`` chapters each."""
+        if count <= 0:
+            return
+        category = Category.objects.first()
+        author = Author.objects.first()
+        publisher = Publisher.objects.first()
+        tags = list(Tag.objects.all()[:5])
+
+        start = Book.objects.count()
+        with transaction.atomic():
+            for i in range(start, start + count):
+                book = Book.objects.create(
+                    title=f"Book {i}",
+                    category=category,
+                    author=author,
+                    publisher=publisher,
+                )
+                book.tags.set(tags)
+                chapters = (
+                    Chapter(book=book, number=n, title=f"Chapter {n}", editor=author)
+                    for n in range(1, chapters_per_book + 1)
+                )
+                for batch in batched(chapters, self.batch_size):
+                    Chapter.objects.bulk_create(batch)
+        self.stdout.write(
+            f"Created {count} books with {chapters_per_book} chapters each"
+        )
+
+    def create_superuser(self, username, password):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(
+            username=username, defaults={"email": f"{username}@example.com"}
+        )
+        user.is_staff = user.is_superuser = True
+        user.set_password(password)
+        user.save()
+        self.stdout.write(f"Superuser {username!r} ready")
@@ -49,6 +49,10 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "unfold_modal.middleware.PopupPreloadMiddleware",
+    "unfold_modal.middleware.ModalRequestMiddleware",
+    "unfold_modal.middleware.ModalTraceMiddleware",
+    "unfold_modal.middleware.ModalProfilerMiddleware",
 ]
 
 # Allow admin pages to be displayed in iframes (for modal functionality)
@@ -77,6 +81,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # A file-based test database gives every live server thread its own
+        # connection, so concurrent sessions (loadtest_popups) can write
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
 
@@ -97,4 +104,16 @@ AUTH_PASSWORD_VALIDATORS = [
 
 STATIC_URL = "static/"
 
+# django-debug-toolbar with the modal chain panel (shown with runserver;
+# pytest-django runs with DEBUG = False, which hides the toolbar)
+INSTALLED_APPS += ["debug_toolbar"]
+MIDDLEWARE.insert(0, "debug_toolbar.middleware.DebugToolbarMiddleware")
+INTERNAL_IPS = ["127.0.0.1"]
+DEBUG_TOOLBAR_PANELS = [
+    "debug_toolbar.panels.timer.TimerPanel",
+    "debug_toolbar.panels.sql.SQLPanel",
+    "debug_toolbar.panels.templates.TemplatesPanel",
+    "unfold_modal.panels.ModalChainPanel",
+]
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
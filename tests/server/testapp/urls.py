@@ -1,7 +1,18 @@
+from debug_toolbar.toolbar import debug_toolbar_urls
 from django.contrib import admin
 from django.urls import include, path
 
+from unfold_modal.views import CachedAutocompleteJsonView
+
 urlpatterns = [
+    # Replaces the admin autocomplete view (same URL, matched first)
+    path(
+        "admin/autocomplete/",
+        admin.site.admin_view(CachedAutocompleteJsonView.as_view(admin_site=admin.site)),
+    ),
     path("admin/", admin.site.urls),
     path("unfold-modal/", include("unfold_modal.urls")),
 ]
+
+# Empty unless DEBUG = True (runserver)
+urlpatterns += debug_toolbar_urls()
@@ -0,0 +1,178 @@
+"""Tests for CachedAutocompleteJsonView (cached, short-circuited autocompletes)."""
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client
+
+from testapp.models import Author, Country, Publisher
+
+AUTOCOMPLETE_URL = "/admin/autocomplete/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def authors(db):
+    return [
+        Author.objects.create(name="Jane Smith"),
+        Author.objects.create(name="John Smithers"),
+        Author.objects.create(name="Ada Lovelace"),
+    ]
+
+
+def search(client, term, field="author", model="book", **params):
+    return client.get(
+        AUTOCOMPLETE_URL,
+        {"app_label": "testapp", "model_name": model, "field_name": field, "term": term}
+        | params,
+    )
+
+
+def author_queries(captured):
+    return [q["sql"] for q in captured.captured_queries if "testapp_author" in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestCachedAutocomplete:
+    """Test the autocomplete view installed by the test app."""
+
+    def test_results(self, admin_client, authors):
+        response = search(admin_client, "Smith")
+        assert response.status_code == 200
+        assert [r["text"] for r in response.json()["results"]] == [
+            "Jane Smith",
+            "John Smithers",
+        ]
+
+    def test_repeated_term_skips_queries(
+        self, admin_client, authors, django_assert_max_num_queries
+    ):
+        first = search(admin_client, "Smith")
+        with django_assert_max_num_queries(100) as captured:
+            second = search(admin_client, "Smith")
+        assert second.content == first.content
+        assert second["Content-Type"] == "application/json"
+        assert author_queries(captured) == []
+
+    def test_source_fields_are_cached_separately(
+        self, admin_client, authors, django_assert_max_num_queries
+    ):
+        search(admin_client, "Smith")
+        with django_assert_max_num_queries(100) as captured:
+            search(admin_client, "Smith", field="editor", model="chapter")
+        assert author_queries(captured)
+
+    def test_pages_are_cached_separately(self, admin_client, db):
+        Author.objects.bulk_create(Author(name=f"Smith {i:02}") for i in range(25))
+        first = search(admin_client, "Smith").json()
+        second = search(admin_client, "Smith", page=2).json()
+        assert first["pagination"]["more"] is True
+        assert second["pagination"]["more"] is False
+        assert len(first["results"]) == 20
+        assert len(second["results"]) == 5
+
+    def test_save_invalidates(self, admin_client, authors):
+        search(admin_client, "Smith")
+        Author.objects.create(name="Will Smith")
+        results = search(admin_client, "Smith").json()["results"]
+        assert "Will Smith" in [r["text"] for r in results]
+
+    def test_delete_invalidates(self, admin_client, authors):
+        search(admin_client, "Smith")
+        authors[0].delete()
+        results = search(admin_client, "Smith").json()["results"]
+        assert [r["text"] for r in results] == ["John Smithers"]
+
+    def test_empty_term_lists_all(self, admin_client, authors, settings):
+        settings.UNFOLD_MODAL_AUTOCOMPLETE_MIN_TERM_LENGTH = 3
+        assert len(search(admin_client, "").json()["results"]) == 3
+
+    def test_empty_term_is_cached(
+        self, admin_client, authors, django_assert_max_num_queries
+    ):
+        search(admin_client, "")
+        with django_assert_max_num_queries(100) as captured:
+            assert len(search(admin_client, "").json()["results"]) == 3
+        assert author_queries(captured) == []
+
+    def test_min_term_length_disabled(self, admin_client, authors, settings):
+        settings.UNFOLD_MODAL_AUTOCOMPLETE_MIN_TERM_LENGTH = 0
+        assert len(search(admin_client, "S").json()["results"]) == 2
+
+    @pytest.mark.parametrize("term", ["S", " S "])
+    def test_short_terms_short_circuit(
+        self, admin_client, authors, term, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(100) as captured:
+            response = search(admin_client, term)
+        assert response.json() == {"results": [], "pagination": {"more": False}}
+        assert author_queries(captured) == []
+
+    def test_permission_is_checked_before_cache(
+        self, admin_client, django_user_model, authors
+    ):
+        search(admin_client, "Smith")
+        user = django_user_model.objects.create_user(
+            username="staff", password="password", is_staff=True
+        )
+        client = Client()
+        client.force_login(user)
+        assert search(client, "Smith").status_code == 403
+        assert search(client, "S").status_code == 403
+
+    def test_users_do_not_share_entries(
+        self, admin_client, django_user_model, authors, django_assert_max_num_queries
+    ):
+        search(admin_client, "Smith")
+        user = django_user_model.objects.create_user(
+            username="viewer", password="password", is_staff=True
+        )
+        user.user_permissions.add(
+            Permission.objects.get(
+                content_type=ContentType.objects.get_for_model(Author),
+                codename="view_author",
+            )
+        )
+        client = Client()
+        client.force_login(user)
+        with django_assert_max_num_queries(100) as captured:
+            assert search(client, "Smith").status_code == 200
+        assert author_queries(captured)
+
+    def test_models_without_lookup_cache_are_not_cached(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        Country.objects.create(name="Switzerland")
+        search(admin_client, "Swi", field="country", model="city")
+        with django_assert_max_num_queries(100) as captured:
+            response = search(admin_client, "Swi", field="country", model="city")
+        assert [r["text"] for r in response.json()["results"]] == ["Switzerland"]
+        assert any("testapp_country" in q["sql"] for q in captured.captured_queries)
+
+    def test_lookup_cache_mixin_does_not_cache_autocomplete(
+        self, admin_client, django_assert_max_num_queries
+    ):
+        """PublisherAdmin only caches lookup pages (PopupLookupCacheMixin)."""
+        Publisher.objects.create(name="Penguin")
+        search(admin_client, "Pen", field="publisher")
+        with django_assert_max_num_queries(100) as captured:
+            response = search(admin_client, "Pen", field="publisher")
+        assert [r["text"] for r in response.json()["results"]] == ["Penguin"]
+        assert any("testapp_publisher" in q["sql"] for q in captured.captured_queries)
+
+    def test_timeout_setting(self, admin_client, authors, settings):
+        settings.UNFOLD_MODAL_AUTOCOMPLETE_CACHE_TIMEOUT = 0
+        search(admin_client, "Smith")
+        Author.objects.filter(pk=authors[0].pk).update(name="Jane Smythe")
+        results = search(admin_client, "Smith").json()["results"]
+        assert [r["text"] for r in results] == ["John Smithers"]
+
+    def test_invalid_requests_are_rejected(self, admin_client, db):
+        assert search(admin_client, "Smith", field="missing").status_code == 403
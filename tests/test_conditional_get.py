@@ -0,0 +1,132 @@
+"""Tests for conditional GET (ETag/304) on popup change views."""
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from testapp.models import Country
+from unfold_modal.tracing import TRACE_COOKIE
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def country(db):
+    """Create a test country."""
+    return Country.objects.create(name="Switzerland")
+
+
+@pytest.fixture
+def viewer(django_user_model, db):
+    """A staff user with only view permission on Country."""
+    user = django_user_model.objects.create_user(
+        username="viewer", password="password", is_staff=True
+    )
+    content_type = ContentType.objects.get_for_model(Country)
+    user.user_permissions.add(
+        Permission.objects.get(content_type=content_type, codename="view_country")
+    )
+    return user
+
+
+def change_url(country, popup=True):
+    url = f"/admin/testapp/country/{country.pk}/change/"
+    return f"{url}?_popup=1" if popup else url
+
+
+def get_etag(client, url):
+    """Return the ETag of a popup page once the CSRF cookie is established."""
+    # The first render sets the CSRF cookie, which is part of the ETag
+    client.get(url)
+    return client.get(url)["ETag"]
+
+
+@pytest.mark.django_db
+class TestPopupConditionalGet:
+    """Test ETag generation and 304 responses for popup change views."""
+
+    def test_popup_change_view_has_etag(self, admin_client, country):
+        """Popup change view should carry an ETag and require revalidation."""
+        response = admin_client.get(change_url(country))
+        assert response.status_code == 200
+        assert response.has_header("ETag")
+        cache_control = response["Cache-Control"]
+        assert "no-cache" in cache_control
+        assert "private" in cache_control
+        assert "no-store" not in cache_control
+
+    def test_matching_etag_returns_304(self, admin_client, country):
+        """Revalidation with the current ETag should return 304."""
+        etag = get_etag(admin_client, change_url(country))
+        response = admin_client.get(change_url(country), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    def test_traced_popup_returns_304(self, admin_client, country):
+        """Modal tracing (test settings install ModalTraceMiddleware) keeps 304s."""
+        admin_client.cookies[TRACE_COOKIE] = TRACEPARENT
+        etag = get_etag(admin_client, change_url(country))
+
+        # Each modal opens with a new span
+        admin_client.cookies[TRACE_COOKIE] = TRACEPARENT.replace("00f067aa", "11f067aa")
+        response = admin_client.get(change_url(country), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert "traceparent;desc=" in response["Server-Timing"]
+
+    def test_object_change_invalidates_etag(self, admin_client, country):
+        """Changing the object version should produce a full response."""
+        etag = get_etag(admin_client, change_url(country))
+        Country.objects.filter(pk=country.pk).update(name="Schweiz")
+        response = admin_client.get(change_url(country), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_permission_change_invalidates_etag(self, client, viewer, country):
+        """Granting a permission should produce a full response."""
+        client.force_login(viewer)
+        etag = get_etag(client, change_url(country))
+
+        content_type = ContentType.objects.get_for_model(Country)
+        viewer.user_permissions.add(
+            Permission.objects.get(content_type=content_type, codename="change_country")
+        )
+
+        response = client.get(change_url(country), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_non_popup_change_view_is_never_cached(self, admin_client, country):
+        """Regular change views should keep admin never_cache headers."""
+        response = admin_client.get(change_url(country, popup=False))
+        assert response.status_code == 200
+        assert not response.has_header("ETag")
+        assert "no-store" in response["Cache-Control"]
+
+    def test_popup_post_is_not_conditional(self, admin_client, country):
+        """POST requests should be processed normally even with If-None-Match."""
+        etag = get_etag(admin_client, change_url(country))
+        response = admin_client.post(
+            change_url(country),
+            {"name": "Suisse", "_popup": "1"},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == 200
+        country.refresh_from_db()
+        assert country.name == "Suisse"
+
+    def test_popup_change_view_fetches_object_once(self, admin_client, country):
+        """The object fetched for the ETag should be reused to render the form."""
+        url = f"{change_url(country)}&_to_field=id"
+        admin_client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        country_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "testapp_country"' in query["sql"]
+        ]
+        assert len(country_queries) == 1
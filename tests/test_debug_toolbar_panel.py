@@ -0,0 +1,178 @@
+"""Tests for the django-debug-toolbar modal chain panel."""
+
+import pytest
+from django.urls import include, path
+from unfold_modal.panels import ChainStore, chain_store, summarize_levels
+from unfold_modal.utils import ModalRequest
+
+from testapp.models import Country
+from testapp.urls import urlpatterns as testapp_urlpatterns
+
+# The test app only adds the toolbar URLs when started with DEBUG = True
+urlpatterns = [
+    *testapp_urlpatterns,
+    path("__debug__/", include("debug_toolbar.urls")),
+]
+
+
+def make_record(name, depth, method="GET", total_ms=1.0, popup_response=""):
+    return {
+        "request_id": "",
+        "name": name,
+        "depth": depth,
+        "model": "",
+        "method": method,
+        "path": "/",
+        "status_code": 200,
+        "queries": 2,
+        "sql_ms": 0.5,
+        "render_ms": 0.5,
+        "bytes": 100,
+        "total_ms": total_ms,
+        "popup_response": popup_response,
+    }
+
+
+class TestChainStore:
+    """Test grouping of modal requests into chains."""
+
+    def add(self, store, name, parent="", session="s", **kwargs):
+        depth = int(name.rsplit("__", 1)[1])
+        info = ModalRequest("modal", depth, name, parent)
+        return store.add(session, info, make_record(name, depth, **kwargs))
+
+    def test_nested_requests_join_the_parent_chain(self):
+        """Nested modal requests should be grouped under the root popup."""
+        store = ChainStore()
+        self.add(store, "id_venue__1")
+        self.add(store, "id_city__2", parent="id_venue__1")
+        root = self.add(store, "id_country__3", parent="id_city__2")
+
+        assert root == ("s", "id_venue__1")
+        ((_, requests),) = store.get_chains("s")
+        assert [record["name"] for record in requests] == [
+            "id_venue__1",
+            "id_city__2",
+            "id_country__3",
+        ]
+
+    def test_reopening_root_starts_new_chain(self):
+        """A new GET of a root popup should replace its previous chain."""
+        store = ChainStore()
+        self.add(store, "id_venue__1")
+        self.add(store, "id_city__2", parent="id_venue__1")
+        self.add(store, "id_venue__1", method="POST")
+        assert len(store.get_chains("s")[0][1]) == 3
+
+        self.add(store, "id_venue__1")
+        assert len(store.get_chains("s")[0][1]) == 1
+
+    def test_chains_are_per_session(self):
+        """Chains should only be listed for their own session."""
+        store = ChainStore()
+        self.add(store, "id_venue__1", session="a")
+        self.add(store, "id_city__2", parent="id_venue__1", session="b")
+
+        assert [root for root, _ in store.get_chains("a")] == [("a", "id_venue__1")]
+        assert [root for root, _ in store.get_chains("b")] == [("b", "id_city__2")]
+
+    def test_oldest_chains_are_evicted(self):
+        """The store should keep only the most recent chains."""
+        store = ChainStore(max_chains=2)
+        for index in range(3):
+            self.add(store, f"id_field{index}__1")
+
+        roots = [root[1] for root, _ in store.get_chains("s")]
+        assert roots == ["id_field2__1", "id_field1__1"]
+        assert ("s", "id_field0__1") not in store.roots
+
+
+class TestSummarizeLevels:
+    """Test per-level aggregation."""
+
+    def test_levels_are_aggregated_in_depth_order(self):
+        """Requests of a level should be summed and the slowest level marked."""
+        levels = summarize_levels(
+            [
+                make_record("id_city__2", 2, total_ms=50.0),
+                make_record("id_venue__1", 1, total_ms=5.0),
+                make_record("id_city__2", 2, "POST", 30.0, popup_response="add"),
+            ]
+        )
+
+        assert [level["name"] for level in levels] == ["id_venue__1", "id_city__2"]
+        city = levels[1]
+        assert city["queries"] == 4
+        assert city["bytes"] == 200
+        assert city["total_ms"] == 80.0
+        assert city["popup_response"]["method"] == "POST"
+        assert city.get("slowest") is True
+        assert "slowest" not in levels[0]
+
+
+@pytest.mark.django_db
+class TestModalChainPanel:
+    """Test the panel through the debug toolbar middleware."""
+
+    @pytest.fixture(autouse=True)
+    def toolbar(self, settings):
+        settings.DEBUG = True
+        settings.ROOT_URLCONF = __name__
+        settings.DEBUG_TOOLBAR_CONFIG = {"SHOW_TOOLBAR_CALLBACK": lambda request: True}
+        chain_store.clear()
+        yield
+        chain_store.clear()
+
+    def get_chain(self, admin_client):
+        session_key = admin_client.session.session_key
+        ((root, requests),) = chain_store.get_chains(session_key)
+        return root[1], requests
+
+    def test_records_modal_chain(self, admin_client):
+        """Modal iframe requests should be recorded with their metrics."""
+        country = Country.objects.create(name="Switzerland")
+        admin_client.get("/admin/testapp/city/add/?_popup=1&_modal=id_city__1")
+        admin_client.get(
+            f"/admin/testapp/country/{country.pk}/change/?_popup=1"
+            "&_modal=id_country__2&_modal_parent=id_city__1"
+        )
+
+        root, requests = self.get_chain(admin_client)
+        assert root == "id_city__1"
+        city, nested = requests
+        assert city["model"] == "city"
+        assert city["method"] == "GET"
+        assert city["queries"] > 0
+        assert city["render_ms"] > 0
+        assert city["bytes"] > 0
+        assert nested["depth"] == 2
+        assert nested["model"] == "country"
+
+    def test_records_popup_response(self, admin_client):
+        """The popup_response submission of a level should be flagged."""
+        url = "/admin/testapp/country/add/?_popup=1&_modal=id_country__1"
+        admin_client.get(url)
+        admin_client.post(url, {"name": "Austria", "_popup": "1"})
+
+        _, requests = self.get_chain(admin_client)
+        assert [record["popup_response"] for record in requests] == ["", "add"]
+
+    def test_ignores_page_requests(self, admin_client):
+        """Regular pages and untagged popups should not start chains."""
+        admin_client.get("/admin/testapp/city/add/")
+        admin_client.get("/admin/testapp/city/add/?_popup=1")
+
+        assert chain_store.get_chains(admin_client.session.session_key) == []
+
+    def test_content_renders_chain(self, admin_client):
+        """The panel content should list the levels of the session's chains."""
+        from debug_toolbar.toolbar import DebugToolbar
+
+        admin_client.get("/admin/testapp/city/add/?_popup=1&_modal=id_city__1")
+        _, (record,) = self.get_chain(admin_client)
+        toolbar = DebugToolbar.fetch(record["request_id"])
+        panel = toolbar.get_panel_by_id("ModalChainPanel")
+
+        assert panel.nav_subtitle == "Level 1 of id_city__1"
+        assert "id_city__1" in panel.content
+        assert "this request" in panel.content
@@ -0,0 +1,89 @@
+"""Tests for the test app seeding command and popup load harness."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from testapp.management.commands.loadtest_popups import percentile
+from testapp.models import Book, Chapter, City, Country, Publisher, Tag
+
+
+@pytest.mark.django_db
+class TestSeedCommand:
+    """Test the seed_testapp management command."""
+
+    def test_seeds_configured_volumes(self):
+        call_command(
+            "seed_testapp",
+            publishers=25,
+            countries=3,
+            cities=10,
+            books=2,
+            chapters_per_book=7,
+            batch_size=4,
+            stdout=StringIO(),
+        )
+        assert Publisher.objects.count() == 25
+        assert Country.objects.count() == 3
+        assert City.objects.count() == 10
+        assert Book.objects.count() == 2
+        assert Chapter.objects.filter(book=Book.objects.first()).count() == 7
+
+    def test_clear_and_superuser(self, django_user_model):
+        Publisher.objects.create(name="Old")
+        call_command(
+            "seed_testapp",
+            "--clear",
+            "--superuser=loadtest:secret",
+            publishers=2,
+            books=0,
+            stdout=StringIO(),
+        )
+        assert not Publisher.objects.filter(name="Old").exists()
+        user = django_user_model.objects.get(username="loadtest")
+        assert user.is_superuser and user.check_password("secret")
+
+
+class TestPercentile:
+    """Test latency percentile calculation."""
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 90) == 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadTestCommand:
+    """Run the load harness against the live test server."""
+
+    def test_reports_latency_per_endpoint(self, live_server):
+        call_command(
+            "seed_testapp",
+            "--superuser=loadtest:loadtest",
+            publishers=20,
+            countries=2,
+            cities=5,
+            books=0,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        # Concurrent sessions rely on the file-based SQLite test database
+        call_command(
+            "loadtest_popups",
+            base_url=live_server.url,
+            sessions=3,
+            iterations=4,
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        assert "60 requests from 3 sessions" in output
+        for endpoint in ("config.js", "add popup", "change popup", "lookup", "popup_response"):
+            line = next(row for row in output.splitlines() if row.startswith(endpoint))
+            count, errors = line[len(endpoint):].split()[:2]
+            assert (count, errors) == ("12", "0")
+        assert Tag.objects.filter(name="Load test").count() == 12
@@ -0,0 +1,140 @@
+"""Tests for the server-side cache of raw ID lookup pages."""
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import Client
+
+from testapp.models import Publisher
+from unfold_modal.mixins import invalidate_lookup_cache
+
+LOOKUP_URL = "/admin/testapp/publisher/?_popup=1&_to_field=id"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def publisher(db):
+    return Publisher.objects.create(name="Penguin", address="London")
+
+
+@pytest.fixture
+def viewer(django_user_model, db):
+    """A staff user with only view permission on Publisher."""
+    user = django_user_model.objects.create_user(
+        username="viewer", password="password", is_staff=True
+    )
+    content_type = ContentType.objects.get_for_model(Publisher)
+    user.user_permissions.add(
+        Permission.objects.get(content_type=content_type, codename="view_publisher")
+    )
+    return user
+
+
+def changelist_queries(captured):
+    return [q["sql"] for q in captured.captured_queries if "testapp_publisher" in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestPopupLookupCache:
+    """Test PopupLookupCacheMixin on PublisherAdmin."""
+
+    def warm(self, client, url=LOOKUP_URL):
+        # The first render sets the CSRF cookie, which is part of the key
+        client.get(url)
+        return client.get(url)
+
+    def test_repeated_lookup_skips_changelist_queries(
+        self, admin_client, publisher, django_assert_max_num_queries
+    ):
+        first = self.warm(admin_client)
+        with django_assert_max_num_queries(100) as captured:
+            second = admin_client.get(LOOKUP_URL)
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert b"Penguin" in second.content
+        assert changelist_queries(captured) == []
+
+    def test_first_lookup_queries_the_changelist(
+        self, admin_client, publisher, django_assert_max_num_queries
+    ):
+        admin_client.get(LOOKUP_URL)
+        with django_assert_max_num_queries(100) as captured:
+            admin_client.get(f"{LOOKUP_URL}&q=Peng")
+        assert changelist_queries(captured)
+
+    def test_query_string_order_does_not_matter(
+        self, admin_client, publisher, django_assert_max_num_queries
+    ):
+        self.warm(admin_client)
+        with django_assert_max_num_queries(100) as captured:
+            admin_client.get("/admin/testapp/publisher/?_to_field=id&_popup=1")
+        assert changelist_queries(captured) == []
+
+    def test_save_invalidates(self, admin_client, publisher):
+        self.warm(admin_client)
+        publisher.name = "Puffin"
+        publisher.save()
+        response = admin_client.get(LOOKUP_URL)
+        assert b"Puffin" in response.content
+        assert b"Penguin" not in response.content
+
+    def test_create_invalidates(self, admin_client, publisher):
+        self.warm(admin_client)
+        Publisher.objects.create(name="Vintage")
+        assert b"Vintage" in admin_client.get(LOOKUP_URL).content
+
+    def test_delete_invalidates(self, admin_client, publisher):
+        self.warm(admin_client)
+        publisher.delete()
+        assert b"Penguin" not in admin_client.get(LOOKUP_URL).content
+
+    def test_update_needs_explicit_invalidation(self, admin_client, publisher):
+        self.warm(admin_client)
+        Publisher.objects.filter(pk=publisher.pk).update(name="Puffin")
+        assert b"Penguin" in admin_client.get(LOOKUP_URL).content
+        invalidate_lookup_cache(Publisher)
+        assert b"Puffin" in admin_client.get(LOOKUP_URL).content
+
+    def test_users_do_not_share_entries(
+        self, admin_client, viewer, publisher, django_assert_max_num_queries
+    ):
+        first = self.warm(admin_client)
+        viewer_client = Client()
+        viewer_client.force_login(viewer)
+        # Same CSRF cookie, so only the permission fingerprint differs
+        viewer_client.cookies["csrftoken"] = admin_client.cookies["csrftoken"].value
+        with django_assert_max_num_queries(100) as captured:
+            response = viewer_client.get(LOOKUP_URL)
+        assert response.status_code == 200
+        assert response.content != first.content
+        assert changelist_queries(captured)
+
+    def test_modal_and_popup_window_are_cached_separately(
+        self, admin_client, publisher, django_assert_max_num_queries
+    ):
+        self.warm(admin_client, f"{LOOKUP_URL}&_modal=lookup_id_publisher__1")
+        with django_assert_max_num_queries(100) as captured:
+            admin_client.get(LOOKUP_URL)
+        assert changelist_queries(captured)
+
+    def test_non_lookup_requests_are_not_cached(
+        self, admin_client, publisher, django_assert_max_num_queries
+    ):
+        for url in ["/admin/testapp/publisher/", "/admin/testapp/publisher/?_popup=1"]:
+            self.warm(admin_client, url)
+            with django_assert_max_num_queries(100) as captured:
+                admin_client.get(url)
+            assert changelist_queries(captured)
+
+    def test_timeout_setting(self, admin_client, publisher, settings):
+        settings.UNFOLD_MODAL_LOOKUP_CACHE_TIMEOUT = 0
+        first = self.warm(admin_client)
+        Publisher.objects.filter(pk=publisher.pk).update(name="Puffin")
+        assert admin_client.get(LOOKUP_URL).content != first.content
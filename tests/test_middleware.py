@@ -0,0 +1,224 @@
+"""Tests for unfold-modal middleware."""
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from unfold_modal.context_processors import non_modal
+from unfold_modal.middleware import ModalRequestMiddleware, PopupPreloadMiddleware
+from unfold_modal.utils import classify_request, skip_in_modal
+
+
+def parse_links(header):
+    """Return the preload Link header entries as a set of strings."""
+    return {link.strip() for link in header.split(",")}
+
+
+@pytest.mark.django_db
+class TestPopupPreloadMiddleware:
+    """Test Link preload headers on popup pages."""
+
+    def test_popup_page_has_preload_links(self, admin_client):
+        """Popup HTML responses should preload modal styles and scripts."""
+        response = admin_client.get("/admin/testapp/category/add/?_popup=1")
+        links = parse_links(response["Link"])
+        assert "</static/unfold_modal/css/modal.css>; rel=preload; as=style" in links
+        assert "</static/unfold_modal/js/modal_core.js>; rel=preload; as=script" in links
+        assert "</unfold-modal/config.js>; rel=preload; as=script" in links
+
+    def test_preload_links_are_unique(self, admin_client):
+        """Assets from UNFOLD and the modal helpers should be listed once."""
+        response = admin_client.get("/admin/testapp/category/add/?_popup=1")
+        links = [link.strip() for link in response["Link"].split(",")]
+        assert len(links) == len(set(links))
+
+    def test_regular_page_has_no_preload_links(self, admin_client):
+        """Non-popup pages should not get preload headers."""
+        response = admin_client.get("/admin/testapp/category/add/")
+        assert not response.has_header("Link")
+
+    def test_popup_post_has_no_preload_links(self, admin_client):
+        """The popup response page after a save should not preload assets."""
+        response = admin_client.post(
+            "/admin/testapp/category/add/?_popup=1",
+            {"name": "Fiction", "_popup": "1"},
+        )
+        assert response.status_code == 200
+        assert "popup_response_data" in response.context
+        assert not response.has_header("Link")
+
+    @override_settings(UNFOLD={"STYLES": ["/static/custom.css"], "SCRIPTS": []})
+    def test_string_assets_and_existing_link_header(self):
+        """Plain string assets are included and existing Link headers kept."""
+
+        def view(request):
+            response = HttpResponse("<html></html>")
+            response["Link"] = "</favicon.ico>; rel=icon"
+            return response
+
+        request = RequestFactory().get("/admin/x/?_popup=1")
+        response = PopupPreloadMiddleware(view)(request)
+        links = parse_links(response["Link"])
+        assert "</favicon.ico>; rel=icon" in links
+        assert "</static/custom.css>; rel=preload; as=style" in links
+
+    def test_non_html_response_is_untouched(self):
+        """JSON or other non-HTML popup responses should not get preload headers."""
+
+        def view(request):
+            return HttpResponse("{}", content_type="application/json")
+
+        request = RequestFactory().get("/admin/x/?_popup=1")
+        response = PopupPreloadMiddleware(view)(request)
+        assert not response.has_header("Link")
+
+
+def notifications(request):
+    """Context processor used by the gate tests."""
+    return {"notification_count": 3}
+
+
+@skip_in_modal
+def global_callback(request):
+    """UNFOLD["GLOBAL_CALLBACK"] used by the skip_in_modal tests."""
+    return {"notification_count": 3}
+
+
+def environment(request):
+    """UNFOLD["ENVIRONMENT"] used by the skip_in_modal tests."""
+    return ["Staging", "warning"]
+
+
+def classified(path, **headers):
+    """Run a GET request through ModalRequestMiddleware and return the request."""
+    request = RequestFactory().get(path, headers=headers)
+    ModalRequestMiddleware(lambda request: HttpResponse())(request)
+    return request
+
+
+class TestClassifyRequest:
+    """Test modal/popup/page request classification."""
+
+    def test_regular_page(self):
+        """Requests without _popup are regular pages."""
+        info = classify_request(RequestFactory().get("/admin/x/"))
+        assert info.mode == "page"
+        assert info.depth == 0
+        assert not info.is_modal
+
+    def test_legacy_popup(self):
+        """Untagged popup requests are window.open popups."""
+        info = classify_request(RequestFactory().get("/admin/x/?_popup=1"))
+        assert info.mode == "popup"
+        assert not info.is_modal
+
+    def test_tagged_modal(self):
+        """The _modal tag identifies modal iframes and their nesting depth."""
+        request = RequestFactory().get(
+            "/admin/x/?_popup=1&_modal=id_country__2&_modal_parent=id_city__1"
+        )
+        info = classify_request(request)
+        assert info.is_modal
+        assert info.depth == 2
+        assert info.name == "id_country__2"
+        assert info.parent == "id_city__1"
+
+    def test_iframe_fetch_destination(self):
+        """Untagged popup requests loaded in an iframe are modals."""
+        request = RequestFactory().get(
+            "/admin/x/?_popup=1", headers={"Sec-Fetch-Dest": "iframe"}
+        )
+        info = classify_request(request)
+        assert info.is_modal
+        assert info.depth == 1
+
+
+@pytest.mark.django_db
+class TestModalRequestMiddleware:
+    """Test request annotation and tag stripping."""
+
+    def test_sets_request_attribute(self):
+        """The middleware should annotate the request."""
+        request = classified("/admin/x/?_popup=1&_modal=id_country__1")
+        assert request.unfold_modal.is_modal
+        assert request.unfold_modal.name == "id_country__1"
+
+    def test_strips_modal_params(self):
+        """Modal tags should not reach views; other parameters are kept."""
+        request = classified("/admin/x/?_popup=1&_modal=a__1&_modal_parent=b__1&q=x")
+        assert "_modal" not in request.GET
+        assert "_modal_parent" not in request.GET
+        assert request.GET["_popup"] == "1"
+        assert request.GET["q"] == "x"
+        assert not request.GET._mutable
+
+    def test_tagged_lookup_changelist(self, admin_client):
+        """Tagged changelist lookups should not be treated as invalid filters."""
+        response = admin_client.get(
+            "/admin/testapp/country/?_to_field=id&_popup=1&_modal=lookup_id_country__1"
+        )
+        assert response.status_code == 200
+
+
+class TestNonModalContextProcessor:
+    """Test gating of expensive context processors in modal iframes."""
+
+    @override_settings(
+        UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS=["tests.test_middleware.notifications"]
+    )
+    def test_runs_outside_modals(self):
+        """Pages and legacy popups should get the gated context."""
+        assert non_modal(classified("/admin/x/")) == {"notification_count": 3}
+        assert non_modal(classified("/admin/x/?_popup=1")) == {"notification_count": 3}
+
+    @override_settings(
+        UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS=["tests.test_middleware.notifications"]
+    )
+    def test_skipped_in_modals(self):
+        """Modal iframe requests should skip the gated processors."""
+        assert non_modal(classified("/admin/x/?_popup=1&_modal=a__1")) == {}
+
+    def test_without_middleware(self):
+        """Requests are classified on the fly when the middleware is missing."""
+        request = RequestFactory().get("/admin/x/?_popup=1&_modal=a__1")
+        assert non_modal(request) == {}
+
+
+class TestSkipInModal:
+    """Test the Unfold callback wrapper."""
+
+    def test_wrapped_callback(self):
+        """Callbacks run outside modals and return the default inside them."""
+        callback = skip_in_modal(notifications, default={})
+        assert callback(classified("/admin/x/")) == {"notification_count": 3}
+        assert callback(classified("/admin/x/?_popup=1&_modal=a__1")) == {}
+
+    def test_dotted_path(self):
+        """Dotted paths are imported lazily."""
+        callback = skip_in_modal("tests.test_middleware.notifications")
+        assert callback(classified("/admin/x/")) == {"notification_count": 3}
+        assert callback(classified("/admin/x/?_popup=1&_modal=a__1")) is None
+
+    def test_decorator(self):
+        """@skip_in_modal(default=...) keeps the function's name."""
+        callback = skip_in_modal(default={})(notifications)
+        assert callback.__name__ == "notifications"
+        assert callback(classified("/admin/x/?_popup=1&_modal=a__1")) == {}
+
+    @pytest.mark.django_db
+    def test_unfold_keys(self, admin_client, settings):
+        """GLOBAL_CALLBACK (by path) and ENVIRONMENT run outside modals only."""
+        settings.UNFOLD = {
+            **settings.UNFOLD,
+            "GLOBAL_CALLBACK": "tests.test_middleware.global_callback",
+            "ENVIRONMENT": skip_in_modal("tests.test_middleware.environment"),
+        }
+        url = "/admin/testapp/category/add/?_popup=1"
+
+        response = admin_client.get(url)
+        assert response.context["notification_count"] == 3
+        assert response.context["environment"] == ["Staging", "warning"]
+
+        response = admin_client.get(f"{url}&_modal=id_category__1")
+        assert "notification_count" not in response.context
+        assert response.context["environment"] is None
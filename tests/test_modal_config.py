@@ -1,5 +1,7 @@
 """Tests for modal configuration settings."""
 
+from urllib.parse import parse_qs, urlsplit
+
 import pytest
 from django.test import override_settings
 
@@ -67,3 +69,165 @@ class TestModalConfig:
         response = client.get("/unfold-modal/config.js")
         content = response.content.decode()
         assert '"disableHeader": false' in content
+
+    def test_config_js_iframe_cache_disabled_by_default(self, client):
+        """Config should disable the iframe cache unless configured."""
+        response = client.get("/unfold-modal/config.js")
+        content = response.content.decode()
+        assert '"iframeCacheSize": 0' in content
+        assert '"iframeCacheTtl": 60' in content
+
+    @override_settings(
+        UNFOLD_MODAL_IFRAME_CACHE_SIZE=3, UNFOLD_MODAL_IFRAME_CACHE_TTL=120
+    )
+    def test_config_js_includes_iframe_cache_settings(self, client):
+        """Config should pass iframe cache size and TTL to the frontend."""
+        response = client.get("/unfold-modal/config.js")
+        content = response.content.decode()
+        assert '"iframeCacheSize": 3' in content
+        assert '"iframeCacheTtl": 120' in content
+
+    def test_config_js_autocomplete_cache_disabled_by_default(self, client):
+        response = client.get("/unfold-modal/config.js")
+        assert '"autocompleteClientCacheSeconds": 0' in response.content.decode()
+
+    @override_settings(UNFOLD_MODAL_AUTOCOMPLETE_CLIENT_CACHE_SECONDS=30)
+    def test_config_js_autocomplete_cache(self, client):
+        response = client.get("/unfold-modal/config.js")
+        assert '"autocompleteClientCacheSeconds": 30' in response.content.decode()
+
+    def test_config_js_bulk_add_disabled_by_default(self, client):
+        """Bulk add mode should be opt-in."""
+        response = client.get("/unfold-modal/config.js")
+        assert '"bulkAdd": false' in response.content.decode()
+
+    @override_settings(UNFOLD_MODAL_BULK_ADD=True)
+    def test_config_js_bulk_add(self, client):
+        response = client.get("/unfold-modal/config.js")
+        assert '"bulkAdd": true' in response.content.decode()
+
+    def test_config_js_debug_disabled_by_default(self, client):
+        """The performance HUD should be opt-in."""
+        response = client.get("/unfold-modal/config.js")
+        assert '"debug": false' in response.content.decode()
+
+    @override_settings(UNFOLD_MODAL_DEBUG=True)
+    def test_config_js_debug(self, client):
+        response = client.get("/unfold-modal/config.js")
+        assert '"debug": true' in response.content.decode()
+
+    def test_config_js_tags_requests_with_middleware(self, client):
+        """Iframe URLs should be tagged when ModalRequestMiddleware is installed."""
+        response = client.get("/unfold-modal/config.js")
+        assert '"tagRequests": true' in response.content.decode()
+
+    def test_config_js_no_tags_without_middleware(self, client, settings):
+        """Without the middleware the tags would reach admin views untouched."""
+        settings.MIDDLEWARE = [
+            m for m in settings.MIDDLEWARE if not m.endswith("ModalRequestMiddleware")
+        ]
+        response = client.get("/unfold-modal/config.js")
+        assert '"tagRequests": false' in response.content.decode()
+
+
+    def test_config_js_traces_requests_with_middleware(self, client):
+        """Iframe URLs should carry a traceparent when ModalTraceMiddleware is installed."""
+        response = client.get("/unfold-modal/config.js")
+        assert '"traceRequests": true' in response.content.decode()
+
+    def test_config_js_no_trace_without_middleware(self, client, settings):
+        settings.MIDDLEWARE = [
+            m for m in settings.MIDDLEWARE if not m.endswith("ModalTraceMiddleware")
+        ]
+        response = client.get("/unfold-modal/config.js")
+        assert '"traceRequests": false' in response.content.decode()
+
+class TestCompiledConfig:
+    """Test memoized settings, compiled config and asset URLs."""
+
+    def test_config_is_read_only(self):
+        """The compiled config should not be mutable at runtime."""
+        from unfold_modal.apps import get_modal_config
+
+        config = get_modal_config()
+        with pytest.raises(TypeError):
+            config["resize"] = True
+        with pytest.raises(TypeError):
+            config["dimensions"]["width"] = "10%"
+
+    def test_config_js_is_compiled_once(self):
+        """Repeated calls should return the same compiled script."""
+        from unfold_modal.apps import get_modal_config_js
+
+        assert get_modal_config_js() is get_modal_config_js()
+
+    def test_override_settings_invalidates_setting(self):
+        """Memoized settings should follow override_settings."""
+        from unfold_modal.apps import get_setting
+
+        before = get_setting("UNFOLD_MODAL_SIZE")
+        with override_settings(UNFOLD_MODAL_SIZE="full"):
+            assert get_setting("UNFOLD_MODAL_SIZE") == "full"
+        assert get_setting("UNFOLD_MODAL_SIZE") == before
+
+    def test_override_settings_invalidates_config_js(self):
+        """The compiled config script should follow override_settings."""
+        from unfold_modal.apps import get_modal_config_js
+
+        with override_settings(UNFOLD_MODAL_RESIZE=False):
+            assert '"resize": false' in get_modal_config_js()
+        with override_settings(UNFOLD_MODAL_RESIZE=True):
+            assert '"resize": true' in get_modal_config_js()
+
+    def test_static_url_change_invalidates_asset_urls(self):
+        """Memoized asset URLs should follow STATIC_URL changes."""
+        from unfold_modal.utils import get_modal_styles
+
+        style = get_modal_styles()[0]
+        with override_settings(STATIC_URL="/assets/"):
+            assert style(None) == "/assets/unfold_modal/css/modal.css"
+        assert style(None) == "/static/unfold_modal/css/modal.css"
+
+
+class TestModalLoader:
+    """Test the on-demand loader helpers."""
+
+    def get_loader_url(self, with_config=False):
+        from unfold_modal.utils import (
+            get_modal_loader_scripts,
+            get_modal_loader_scripts_with_config,
+        )
+
+        helper = (
+            get_modal_loader_scripts_with_config if with_config else get_modal_loader_scripts
+        )
+        (script,) = helper()
+        return urlsplit(script(None))
+
+    def test_loader_script_url(self):
+        """Helper should point at the static loader script."""
+        assert self.get_loader_url().path == "/static/unfold_modal/js/loader.js"
+
+    def test_loader_passes_assets_in_order(self):
+        """Loader query should list the stylesheet and the scripts in load order."""
+        query = parse_qs(self.get_loader_url().query)
+        assert query["css"] == ["/static/unfold_modal/css/modal.css"]
+        assert query["js"] == [
+            "/static/unfold_modal/js/modal_core.js",
+            "/static/unfold_modal/js/related_modal.js",
+            "/static/unfold_modal/js/popup_iframe.js",
+        ]
+
+    def test_loader_with_config_loads_config_first(self):
+        """Config-enabled loader should load config.js before the core scripts."""
+        query = parse_qs(self.get_loader_url(with_config=True).query)
+        assert query["js"][0] == "/unfold-modal/config.js"
+        assert query["js"][1] == "/static/unfold_modal/js/modal_core.js"
+
+    def test_static_url_change_updates_loader_url(self):
+        """Loader asset URLs should follow STATIC_URL changes."""
+        with override_settings(STATIC_URL="/assets/"):
+            url = self.get_loader_url()
+            assert url.path == "/assets/unfold_modal/js/loader.js"
+            assert parse_qs(url.query)["css"] == ["/assets/unfold_modal/css/modal.css"]
+        assert self.get_loader_url().path == "/static/unfold_modal/js/loader.js"
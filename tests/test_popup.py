@@ -1,5 +1,9 @@
 """Tests for popup rendering and popup_response behavior."""
 
+import json
+import re
+from html import unescape
+
 import pytest
 
 from testapp.models import Author, Category
@@ -118,6 +122,18 @@ class TestPopupResponsePayload:
         # or Django's default popup_response.js reference
         assert "postMessage" in content or "popup_response" in content.lower()
 
+    def test_popup_response_data_attribute(self, admin_client):
+        """The response data should be readable from the body for bulk add."""
+        response = admin_client.post(
+            "/admin/testapp/tag/add/?_popup=1",
+            {"name": "Bulk \"Tag\"", "_popup": "1"},
+        )
+        content = response.content.decode()
+        match = re.search(r'<body data-popup-response="([^"]*)"', content)
+        data = json.loads(unescape(match.group(1)))
+        assert data["obj"] == 'Bulk "Tag"'
+        assert data["value"]
+
 
 @pytest.mark.django_db
 class TestDeletePopupResponse:
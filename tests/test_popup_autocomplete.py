@@ -0,0 +1,90 @@
+"""Tests for switching huge ForeignKey selects to autocomplete in popups."""
+
+import pytest
+
+from testapp.models import City, Country
+
+
+@pytest.fixture
+def countries(db):
+    """Create a few countries (above the test threshold)."""
+    return Country.objects.bulk_create(
+        [Country(name=name) for name in ("Austria", "Italy", "Switzerland")]
+    )
+
+
+@pytest.fixture(autouse=True)
+def threshold(settings):
+    """Use a small autocomplete threshold."""
+    settings.UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD = 2
+
+
+def country_widget(content):
+    """Return the opening tag of the country select."""
+    start = content.index('<select name="country"')
+    return content[start : content.index(">", start)]
+
+
+@pytest.mark.django_db
+class TestPopupAutocomplete:
+    """Test the PopupAutocompleteMixin."""
+
+    def test_large_select_becomes_autocomplete_in_popup(self, admin_client, countries):
+        """Popup forms should render large FK selects as autocompletes."""
+        response = admin_client.get("/admin/testapp/city/add/?_popup=1")
+        content = response.content.decode()
+        widget = country_widget(content)
+        assert "admin-autocomplete" in widget
+        assert "data-field-name=\"country\"" in widget
+        # Only the empty option is rendered, not every row
+        assert "Switzerland" not in content
+
+    def test_related_links_are_kept(self, admin_client, countries):
+        """Add/change links for nested modals should stay in place."""
+        response = admin_client.get("/admin/testapp/city/add/?_popup=1")
+        content = response.content.decode()
+        assert 'id="add_id_country"' in content
+        assert 'id="change_id_country"' in content
+
+    def test_regular_page_keeps_select(self, admin_client, countries):
+        """Non-popup pages should keep the plain select."""
+        response = admin_client.get("/admin/testapp/city/add/")
+        content = response.content.decode()
+        assert "admin-autocomplete" not in country_widget(content)
+        assert "Switzerland" in content
+
+    def test_small_select_is_kept(self, admin_client, countries, settings):
+        """Selects at or below the threshold should render all options."""
+        settings.UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD = 3
+        response = admin_client.get("/admin/testapp/city/add/?_popup=1")
+        content = response.content.decode()
+        assert "admin-autocomplete" not in country_widget(content)
+        assert "Switzerland" in content
+
+    def test_threshold_none_disables(self, admin_client, countries, settings):
+        settings.UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD = None
+        response = admin_client.get("/admin/testapp/city/add/?_popup=1")
+        assert "admin-autocomplete" not in country_widget(response.content.decode())
+
+    def test_popup_form_saves_autocomplete_value(self, admin_client, countries):
+        """Submitting the autocomplete value should save the relation."""
+        response = admin_client.post(
+            "/admin/testapp/city/add/?_popup=1",
+            {"name": "Vienna", "country": countries[0].pk, "_popup": "1"},
+        )
+        assert response.status_code == 200
+        assert City.objects.get(name="Vienna").country == countries[0]
+
+    def test_autocomplete_view_serves_field(self, admin_client, countries):
+        """The admin autocomplete view should answer for the switched field."""
+        response = admin_client.get(
+            "/admin/autocomplete/",
+            {
+                "app_label": "testapp",
+                "model_name": "city",
+                "field_name": "country",
+                "term": "Swi",
+            },
+        )
+        assert response.status_code == 200
+        assert [r["text"] for r in response.json()["results"]] == ["Switzerland"]
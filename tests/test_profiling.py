@@ -0,0 +1,193 @@
+"""Tests for the modal request sampling profiler."""
+
+import time
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from unfold_modal.middleware import ModalProfilerMiddleware
+from unfold_modal.profiling import (
+    ProfileStore,
+    SamplingProfiler,
+    get_default_profile_dir,
+    get_profile_store,
+    to_collapsed,
+)
+
+MODAL_PATH = "/admin/testapp/city/add/?_popup=1&_modal=id_city__1"
+
+
+def slow_function():
+    time.sleep(0.05)
+
+
+def slow_view(request):
+    slow_function()
+    return HttpResponse()
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    """Write profiles to a temporary directory."""
+    settings.UNFOLD_MODAL_PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+def run(path, view=slow_view):
+    return ModalProfilerMiddleware(view)(RequestFactory().get(path))
+
+
+class TestSamplingProfiler:
+    """Test stack sampling."""
+
+    def test_samples_current_thread(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            slow_function()
+
+        assert sum(profiler.samples.values()) > 0
+        stacks = list(profiler.samples)
+        assert any("test_profiling:slow_function" in stack for stack in stacks)
+        assert all("unfold-modal-profiler" not in stack for stack in stacks)
+
+    def test_delay_skips_fast_code(self):
+        with SamplingProfiler(interval=0.001, delay=1) as profiler:
+            slow_function()
+        assert not profiler.samples
+
+    def test_delay_samples_slow_code(self):
+        with SamplingProfiler(interval=0.001, delay=0.01) as profiler:
+            slow_function()
+        assert sum(profiler.samples.values()) > 0
+
+    def test_to_collapsed(self):
+        assert to_collapsed({"a;b": 2, "a": 1, "": 4}) == "a 1\na;b 2\n"
+
+
+class TestProfileStore:
+    """Test the on-disk ring buffer."""
+
+    def test_save_and_load(self, tmp_path):
+        store = ProfileStore(tmp_path, max_files=5)
+        name = store.save({"path": "/x/", "samples": {"a;b": 1}})
+
+        assert store.load(name) == {"path": "/x/", "samples": {"a;b": 1}, "name": name}
+        assert store.list() == [{"path": "/x/", "name": name}]
+
+    def test_keeps_newest_files(self, tmp_path):
+        store = ProfileStore(tmp_path, max_files=2)
+        names = [store.save({"index": index, "samples": {}}) for index in range(4)]
+
+        assert [profile["name"] for profile in store.list()] == names[:1:-1]
+        assert len(list(tmp_path.iterdir())) == 2
+
+    @pytest.mark.parametrize("name", ["../secret", "1-abc", "", "1-0000000g"])
+    def test_rejects_invalid_names(self, tmp_path, name):
+        store = ProfileStore(tmp_path, max_files=2)
+        assert store.get_path(name) is None
+        assert store.load(name) is None
+
+    def test_missing_directory(self, tmp_path):
+        assert ProfileStore(tmp_path / "missing", max_files=2).list() == []
+
+    def test_default_directory_per_project(self, settings):
+        directory = get_default_profile_dir()
+        assert directory.name.startswith("unfold_modal_profiles_")
+
+        settings.SECRET_KEY = "another-project"
+        assert get_default_profile_dir() != directory
+
+
+class TestModalProfilerMiddleware:
+    """Test which requests are profiled and kept."""
+
+    def test_disabled_by_default(self, profile_dir):
+        run(MODAL_PATH)
+        assert get_profile_store().list() == []
+
+    def test_sample_rate(self, profile_dir, settings):
+        settings.UNFOLD_MODAL_PROFILE_RATE = 1.0
+        run(MODAL_PATH)
+
+        (profile,) = get_profile_store().list()
+        assert profile["method"] == "GET"
+        assert profile["path"] == MODAL_PATH
+        assert profile["popup"] == "id_city__1"
+        assert profile["status_code"] == 200
+        assert profile["duration_ms"] >= 50
+        assert profile["sample_count"] > 0
+
+    def test_threshold_keeps_slow_requests(self, profile_dir, settings):
+        settings.UNFOLD_MODAL_PROFILE_THRESHOLD_MS = 20
+        run(MODAL_PATH)
+        run(MODAL_PATH, lambda request: HttpResponse())
+
+        (profile,) = get_profile_store().list()
+        assert profile["duration_ms"] >= 20
+        assert profile["delay_ms"] == 20
+        assert profile["sample_count"] > 0
+
+    def test_only_modal_requests(self, profile_dir, settings):
+        settings.UNFOLD_MODAL_PROFILE_RATE = 1.0
+        run("/admin/testapp/city/add/")
+        run("/admin/testapp/city/add/?_popup=1")
+        assert get_profile_store().list() == []
+
+
+@pytest.mark.django_db
+class TestProfileViews:
+    """Test the profile list and download pages."""
+
+    @pytest.fixture
+    def profile_name(self, profile_dir):
+        return get_profile_store().save(
+            {
+                "created": time.time(),
+                "method": "GET",
+                "path": MODAL_PATH,
+                "popup": "id_city__1",
+                "depth": 1,
+                "status_code": 200,
+                "duration_ms": 1234.5,
+                "interval_ms": 5.0,
+                "sample_count": 3,
+                "samples": {"app:view;app:query": 3},
+            }
+        )
+
+    def test_list(self, admin_client, profile_name):
+        response = admin_client.get("/unfold-modal/profiles/")
+        content = response.content.decode()
+
+        assert response.status_code == 200
+        assert "1235 ms" in content
+        assert f"/unfold-modal/profiles/{profile_name}/" in content
+
+    def test_empty_list(self, admin_client, profile_dir):
+        response = admin_client.get("/unfold-modal/profiles/")
+        assert response.status_code == 200
+        assert "No profiles recorded yet." in response.content.decode()
+
+    def test_download(self, admin_client, profile_name):
+        response = admin_client.get(f"/unfold-modal/profiles/{profile_name}/")
+
+        assert response.status_code == 200
+        assert response.content == b"app:view;app:query 3\n"
+        assert f'filename="{profile_name}.folded"' in response["Content-Disposition"]
+
+    def test_download_missing(self, admin_client, profile_dir):
+        response = admin_client.get("/unfold-modal/profiles/1-00000000/")
+        assert response.status_code == 404
+
+    def test_requires_superuser(self, client, django_user_model, profile_name):
+        staff = django_user_model.objects.create_user(
+            "staff", password="password", is_staff=True
+        )
+        client.force_login(staff)
+
+        assert client.get("/unfold-modal/profiles/").status_code == 403
+        assert client.get(f"/unfold-modal/profiles/{profile_name}/").status_code == 403
+
+    def test_requires_login(self, client, profile_name):
+        response = client.get("/unfold-modal/profiles/")
+        assert response.status_code == 302
@@ -0,0 +1,100 @@
+"""Tests for the optional static asset service worker."""
+
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from django.test import override_settings
+
+from unfold_modal.utils import get_service_worker_scope, get_service_worker_scripts
+from unfold_modal.views import _read_service_worker
+
+
+@pytest.mark.django_db
+class TestServiceWorkerView:
+    """Test the service worker endpoint."""
+
+    def test_service_worker_returns_javascript(self, client):
+        """Service worker endpoint should return JavaScript."""
+        response = client.get("/unfold-modal/sw.js")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/javascript"
+        assert "addEventListener('fetch'" in response.content.decode()
+
+    def test_service_worker_allowed_header(self, client):
+        """Worker should be allowed to control pages outside its directory."""
+        response = client.get("/unfold-modal/sw.js")
+        assert response["Service-Worker-Allowed"] == "/admin/"
+        assert response["Cache-Control"] == "no-cache"
+
+    def test_service_worker_never_caches_html(self, client):
+        """Worker source should skip navigations and HTML responses."""
+        content = client.get("/unfold-modal/sw.js").content.decode()
+        assert "request.mode === 'navigate'" in content
+        assert "text/html" in content
+
+    def test_setting_change_clears_worker_source(self, client):
+        """The memoized worker source should be dropped when settings change."""
+        client.get("/unfold-modal/sw.js")
+        assert _read_service_worker.cache_info().currsize == 1
+        with override_settings(UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES=50):
+            assert _read_service_worker.cache_info().currsize == 0
+
+    def test_service_worker_evicts_least_recently_used(self, client):
+        """Worker source should trim its cache to the configured size."""
+        content = client.get("/unfold-modal/sw.js").content.decode()
+        assert "params.get('max')" in content
+        assert "trimCache" in content
+
+
+class TestServiceWorkerRegistration:
+    """Test the registration helper in unfold_modal.utils."""
+
+    def get_register_url(self):
+        (script,) = get_service_worker_scripts()
+        return script(None)
+
+    def test_register_script_url(self):
+        """Helper should point at the static registration script."""
+        url = urlsplit(self.get_register_url())
+        assert url.path == "/static/unfold_modal/js/service_worker_register.js"
+
+    def test_register_script_passes_worker_and_scope(self):
+        """Registration script query should carry the worker URL and scope."""
+        query = parse_qs(urlsplit(self.get_register_url()).query)
+        assert query["scope"] == ["/admin/"]
+
+        worker = urlsplit(query["sw"][0])
+        assert worker.path == "/unfold-modal/sw.js"
+        worker_query = parse_qs(worker.query)
+        assert worker_query["static"] == ["/static/"]
+        assert worker_query["v"] == ["0.1.0"]
+        assert worker_query["max"] == ["200"]
+
+    def test_scope_defaults_to_admin_root(self):
+        """The worker should not control the whole site when the admin is at /admin/."""
+        query = parse_qs(urlsplit(self.get_register_url()).query)
+        assert query["scope"] != ["/"]
+        assert get_service_worker_scope() == "/admin/"
+
+    @pytest.mark.django_db
+    @override_settings(UNFOLD_MODAL_SERVICE_WORKER_SCOPE="/admin/testapp/")
+    def test_scope_setting(self, client):
+        """UNFOLD_MODAL_SERVICE_WORKER_SCOPE should set both scope and header."""
+        query = parse_qs(urlsplit(self.get_register_url()).query)
+        assert query["scope"] == ["/admin/testapp/"]
+        response = client.get("/unfold-modal/sw.js")
+        assert response["Service-Worker-Allowed"] == "/admin/testapp/"
+
+    def test_static_url_change_updates_worker_url(self):
+        """Worker static prefix should follow STATIC_URL changes."""
+        with override_settings(STATIC_URL="/assets/"):
+            query = parse_qs(urlsplit(self.get_register_url()).query)
+            worker_query = parse_qs(urlsplit(query["sw"][0]).query)
+            assert worker_query["static"] == ["/assets/"]
+
+    def test_max_entries_setting_updates_worker_url(self):
+        """Worker cache size should follow UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES."""
+        with override_settings(UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES=50):
+            query = parse_qs(urlsplit(self.get_register_url()).query)
+            worker_query = parse_qs(urlsplit(query["sw"][0]).query)
+            assert worker_query["max"] == ["50"]
@@ -0,0 +1,44 @@
+"""Tests for the precompressed (.gz/.br) static asset siblings."""
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+import unfold_modal
+
+STATIC_ROOT = Path(unfold_modal.__file__).resolve().parent / "static"
+ASSETS = sorted(
+    path for path in STATIC_ROOT.rglob("*") if path.suffix in (".css", ".js")
+)
+HINT = "run `python scripts/compress_static.py`"
+
+
+def test_assets_found():
+    names = {path.name for path in ASSETS}
+    assert {"modal.css", "modal_core.js", "related_modal.js", "popup_iframe.js"} <= names
+
+
+@pytest.mark.parametrize("path", ASSETS, ids=lambda path: path.name)
+class TestCompressedSiblings:
+    """Each CSS/JS asset ships .gz and .br siblings matching its source."""
+
+    def test_gzip_matches_source(self, path):
+        target = path.with_name(path.name + ".gz")
+        assert target.exists(), f"{target.name} missing, {HINT}"
+        assert gzip.decompress(target.read_bytes()) == path.read_bytes(), (
+            f"{target.name} is out of date, {HINT}"
+        )
+
+    def test_brotli_matches_source(self, path):
+        target = path.with_name(path.name + ".br")
+        assert target.exists(), f"{target.name} missing, {HINT}"
+        brotli = pytest.importorskip("brotli")
+        assert brotli.decompress(target.read_bytes()) == path.read_bytes(), (
+            f"{target.name} is out of date, {HINT}"
+        )
+
+    def test_compressed_is_smaller(self, path):
+        size = path.stat().st_size
+        for suffix in (".gz", ".br"):
+            assert path.with_name(path.name + suffix).stat().st_size < size
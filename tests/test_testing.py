@@ -0,0 +1,123 @@
+"""Tests for the unfold_modal.testing performance budget helpers."""
+
+import pytest
+
+from testapp.models import Category, Country
+from unfold_modal.testing import (
+    PopupBudget,
+    assert_popup_budget,
+    get_asset_urls,
+    measure_popup,
+    popup_url,
+)
+
+
+@pytest.fixture
+def category(db):
+    """Create a test category."""
+    return Category.objects.create(name="Fiction")
+
+
+class TestPopupUrl:
+    """Test popup URL construction."""
+
+    def test_add_url(self):
+        assert popup_url(Category, "add") == "/admin/testapp/category/add/?_popup=1"
+
+    def test_change_url_from_instance(self):
+        obj = Category(pk=5)
+        assert popup_url(obj, "change") == "/admin/testapp/category/5/change/?_popup=1"
+
+    def test_lookup_url(self):
+        assert (
+            popup_url(Country, "lookup")
+            == "/admin/testapp/country/?_popup=1&_to_field=id"
+        )
+
+
+class TestAssetUrls:
+    """Test static asset extraction from popup HTML."""
+
+    def test_scripts_and_stylesheets_are_counted_once(self):
+        html = (
+            '<link rel="stylesheet" href="/a.css"><link rel="icon" href="/i.png">'
+            '<script src="/a.js"></script><script src="/a.js"></script>'
+            "<script>inline()</script>"
+        )
+        assert get_asset_urls(html) == ("/a.css", "/a.js")
+
+
+@pytest.mark.django_db
+class TestMeasurePopup:
+    """Test measurements of popup views."""
+
+    def test_measures_add_popup(self, admin_client):
+        """Rendering the add popup should report queries, size, render time and assets."""
+        metrics = measure_popup(admin_client, popup_url(Category, "add"))
+        assert metrics.status_code == 200
+        assert metrics.method == "GET"
+        assert metrics.queries == len(metrics.sql) > 0
+        assert metrics.bytes > 0
+        assert metrics.render_ms > 0
+        assert "/static/unfold_modal/js/modal_core.js" in metrics.asset_urls
+
+    def test_post_adds_popup_var(self, admin_client):
+        """Submitted data should be posted in popup mode."""
+        metrics = measure_popup(
+            admin_client, popup_url(Category, "add"), data={"name": "Poetry"}
+        )
+        assert metrics.method == "POST"
+        assert metrics.status_code == 200
+        assert Category.objects.filter(name="Poetry").exists()
+
+
+@pytest.mark.django_db
+class TestPopupBudget:
+    """Test budget assertions and failure reports."""
+
+    def test_within_budget(self, admin_client):
+        metrics = measure_popup(admin_client, popup_url(Category, "add"))
+        assert_popup_budget(metrics, PopupBudget(queries=100, bytes=10**7))
+
+    def test_exceeded_budget_report(self, admin_client):
+        """Failures should list budget vs. actual and the captured queries."""
+        metrics = measure_popup(admin_client, popup_url(Category, "add"))
+        with pytest.raises(AssertionError) as excinfo:
+            assert_popup_budget(metrics, PopupBudget(queries=0, assets=1000))
+
+        message = str(excinfo.value)
+        assert "Popup budget exceeded for GET /admin/testapp/category/add/" in message
+        assert f"queries             0 {metrics.queries:>10}" in message
+        assert "over budget" in message
+        assert metrics.sql[0] in message
+        assert "Assets:" not in message
+
+
+@pytest.mark.django_db
+class TestPopupFlows:
+    """Test the popup_flows fixture."""
+
+    def test_add_change_delete_lookup(self, popup_flows, category):
+        budget = PopupBudget(queries=50, bytes=10**7, render_ms=10_000, assets=100)
+        popup_flows.add(Category, budget)
+        popup_flows.add(Category, budget, data={"name": "Drama"})
+        popup_flows.change(category, budget)
+        popup_flows.lookup(Category, budget)
+        popup_flows.delete(category, budget)
+        popup_flows.delete(category, budget, confirm=True)
+        assert not Category.objects.filter(pk=category.pk).exists()
+
+    def test_invalid_submission_fails(self, popup_flows):
+        """Submissions that re-render the form with errors should fail."""
+        with pytest.raises(AssertionError, match="did not render the popup response") as exc:
+            popup_flows.add(Category, data={"name": ""})
+        assert "name: This field is required." in str(exc.value)
+        assert not Category.objects.exists()
+
+    def test_default_budget_fixture(self, popup_flows, popup_budget):
+        assert popup_flows.budget == popup_budget == PopupBudget()
+
+    def test_unexpected_status(self, popup_flows):
+        """Missing objects redirect to the admin index instead of rendering."""
+        with pytest.raises(AssertionError, match="returned 302, expected 200"):
+            popup_flows.change(Category(pk=999))
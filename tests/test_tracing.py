@@ -0,0 +1,230 @@
+"""Tests for trace context propagation across modal chains."""
+
+import logging
+from contextlib import contextmanager
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from unfold_modal.middleware import ModalTraceMiddleware
+from unfold_modal.tracing import (
+    TRACE_COOKIE,
+    TraceContext,
+    TraceContextFilter,
+    get_current_trace,
+    noop_span,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+def run(path, view=None, cookies=None):
+    """Run a GET request through ModalTraceMiddleware; return (request, response)."""
+    request = RequestFactory().get(path)
+    request.COOKIES.update(cookies or {})
+    response = ModalTraceMiddleware(view or (lambda request: HttpResponse()))(request)
+    return request, response
+
+
+@contextmanager
+def fixed_span(request, parent):
+    """Trace hook used by the hook setting test."""
+    yield TraceContext(parent.trace_id, "1" * 16, parent.span_id)
+
+
+class TestParseTraceparent:
+    """Test W3C traceparent parsing."""
+
+    def test_valid(self):
+        trace = parse_traceparent(TRACEPARENT)
+        assert trace == TraceContext(TRACE_ID, PARENT_ID, sampled=True)
+        assert trace.traceparent == TRACEPARENT
+
+    def test_not_sampled(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00").sampled is False
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "",
+            None,
+            "garbage",
+            f"01-{TRACE_ID}-{PARENT_ID}-01",
+            f"00-{'0' * 32}-{PARENT_ID}-01",
+            f"00-{TRACE_ID}-{'0' * 16}-01",
+            f"00-{TRACE_ID}-{PARENT_ID}",
+        ],
+    )
+    def test_invalid(self, value):
+        assert parse_traceparent(value) is None
+
+
+class TestNoopSpan:
+    """Test the no-op trace hook."""
+
+    def test_child_of_parent(self):
+        parent = parse_traceparent(TRACEPARENT)
+        with noop_span(None, parent) as trace:
+            assert trace.trace_id == TRACE_ID
+            assert trace.parent_id == PARENT_ID
+            assert len(trace.span_id) == 16
+            assert trace.span_id != PARENT_ID
+
+    def test_root(self):
+        with noop_span(None, None) as trace:
+            assert len(trace.trace_id) == 32
+            assert trace.parent_id == ""
+
+
+class TestModalTraceMiddleware:
+    """Test trace context handling of modal requests."""
+
+    def test_strips_trace_param(self):
+        """The traceparent should not reach views; other parameters are kept."""
+        request, _ = run(f"/admin/x/?_popup=1&_traceparent={TRACEPARENT}&q=x")
+        assert "_traceparent" not in request.GET
+        assert request.GET["q"] == "x"
+        assert not request.GET._mutable
+
+    def test_request_runs_in_child_span(self):
+        """Views and logs should see a span continuing the incoming trace."""
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        run(f"/admin/x/?_popup=1&_traceparent={TRACEPARENT}", view)
+
+        (trace,) = seen
+        assert trace.trace_id == TRACE_ID
+        assert trace.parent_id == PARENT_ID
+        assert get_current_trace() is None
+
+    def test_html_response_exposes_span(self):
+        """HTML documents should expose their span for nested modals."""
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            response = HttpResponse()
+            response["Server-Timing"] = "db;dur=5"
+            return response
+
+        _, response = run(f"/admin/x/?_popup=1&_traceparent={TRACEPARENT}", view)
+
+        assert response["Server-Timing"] == (
+            f'db;dur=5, traceparent;desc="{seen[0].traceparent}"'
+        )
+
+    def test_popup_reads_trace_cookie(self):
+        """Popup documents get the trace from the cookie; their URL is unchanged."""
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        run("/admin/x/?_popup=1", view, {TRACE_COOKIE: TRACEPARENT})
+
+        (trace,) = seen
+        assert trace.trace_id == TRACE_ID
+        assert trace.parent_id == PARENT_ID
+
+    def test_trace_cookie_ignored_outside_popups(self):
+        """A leftover cookie should not trace regular admin pages."""
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        run("/admin/x/", view, {TRACE_COOKIE: TRACEPARENT})
+        assert seen == [None]
+
+    def test_not_modified_exposes_span(self):
+        """Revalidated popup documents should still expose their span."""
+        view = lambda request: HttpResponse(status=304)  # noqa: E731
+        _, response = run("/admin/x/?_popup=1", view, {TRACE_COOKIE: TRACEPARENT})
+        assert f'traceparent;desc="00-{TRACE_ID}-' in response["Server-Timing"]
+
+    def test_non_html_response_is_untouched(self):
+        view = lambda request: HttpResponse("{}", content_type="application/json")  # noqa: E731
+        _, response = run(f"/admin/x/?_traceparent={TRACEPARENT}", view)
+        assert not response.has_header("Server-Timing")
+
+    def test_untraced_request(self):
+        """Requests without a traceparent should not get a span."""
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        _, response = run("/admin/x/?_popup=1", view)
+        assert seen == [None]
+        assert not response.has_header("Server-Timing")
+
+    def test_invalid_traceparent_starts_new_trace(self):
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        run("/admin/x/?_popup=1&_traceparent=garbage", view)
+        assert seen[0].trace_id != TRACE_ID
+        assert seen[0].parent_id == ""
+
+    def test_trace_hook_setting(self, settings):
+        settings.UNFOLD_MODAL_TRACE_HOOK = "tests.test_tracing.fixed_span"
+        seen = []
+
+        def view(request):
+            seen.append(get_current_trace())
+            return HttpResponse()
+
+        run(f"/admin/x/?_popup=1&_traceparent={TRACEPARENT}", view)
+        assert seen == [TraceContext(TRACE_ID, "1" * 16, PARENT_ID)]
+
+    @pytest.mark.django_db
+    def test_traced_popup_response(self, admin_client):
+        """The popup_response submission should carry the modal's trace."""
+        response = admin_client.post(
+            f"/admin/testapp/country/add/?_popup=1&_traceparent={TRACEPARENT}",
+            {"name": "Austria", "_popup": "1"},
+        )
+        assert "popup_response_data" in response.context_data
+        assert f'traceparent;desc="00-{TRACE_ID}-' in response["Server-Timing"]
+
+
+class TestTraceContextFilter:
+    """Test trace IDs in log records."""
+
+    def make_record(self):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, "message", (), None)
+
+    def test_adds_ids_in_traced_request(self):
+        records = []
+
+        def view(request):
+            record = self.make_record()
+            TraceContextFilter().filter(record)
+            records.append(record)
+            return HttpResponse()
+
+        run(f"/admin/x/?_traceparent={TRACEPARENT}", view)
+
+        (record,) = records
+        assert record.trace_id == TRACE_ID
+        assert record.parent_span_id == PARENT_ID
+        assert len(record.span_id) == 16
+
+    def test_empty_outside_requests(self):
+        record = self.make_record()
+        assert TraceContextFilter().filter(record) is True
+        assert record.trace_id == record.span_id == record.parent_span_id == ""
@@ -0,0 +1,107 @@
+"""Playwright UI tests for the Select2 result cache shared with modal iframes."""
+
+import pytest
+from testapp.models import Author
+
+
+@pytest.fixture
+def autocomplete_cache(settings):
+    """Enable the shared autocomplete cache for the live server."""
+    settings.UNFOLD_MODAL_AUTOCOMPLETE_CLIENT_CACHE_SECONDS = 60
+
+
+@pytest.fixture
+def authors(db):
+    return [
+        Author.objects.create(name="Jane Smith"),
+        Author.objects.create(name="John Smithers"),
+    ]
+
+
+@pytest.fixture
+def autocomplete_requests(authenticated_page):
+    """URLs of autocomplete requests sent by the page and its iframes."""
+    urls = []
+    authenticated_page.on(
+        "request",
+        lambda request: urls.append(request.url)
+        if "/admin/autocomplete/" in request.url
+        else None,
+    )
+    return urls
+
+
+def search(frame, select_id, term):
+    """Open a Select2 widget, search for a term and wait for the results."""
+    frame.locator(f"#{select_id} ~ .select2-container").click()
+    frame.locator(".select2-search__field").fill(term)
+    results = frame.locator(".select2-results__option:has-text('Jane Smith')")
+    results.wait_for(state="visible", timeout=5000)
+    frame.locator(".select2-search__field").press("Escape")
+    return results
+
+
+def search_requests(urls, term):
+    return [url for url in urls if f"term={term}" in url]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSharedAutocompleteCache:
+    """Test that modal iframes reuse Select2 results of the top-level page."""
+
+    def test_modal_reuses_parent_results(
+        self,
+        authenticated_page,
+        live_server,
+        autocomplete_cache,
+        authors,
+        autocomplete_requests,
+    ):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/chapter/add/")
+
+        search(page, "id_editor", "Smith")
+        assert len(search_requests(autocomplete_requests, "Smith")) == 1
+
+        # The Book add modal has a Chapter inline with the same editor field
+        page.click("#add_id_book")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("input[name='title']").wait_for(state="visible", timeout=5000)
+
+        search(iframe, "id_chapters-0-editor", "Smith")
+        assert len(search_requests(autocomplete_requests, "Smith")) == 1
+        assert page.evaluate("window.UnfoldModal.autocompleteCache.size") > 0
+
+    def test_popup_result_clears_cache(
+        self,
+        authenticated_page,
+        live_server,
+        autocomplete_cache,
+        authors,
+        autocomplete_requests,
+    ):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/chapter/add/")
+        search(page, "id_editor", "Smith")
+
+        page.click("#add_id_editor")
+        iframe = page.frame_locator(".unfold-modal-iframe")
+        iframe.locator("input[name='name']").fill("Will Smith")
+        iframe.locator("button[name='_save']").click()
+        page.wait_for_selector(".unfold-modal-overlay", state="detached")
+
+        assert page.evaluate("window.UnfoldModal.autocompleteCache.size") == 0
+
+        search(page, "id_editor", "Smith")
+        assert len(search_requests(autocomplete_requests, "Smith")) == 2
+
+    def test_disabled_by_default(
+        self, authenticated_page, live_server, authors, autocomplete_requests
+    ):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/chapter/add/")
+
+        search(page, "id_editor", "Smith")
+        search(page, "id_editor", "Smith")
+        assert len(search_requests(autocomplete_requests, "Smith")) == 2
+        assert page.evaluate("window.UnfoldModal.autocompleteCache.size") == 0
@@ -0,0 +1,138 @@
+"""Playwright UI tests for bulk add mode ("Save and add another" in modals)."""
+
+import re
+
+import pytest
+from playwright.sync_api import expect
+
+from testapp.models import Tag
+
+
+@pytest.fixture
+def bulk_add(settings):
+    """Enable bulk add mode for the live server."""
+    settings.UNFOLD_MODAL_BULK_ADD = True
+
+
+def open_add_tag(page):
+    page.click("#add_id_tags")
+    iframe = page.frame_locator(".unfold-modal-iframe")
+    iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+    return iframe
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkAdd:
+    """Test saving several objects from one modal without reloads."""
+
+    def test_results_stream_to_m2m_widget(self, authenticated_page, live_server, bulk_add):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        iframe = open_add_tag(page)
+        for name in ("Red", "Green", "Blue"):
+            iframe.locator("input[name='name']").fill(name)
+            iframe.locator("button[name='_addanother']").click()
+            expect(iframe.locator("#unfold-modal-bulk-status")).to_contain_text(name)
+
+        # Modal stays open on the same document, form is reset
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+        assert page.evaluate("window.UnfoldModal.utils.getActiveModal().loadCount") == 1
+        expect(iframe.locator("input[name='name']")).to_have_value("")
+
+        expect(page.locator("#id_tags_to option")).to_have_count(3)
+        assert set(Tag.objects.values_list("name", flat=True)) == {"Red", "Green", "Blue"}
+
+    def test_validation_error_shows_form(self, authenticated_page, live_server, bulk_add):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        iframe = open_add_tag(page)
+        # Bypass browser validation to get a server-side error
+        iframe.locator("input[name='name']").evaluate("el => el.removeAttribute('required')")
+        iframe.locator("button[name='_addanother']").click()
+
+        expect(iframe.locator(".errorlist, .errornote").first).to_be_visible(timeout=5000)
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+        assert Tag.objects.count() == 0
+
+    def test_error_after_save_is_not_resubmitted(
+        self, authenticated_page, live_server, bulk_add
+    ):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        iframe = open_add_tag(page)
+        frame = next(frame for frame in page.frames if "/tag/add/" in frame.url)
+        # Fail while handling the response, after the object was saved
+        frame.evaluate(
+            "HTMLFormElement.prototype.reset = () => { throw new Error('reset failed'); }"
+        )
+        iframe.locator("input[name='name']").fill("Red")
+        iframe.locator("button[name='_addanother']").click()
+
+        status = iframe.locator("#unfold-modal-bulk-status")
+        expect(status).to_have_class(re.compile(r"\bunfold-modal-bulk-status-error\b"))
+        page.wait_for_timeout(500)
+        assert list(Tag.objects.values_list("name", flat=True)) == ["Red"]
+        assert page.evaluate("window.UnfoldModal.utils.getActiveModal().loadCount") == 1
+
+    def test_save_still_closes_modal(self, authenticated_page, live_server, bulk_add):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        iframe = open_add_tag(page)
+        iframe.locator("input[name='name']").fill("Red")
+        iframe.locator("button[name='_addanother']").click()
+        expect(iframe.locator("#unfold-modal-bulk-status")).to_contain_text("Red")
+        iframe.locator("input[name='name']").fill("Green")
+        iframe.locator("button[name='_save']").click()
+
+        page.wait_for_timeout(1000)
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 0
+        expect(page.locator("#id_tags_to option")).to_have_count(2)
+
+    def test_disabled_by_default(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        iframe = open_add_tag(page)
+        expect(iframe.locator("button[name='_addanother']")).to_have_count(0)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkAddOpenForResult:
+    """Test bulk add in modals opened with UnfoldModal.openForResult()."""
+
+    def test_every_result_reaches_on_result(
+        self, authenticated_page, live_server, bulk_add
+    ):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+        errors = []
+        page.on("pageerror", lambda error: errors.append(error))
+
+        page.evaluate(
+            """() => {
+                window.bulkResults = [];
+                window.modalResult = window.UnfoldModal.openForResult('/admin/testapp/tag/add/', {
+                    onResult: (result) => window.bulkResults.push(result.repr)
+                });
+            }"""
+        )
+        iframe = page.frame_locator(".unfold-modal-iframe")
+        iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+
+        for name in ("Red", "Green", "Blue"):
+            iframe.locator("input[name='name']").fill(name)
+            iframe.locator("button[name='_addanother']").click()
+            expect(iframe.locator("#unfold-modal-bulk-status")).to_contain_text(name)
+
+        assert page.evaluate("window.bulkResults") == ["Red", "Green", "Blue"]
+        assert page.evaluate("window.modalResult.then((result) => result.repr)") == "Red"
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+        assert errors == []
+
+        # Django's dismiss functions are not called for API-opened modals
+        expect(page.locator("#id_tags_to option")).to_have_count(0)
+        assert set(Tag.objects.values_list("name", flat=True)) == {"Red", "Green", "Blue"}
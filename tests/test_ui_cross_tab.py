@@ -0,0 +1,164 @@
+"""Playwright UI tests for cross-tab propagation of popup results."""
+
+import pytest
+from playwright.sync_api import expect
+
+from testapp.models import Country
+
+
+@pytest.fixture
+def country(db):
+    """Create a test country."""
+    return Country.objects.create(name="Switzerland")
+
+
+def open_second_tab(page, url):
+    """Open another tab in the same browser context and wait for modal init."""
+    other = page.context.new_page()
+    other.goto(url)
+    other.wait_for_function("window.UnfoldModal && window.UnfoldModal.tabId")
+    return other
+
+
+def save_country_in_modal(page, trigger, name):
+    """Open a Country popup from the City form, set the name and save."""
+    page.click(trigger)
+    iframe = page.frame_locator(".unfold-modal-iframe")
+    iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+    iframe.locator("input[name='name']").fill(name)
+    iframe.locator("button[name='_save'], input[name='_save']").first.click()
+    page.wait_for_timeout(1000)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCrossTabPropagation:
+    """Test BroadcastChannel updates of related selects in other tabs."""
+
+    def test_added_object_appears_in_other_tab(self, authenticated_page, live_server):
+        """An object added in one tab should be added to selects in another tab."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        other = open_second_tab(page, f"{live_server.url}/admin/testapp/city/add/")
+
+        save_country_in_modal(page, "#add_id_country", "Austria")
+
+        country = Country.objects.get(name="Austria")
+        option = other.locator(f"#id_country option[value='{country.pk}']")
+        expect(option).to_have_count(1)
+        expect(option).to_have_text("Austria")
+        # Not selected in the other tab
+        expect(other.locator("#id_country")).not_to_have_value(str(country.pk))
+
+    def test_changed_object_is_renamed_in_other_tab(
+        self, authenticated_page, live_server, country
+    ):
+        """A changed object should be renamed in selects in another tab."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        other = open_second_tab(page, f"{live_server.url}/admin/testapp/city/add/")
+
+        page.select_option("#id_country", str(country.pk))
+        save_country_in_modal(page, "#change_id_country", "Schweiz")
+
+        expect(other.locator(f"#id_country option[value='{country.pk}']")).to_have_text(
+            "Schweiz"
+        )
+
+    def test_deleted_object_keeps_selected_option(
+        self, authenticated_page, live_server, country
+    ):
+        """Deletes should not remove an option that is selected in another tab."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        other = open_second_tab(page, f"{live_server.url}/admin/testapp/city/add/")
+        other.select_option("#id_country", str(country.pk))
+        third = open_second_tab(page, f"{live_server.url}/admin/testapp/city/add/")
+
+        page.select_option("#id_country", str(country.pk))
+        page.click("#delete_id_country")
+        iframe = page.frame_locator(".unfold-modal-iframe")
+        iframe.locator("button[type='submit'], input[type='submit']").first.click()
+        page.wait_for_timeout(1000)
+
+        expect(third.locator(f"#id_country option[value='{country.pk}']")).to_have_count(0)
+        expect(other.locator(f"#id_country option[value='{country.pk}']")).to_have_count(1)
+
+    def test_origin_tab_iframe_does_not_duplicate_option(
+        self, authenticated_page, live_server
+    ):
+        """Nested results forwarded inside the same tab should be applied once."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+
+        page.click("#add_id_city")
+        iframe_a = page.frame_locator(".unfold-modal-iframe")
+        iframe_a.locator("#add_id_country").wait_for(state="visible", timeout=5000)
+        iframe_a.locator("#add_id_country").click()
+        page.wait_for_timeout(500)
+
+        iframe_b = page.frame_locator(".unfold-modal-iframe").last
+        iframe_b.locator("input[name='name']").fill("Italy")
+        iframe_b.locator("button[name='_save'], input[name='_save']").first.click()
+        page.wait_for_timeout(1000)
+
+        country = Country.objects.get(name="Italy")
+        options = page.frame_locator(".unfold-modal-iframe").first.locator(
+            f"#id_country option[value='{country.pk}']"
+        )
+        expect(options).to_have_count(1)
+
+
+BROADCAST_ADD = """
+(appLabel) => {
+    const channel = new BroadcastChannel('unfold-modal');
+    channel.postMessage({
+        type: window.UnfoldModal.MSG.POPUP_ADD,
+        tabId: 'other-tab',
+        appLabel: appLabel,
+        model: 'country',
+        newId: 999,
+        newRepr: appLabel + ' country'
+    });
+    channel.close();
+}
+"""
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCrossTabAppLabel:
+    """Test that results only reach selects of the same app and model."""
+
+    def test_path_parsing(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        page.wait_for_function("window.UnfoldModal && window.UnfoldModal.utils")
+
+        parse = "(path) => window.UnfoldModal.utils.getAdminModelFromPath(path)"
+        assert page.evaluate(parse, "/admin/blog/category/add/") == {
+            "appLabel": "blog",
+            "model": "category",
+        }
+        assert page.evaluate(parse, "/admin/shop/category/__fk__/change/") == {
+            "appLabel": "shop",
+            "model": "category",
+        }
+        assert page.evaluate(parse, "/admin/testapp/country/3/delete/") == {
+            "appLabel": "testapp",
+            "model": "country",
+        }
+        assert page.evaluate(parse, "/admin/") is None
+
+    def test_same_model_name_in_other_app_is_ignored(
+        self, authenticated_page, live_server
+    ):
+        """A result for shop.Country should not patch testapp.Country selects."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        other = open_second_tab(page, f"{live_server.url}/admin/testapp/city/add/")
+
+        page.evaluate(BROADCAST_ADD, "shop")
+        page.evaluate(BROADCAST_ADD, "testapp")
+
+        options = other.locator("#id_country option[value='999']")
+        expect(options).to_have_count(1)
+        expect(options).to_have_text("testapp country")
@@ -0,0 +1,86 @@
+"""Playwright UI tests for the modal stack performance HUD."""
+
+import pytest
+from playwright.sync_api import expect
+
+
+def open_nested_modals(page):
+    """Open City (from Venue) and a nested Country modal, wait for both forms."""
+    page.click("#add_id_city")
+    iframe = page.frame_locator(".unfold-modal-iframe:visible")
+    iframe.locator("#add_id_country").click()
+    nested = page.frame_locator(".unfold-modal-iframe:visible")
+    nested.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+    return nested
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDebugHud:
+    """Test the opt-in debug HUD."""
+
+    def test_hidden_by_default(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+        page.wait_for_function("window.UnfoldModal && window.UnfoldModal.hud")
+
+        assert page.locator(".unfold-modal-hud").count() == 0
+
+    def test_enabled_by_query_parameter(self, authenticated_page, live_server):
+        """?unfold_modal_debug=1 should show the HUD with one row per level."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/?unfold_modal_debug=1")
+
+        hud = page.locator(".unfold-modal-hud")
+        expect(hud).to_be_visible()
+        expect(hud.locator(".unfold-modal-hud-summary")).to_contain_text("Modals: 0")
+
+        open_nested_modals(page)
+
+        rows = hud.locator("tbody tr")
+        expect(rows).to_have_count(2)
+        expect(rows.nth(0)).to_contain_text("id_city__1")
+        expect(rows.nth(0)).to_contain_text("/admin/testapp/city/add/")
+        expect(rows.nth(1)).to_contain_text("id_country__2")
+        expect(rows.nth(1)).to_contain_text(" ms")
+
+        # Ready time, node and listener counts are measured per level
+        cells = rows.nth(1).locator("td")
+        assert cells.nth(3).inner_text().endswith(" ms")
+        assert int(cells.nth(4).inner_text()) > 0
+        assert int(cells.nth(6).inner_text()) > 0
+
+        # HUD is not rendered inside modal iframes
+        nested = page.frame_locator(".unfold-modal-iframe:visible")
+        expect(nested.locator(".unfold-modal-hud")).to_have_count(0)
+
+    def test_enabled_by_setting(self, authenticated_page, live_server, settings):
+        settings.UNFOLD_MODAL_DEBUG = True
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+
+        expect(page.locator(".unfold-modal-hud")).to_be_visible()
+
+    def test_close_button_hides_hud(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/?unfold_modal_debug=1")
+
+        page.click(".unfold-modal-hud-close")
+
+        expect(page.locator(".unfold-modal-hud")).to_have_count(0)
+        assert page.evaluate("window.UnfoldModal.hud.visible") is False
+
+    def test_forwarded_dismiss_is_acknowledged(self, authenticated_page, live_server):
+        """Pending dismisses should drop back to 0 once the parent iframe applied them."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/?unfold_modal_debug=1")
+        nested = open_nested_modals(page)
+
+        nested.locator("input[name='name']").fill("HUD Country")
+        nested.locator("button[name='_save']").click()
+
+        page.wait_for_function("window.UnfoldModal.stackDepth() === 1")
+        page.wait_for_function(
+            "window.UnfoldModal.state.modalStack[0].pendingDismisses === 0"
+        )
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        expect(iframe.locator("#id_country option:checked")).to_have_text("HUD Country")
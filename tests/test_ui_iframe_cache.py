@@ -0,0 +1,220 @@
+"""Playwright UI tests for reusing recently closed modal iframes."""
+
+import pytest
+from playwright.sync_api import expect
+
+from testapp.models import Country
+
+
+@pytest.fixture
+def iframe_cache(settings):
+    """Enable the iframe cache for the live server."""
+    settings.UNFOLD_MODAL_IFRAME_CACHE_SIZE = 2
+    settings.UNFOLD_MODAL_IFRAME_CACHE_TTL = 60
+
+
+@pytest.fixture
+def country(db):
+    """Create a test country."""
+    return Country.objects.create(name="Switzerland")
+
+
+def open_add_country(page):
+    """Open the Country add modal from the City form and wait for the form."""
+    page.click("#add_id_country")
+    iframe = page.frame_locator(".unfold-modal-iframe:visible")
+    iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+    return iframe
+
+
+def close_active_modal(page):
+    """Close the active modal and wait for the close animation."""
+    page.locator(".unfold-modal-overlay:visible .unfold-modal-close").click()
+    page.wait_for_timeout(300)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIframeCacheReuse:
+    """Test LRU reuse of closed modal iframes."""
+
+    def test_reopen_reuses_iframe(self, authenticated_page, live_server, iframe_cache):
+        """Reopening the same add popup should reuse the parked iframe element."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        open_add_country(page)
+        page.evaluate(
+            "document.querySelector('.unfold-modal-iframe').dataset.marker = 'first'"
+        )
+        close_active_modal(page)
+
+        assert page.evaluate("window.UnfoldModal.cache.size") == 1
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 0
+
+        open_add_country(page)
+        marker = page.evaluate(
+            "document.querySelector('.unfold-modal-overlay:not(.unfold-modal-hidden) "
+            ".unfold-modal-iframe').dataset.marker"
+        )
+        assert marker == "first"
+        assert page.evaluate("window.UnfoldModal.cache.size") == 0
+
+    def test_reused_add_form_is_reset(
+        self, authenticated_page, live_server, iframe_cache
+    ):
+        """A reused add form should not keep values typed before closing."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        iframe = open_add_country(page)
+        iframe.locator("input[name='name']").fill("Draft")
+        close_active_modal(page)
+
+        iframe = open_add_country(page)
+        expect(iframe.locator("input[name='name']")).to_have_value("")
+
+    def test_reused_add_form_still_saves(
+        self, authenticated_page, live_server, iframe_cache
+    ):
+        """Saving from a reused iframe should update the parent select."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        open_add_country(page)
+        close_active_modal(page)
+
+        iframe = open_add_country(page)
+        iframe.locator("input[name='name']").fill("Austria")
+        iframe.locator("button[name='_save'], input[name='_save']").first.click()
+        page.wait_for_timeout(1000)
+
+        expect(page.locator("#id_country option:checked")).to_have_text("Austria")
+        assert Country.objects.filter(name="Austria").exists()
+
+    def test_dismissed_modal_is_not_cached(
+        self, authenticated_page, live_server, iframe_cache
+    ):
+        """A modal closed through popup_response should be discarded, not parked."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        iframe = open_add_country(page)
+        iframe.locator("input[name='name']").fill("Italy")
+        iframe.locator("button[name='_save'], input[name='_save']").first.click()
+        page.wait_for_timeout(1000)
+
+        assert page.evaluate("window.UnfoldModal.cache.size") == 0
+        assert page.locator(".unfold-modal-overlay").count() == 0
+
+    def test_reused_iframe_is_retagged_for_new_opener(
+        self, authenticated_page, live_server, iframe_cache
+    ):
+        """Reused iframes carry the new opener's popup names and a new trace."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+
+        # Country add modal nested in the City modal, then both parked
+        page.click("#add_id_city")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("#add_id_country").click()
+        nested = page.frame_locator(".unfold-modal-iframe:visible")
+        nested.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        previous_trace = page.evaluate(
+            "window.UnfoldModal.utils.getActiveModal().traceparent"
+        )
+        close_active_modal(page)
+        close_active_modal(page)
+
+        # Reopened from the page itself
+        page.evaluate(
+            "window.modalResult = window.UnfoldModal.openForResult("
+            "'/admin/testapp/country/add/', 'custom__1')"
+        )
+        params = page.evaluate(
+            """() => {
+                const modal = window.UnfoldModal.utils.getActiveModal();
+                const url = new URL(modal.iframe.contentWindow.location.href);
+                return {
+                    modal: url.searchParams.get('_modal'),
+                    parent: url.searchParams.get('_modal_parent'),
+                    urlTraceparent: url.searchParams.get('_traceparent'),
+                    traceparent: modal.traceparent
+                };
+            }"""
+        )
+        assert page.evaluate("window.UnfoldModal.cache.size") == 1
+        assert params["modal"] == "custom__1"
+        assert params["parent"] is None
+        # The trace travels in a cookie, so the URL stays cacheable
+        assert params["urlTraceparent"] is None
+        assert params["traceparent"].split("-")[1] != previous_trace.split("-")[1]
+
+        # Form submissions post to the re-tagged URL
+        reused = page.frame_locator(".unfold-modal-iframe:visible")
+        reused.locator("input[name='name']").fill("Austria")
+        reused.locator("button[name='_save'], input[name='_save']").first.click()
+        result = page.evaluate("window.modalResult")
+        assert result["repr"] == "Austria"
+
+    def test_change_view_reloads_on_reuse(
+        self, authenticated_page, live_server, iframe_cache, country
+    ):
+        """Reused change views should reload to pick up fresh data."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        page.select_option("#id_country", str(country.pk))
+
+        page.click("#change_id_country")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        close_active_modal(page)
+
+        Country.objects.filter(pk=country.pk).update(name="Schweiz")
+
+        page.click("#change_id_country")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        expect(iframe.locator("input[name='name']")).to_have_value(
+            "Schweiz", timeout=5000
+        )
+
+    @pytest.mark.parametrize("link", ["#add_id_country", "#change_id_country"])
+    def test_double_open_of_reused_modal_opens_single_modal(
+        self, authenticated_page, live_server, iframe_cache, country, link
+    ):
+        """Rapid repeat opens should be ignored for modals taken from the cache."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+        page.select_option("#id_country", str(country.pk))
+
+        page.click(link)
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        close_active_modal(page)
+
+        # Both clicks reach the link, as if the overlay was not there yet
+        page.evaluate(
+            """(link) => {
+                document.querySelector(link).click();
+                document.querySelector(link).click();
+            }""",
+            link,
+        )
+        page.wait_for_timeout(500)
+
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIframeCacheDisabled:
+    """Test default behavior without the iframe cache."""
+
+    def test_closed_modal_is_removed(self, authenticated_page, live_server):
+        """With the default config, closing a modal removes its overlay."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        open_add_country(page)
+        close_active_modal(page)
+
+        assert page.locator(".unfold-modal-overlay").count() == 0
+        assert page.evaluate("window.UnfoldModal.cache.size") == 0
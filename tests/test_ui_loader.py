@@ -0,0 +1,56 @@
+"""Playwright UI tests for the on-demand modal loader."""
+
+import pytest
+
+from unfold_modal.utils import get_modal_loader_scripts_with_config
+
+
+@pytest.fixture
+def modal_loader(settings):
+    """Serve the admin with the loader instead of the modal styles and scripts."""
+    settings.UNFOLD = {
+        **settings.UNFOLD,
+        "STYLES": [],
+        "SCRIPTS": [*get_modal_loader_scripts_with_config()],
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestModalLoader:
+    """Test deferred loading of the modal assets."""
+
+    def test_modal_assets_not_loaded_initially(
+        self, authenticated_page, live_server, modal_loader
+    ):
+        """Only the loader should be part of the initial page."""
+        page = authenticated_page
+        # Keep the idle callback from loading the assets during the check
+        page.add_init_script("window.requestIdleCallback = function() {};")
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        assert page.locator("script[src*='loader.js']").count() == 1
+        assert page.locator("script[src*='related_modal.js']").count() == 0
+        assert page.locator("link[href*='modal.css']").count() == 0
+        assert page.evaluate("typeof window.UnfoldModal") == "undefined"
+
+    def test_first_click_opens_modal(self, authenticated_page, live_server, modal_loader):
+        """The first related-widget click should load the assets and open a modal."""
+        page = authenticated_page
+        page.add_init_script("window.requestIdleCallback = function() {};")
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        page.click("#add_id_country")
+
+        page.wait_for_selector(".unfold-modal-overlay", state="visible", timeout=5000)
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        assert len(page.context.pages) == 1
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+
+    def test_idle_load(self, authenticated_page, live_server, modal_loader):
+        """Assets should load once the browser is idle, without interaction."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        page.wait_for_function("window.UnfoldModal && window.UnfoldModal.open")
+        assert page.locator("link[href*='modal.css']").count() == 1
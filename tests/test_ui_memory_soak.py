@@ -0,0 +1,153 @@
+"""Playwright soak test: repeated modal open/close must not leak memory.
+
+Uses the Chrome DevTools Protocol for heap, DOM node and listener counts,
+so it only runs on Chromium. The soak is deselected by default:
+
+    pytest tests/test_ui_memory_soak.py -m soak --browser chromium
+"""
+
+import pytest
+
+# Modals opened in total (two per cycle: a modal and a nested modal)
+MODAL_COUNT = 1000
+WARMUP_CYCLES = 5
+
+# Allowed growth over the baseline after garbage collection
+NODE_TOLERANCE = 100
+LISTENER_TOLERANCE = 10
+HEAP_TOLERANCE_BYTES = 2 * 1024 * 1024
+
+# Opens a modal and a nested modal, waits for both iframes, closes both
+RUN_CYCLES = """
+async ([url, nestedUrl, cycles]) => {
+    const Modal = window.UnfoldModal;
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+    async function openAndLoad(href, name) {
+        // Closing rejects the result promise
+        Modal.openForResult(href, name).catch(() => {});
+        const modal = Modal.utils.getActiveModal();
+        for (let i = 0; i < 100 && modal.loadCount === 0; i++) {
+            await sleep(20);
+        }
+    }
+
+    async function closeAndWait() {
+        Modal.close();
+        while (Modal.state.isClosing) {
+            await sleep(20);
+        }
+    }
+
+    for (let i = 0; i < cycles; i++) {
+        await openAndLoad(url, 'id_venue__1');
+        await openAndLoad(nestedUrl, 'id_city__2');
+        await closeAndWait();
+        await closeAndWait();
+    }
+    return Modal.stackDepth();
+}
+"""
+
+
+def collect_metrics(cdp):
+    """Force garbage collection and return the page's performance metrics."""
+    cdp.send("HeapProfiler.collectGarbage")
+    cdp.send("HeapProfiler.collectGarbage")
+    metrics = cdp.send("Performance.getMetrics")["metrics"]
+    return {metric["name"]: metric["value"] for metric in metrics}
+
+
+def global_listener_count(cdp, expression):
+    """Return the number of event listeners registered on a global object."""
+    remote = cdp.send("Runtime.evaluate", {"expression": expression})
+    listeners = cdp.send(
+        "DOMDebugger.getEventListeners", {"objectId": remote["result"]["objectId"]}
+    )
+    return len(listeners["listeners"])
+
+
+@pytest.fixture
+def cdp(authenticated_page, browser_name):
+    """CDP session for the authenticated page (Chromium only)."""
+    if browser_name != "chromium":
+        pytest.skip("CDP metrics are only available in Chromium")
+    session = authenticated_page.context.new_cdp_session(authenticated_page)
+    session.send("Performance.enable")
+    yield session
+    session.detach()
+
+
+@pytest.mark.soak
+@pytest.mark.django_db(transaction=True)
+class TestModalMemorySoak:
+    """Open and close many (nested) modals and compare against a baseline."""
+
+    def run_cycles(self, page, live_server, cycles):
+        return page.evaluate(
+            RUN_CYCLES,
+            [
+                f"{live_server.url}/admin/testapp/city/add/?_popup=1",
+                f"{live_server.url}/admin/testapp/country/add/?_popup=1",
+                cycles,
+            ],
+        )
+
+    def test_open_close_returns_to_baseline(self, authenticated_page, live_server, cdp):
+        page = authenticated_page
+        page.set_default_timeout(30 * 60 * 1000)
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+        page.wait_for_function("window.UnfoldModal && window.UnfoldModal.open")
+
+        # Warm up lazily created objects (compiled code, caches, Select2)
+        self.run_cycles(page, live_server, WARMUP_CYCLES)
+        baseline = collect_metrics(cdp)
+        document_listeners = global_listener_count(cdp, "document")
+        window_listeners = global_listener_count(cdp, "window")
+
+        assert self.run_cycles(page, live_server, MODAL_COUNT // 2) == 0
+        after = collect_metrics(cdp)
+
+        assert page.locator(".unfold-modal-overlay").count() == 0
+        assert after["Documents"] <= baseline["Documents"]
+        assert after["Frames"] <= baseline["Frames"]
+        assert after["Nodes"] <= baseline["Nodes"] + NODE_TOLERANCE
+        assert after["JSEventListeners"] <= baseline["JSEventListeners"] + LISTENER_TOLERANCE
+        assert after["JSHeapUsedSize"] <= baseline["JSHeapUsedSize"] + HEAP_TOLERANCE_BYTES
+        assert global_listener_count(cdp, "document") == document_listeners
+        assert global_listener_count(cdp, "window") == window_listeners
+
+
+@pytest.mark.django_db(transaction=True)
+class TestModalDispose:
+    """Test UnfoldModal.dispose()."""
+
+    def test_dispose_removes_open_and_cached_modals(
+        self, authenticated_page, live_server, settings
+    ):
+        settings.UNFOLD_MODAL_IFRAME_CACHE_SIZE = 2
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+
+        page.click("#add_id_city")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("#add_id_country").click()
+        nested = page.frame_locator(".unfold-modal-iframe:visible")
+        nested.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        page.locator(".unfold-modal-overlay:visible .unfold-modal-close").click()
+        page.wait_for_timeout(300)
+
+        # City modal open, nested Country modal parked in the cache
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+        assert page.evaluate("window.UnfoldModal.cache.size") == 1
+
+        page.evaluate("window.UnfoldModal.dispose()")
+
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 0
+        assert page.evaluate("window.UnfoldModal.cache.size") == 0
+        assert page.locator(".unfold-modal-overlay").count() == 0
+        assert page.evaluate("document.body.style.overflow") == ""
+
+        # Modals still work after disposal
+        page.click("#add_id_city")
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
@@ -1,5 +1,7 @@
 """Playwright UI tests for modal UX features (T13): title, maximize, resize."""
 
+import re
+
 import pytest
 from playwright.sync_api import expect
 
@@ -456,3 +458,102 @@ class TestModalResizeBeyondPreset:
         # When resize is enabled, max-height should be 'none'
         max_height = container.evaluate("el => window.getComputedStyle(el).maxHeight")
         assert max_height == "none", f"max-height should be 'none' when resize enabled, got {max_height}"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestModalDoubleOpen:
+    """Test de-duplication of rapid repeat opens and teardown on close."""
+
+    def test_double_click_opens_single_modal(self, authenticated_page, live_server):
+        """Double clicking a related link should open exactly one modal."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        page.dblclick("#add_id_category")
+        page.wait_for_timeout(500)
+
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+        assert page.locator(".unfold-modal-overlay").count() == 1
+        expect(page.locator(".unfold-modal-overlay")).to_be_visible()
+
+    def test_repeat_open_while_loading_is_ignored(self, authenticated_page, live_server):
+        """Programmatic repeat opens of a loading popup should not stack."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        repeat = page.evaluate("""() => {
+            const url = window.location.origin + '/admin/testapp/category/add/?_popup=1';
+            window.UnfoldModal.openForResult(url, 'id_category__1').catch(() => {});
+            return window.UnfoldModal.openForResult(url, 'id_category__1').catch((e) => e.name);
+        }""")
+        page.wait_for_timeout(300)
+
+        assert repeat == "AbortError"
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+
+    def test_closed_modal_iframe_is_unloaded(self, authenticated_page, live_server):
+        """Closing should navigate the iframe to about:blank before removal."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        page.click("#add_id_category")
+        page.wait_for_selector(".unfold-modal-iframe")
+        page.evaluate("""() => {
+            const iframe = document.querySelector('.unfold-modal-iframe');
+            window.__closedIframe = iframe;
+        }""")
+
+        page.locator(".unfold-modal-close").click()
+        page.wait_for_timeout(300)
+
+        assert page.locator(".unfold-modal-overlay").count() == 0
+        src = page.evaluate("window.__closedIframe.getAttribute('src')")
+        assert src == "about:blank"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestModalReadyReveal:
+    """Test skeleton placeholder and early reveal on the child ready message."""
+
+    def test_skeleton_present_while_loading(self, authenticated_page, live_server):
+        """A new modal should start in loading state with a skeleton."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        # Stall the popup request so the loading state can be observed
+        page.route("**/category/add/?_popup=1", lambda route: None)
+        page.click("#add_id_category")
+
+        container = page.locator(".unfold-modal-container")
+        expect(container).to_have_class(re.compile(r"\bunfold-modal-loading\b"))
+        expect(page.locator(".unfold-modal-skeleton")).to_be_visible()
+        expect(page.locator(".unfold-modal-iframe")).to_be_hidden()
+
+    def test_ready_message_reveals_before_load(self, authenticated_page, live_server):
+        """The modal should be revealed on DOMContentLoaded, before the load event."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/book/add/")
+
+        page.evaluate("""() => {
+            window.__events = [];
+            window.addEventListener('message', (e) => {
+                if (e.data && e.data.type === 'django:modal:ready') {
+                    window.__events.push('ready');
+                }
+            });
+            document.addEventListener('load', (e) => {
+                if (e.target.classList && e.target.classList.contains('unfold-modal-iframe')) {
+                    window.__events.push('load');
+                }
+            }, true);
+        }""")
+        page.click("#add_id_category")
+
+        container = page.locator(".unfold-modal-container")
+        expect(container).not_to_have_class(re.compile(r"\bunfold-modal-loading\b"))
+        expect(page.locator(".unfold-modal-skeleton")).to_be_hidden()
+        expect(page.locator(".unfold-modal-title")).not_to_have_text("")
+
+        page.wait_for_function("window.__events.includes('load')")
+        events = page.evaluate("window.__events")
+        assert events.index("ready") < events.index("load")
@@ -34,11 +34,13 @@ class TestNestedModalStack:
         all_overlays = page.locator(".unfold-modal-overlay")
         assert all_overlays.count() == 2
 
-        # First overlay (modal A) should be hidden (display: none)
-        first_display = all_overlays.nth(0).evaluate(
-            "el => window.getComputedStyle(el).display"
+        # First overlay (modal A) should be hidden, keeping its rendering state
+        first_style = all_overlays.nth(0).evaluate(
+            "el => { const s = window.getComputedStyle(el);"
+            " return { visibility: s.visibility, contentVisibility: s.contentVisibility }; }"
         )
-        assert first_display == "none"
+        assert first_style == {"visibility": "hidden", "contentVisibility": "hidden"}
+        expect(all_overlays.nth(0)).to_have_class("unfold-modal-overlay unfold-modal-hidden")
 
         # Second overlay (modal B) should be visible
         expect(all_overlays.nth(1)).to_be_visible()
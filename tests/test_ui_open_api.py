@@ -0,0 +1,140 @@
+"""Playwright UI tests for the programmatic UnfoldModal.open() and openForResult() API."""
+
+import pytest
+from playwright.sync_api import expect
+
+from testapp.models import Country
+
+# Opens a popup and stores the settled result (or the rejection name)
+OPEN_FOR_RESULT = """
+(url) => {
+    window.modalResult = window.UnfoldModal.openForResult(url).then(
+        (result) => result,
+        (error) => ({ error: error.name })
+    );
+}
+"""
+
+
+@pytest.fixture
+def country(db):
+    """Create a test country."""
+    return Country.objects.create(name="Switzerland")
+
+
+def open_for_result(page, path):
+    page.evaluate(OPEN_FOR_RESULT, path)
+    iframe = page.frame_locator(".unfold-modal-iframe:visible")
+    iframe.locator("body").wait_for(timeout=5000)
+    return iframe
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOpenForResult:
+    """Test results of programmatically opened modals."""
+
+    def test_add_resolves_with_new_object(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        iframe = open_for_result(page, "/admin/testapp/country/add/")
+        iframe.locator("input[name='name']").fill("Austria")
+        iframe.locator("button[name='_save'], input[name='_save']").first.click()
+
+        result = page.evaluate("window.modalResult")
+        country = Country.objects.get(name="Austria")
+        assert result == {"action": "add", "id": str(country.pk), "repr": "Austria"}
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 0
+
+        # Django's dismiss functions are not called for API-opened modals
+        assert page.locator("#id_country option", has_text="Austria").count() == 0
+
+    def test_change_resolves_with_new_repr(self, authenticated_page, live_server, country):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/")
+
+        iframe = open_for_result(page, f"/admin/testapp/country/{country.pk}/change/")
+        iframe.locator("input[name='name']").fill("Schweiz")
+        iframe.locator("button[name='_save'], input[name='_save']").first.click()
+
+        result = page.evaluate("window.modalResult")
+        assert result == {
+            "action": "change",
+            "id": str(country.pk),
+            "repr": "Schweiz",
+            "previousId": str(country.pk),
+        }
+
+    def test_lookup_resolves_with_chosen_id(self, authenticated_page, live_server, country):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/")
+
+        iframe = open_for_result(page, "/admin/testapp/country/?_to_field=id")
+        iframe.locator("a", has_text="Switzerland").first.click()
+
+        result = page.evaluate("window.modalResult")
+        assert result == {"action": "lookup", "id": str(country.pk)}
+
+    def test_close_rejects(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/")
+
+        open_for_result(page, "/admin/testapp/country/add/")
+        page.locator(".unfold-modal-close").click()
+
+        assert page.evaluate("window.modalResult") == {"error": "AbortError"}
+
+    def test_open_in_iframe_resolves(self, authenticated_page, live_server):
+        """openForResult() inside a modal iframe should stack a modal and resolve."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/")
+
+        iframe = open_for_result(page, "/admin/testapp/city/add/")
+        iframe.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+        frame = next(frame for frame in page.frames if "/city/add/" in frame.url)
+        frame.evaluate(OPEN_FOR_RESULT, "/admin/testapp/country/add/")
+
+        # Named after the opener's nesting level: depth 2, child of the city modal
+        params = page.evaluate(
+            """() => {
+                const modal = window.UnfoldModal.utils.getActiveModal();
+                const url = new URL(modal.iframe.src);
+                return {
+                    modal: url.searchParams.get('_modal'),
+                    parent: url.searchParams.get('_modal_parent')
+                };
+            }"""
+        )
+        assert params == {"modal": "unfold_modal__2", "parent": "unfold_modal__1"}
+
+        nested = page.frame_locator(".unfold-modal-iframe:visible")
+        nested.locator("input[name='name']").fill("Austria")
+        nested.locator("button[name='_save'], input[name='_save']").first.click()
+
+        result = frame.evaluate("window.modalResult")
+        country = Country.objects.get(name="Austria")
+        assert result == {"action": "add", "id": str(country.pk), "repr": "Austria"}
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOpen:
+    """Test UnfoldModal.open() for related widgets."""
+
+    def test_open_dismisses_to_named_widget(self, authenticated_page, live_server):
+        """Results of open() should update the widget named by the popup name."""
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/city/add/")
+
+        page.evaluate(
+            "window.UnfoldModal.open("
+            "window.location.origin + '/admin/testapp/country/add/?_popup=1', "
+            "'id_country__1')"
+        )
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("input[name='name']").fill("Austria")
+        iframe.locator("button[name='_save'], input[name='_save']").first.click()
+
+        country = Country.objects.get(name="Austria")
+        expect(page.locator("#id_country")).to_have_value(str(country.pk))
+        assert page.evaluate("window.UnfoldModal.stackDepth()") == 0
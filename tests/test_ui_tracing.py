@@ -0,0 +1,47 @@
+"""Playwright UI tests for trace context propagation across modal chains."""
+
+import pytest
+
+DOCUMENT_TRACEPARENT = """
+(index) => {
+    const modal = window.UnfoldModal.state.modalStack[index];
+    return window.UnfoldModal.utils.getDocumentTraceparent(modal.iframe.contentWindow);
+}
+"""
+
+
+@pytest.mark.django_db(transaction=True)
+class TestModalTracing:
+    """Test traceparent propagation from the page down a nested chain."""
+
+    def test_nested_modals_continue_parent_span(self, authenticated_page, live_server):
+        page = authenticated_page
+        page.goto(f"{live_server.url}/admin/testapp/venue/add/")
+
+        page.click("#add_id_city")
+        iframe = page.frame_locator(".unfold-modal-iframe:visible")
+        iframe.locator("#add_id_country").click()
+        nested = page.frame_locator(".unfold-modal-iframe:visible")
+        nested.locator("input[name='name']").wait_for(state="visible", timeout=5000)
+
+        traceparents = page.evaluate(
+            "window.UnfoldModal.state.modalStack.map((modal) => modal.traceparent)"
+        )
+        city_span = page.evaluate(DOCUMENT_TRACEPARENT, 0)
+        country_span = page.evaluate(DOCUMENT_TRACEPARENT, 1)
+
+        # The trace travels in a short-lived cookie, not in the iframe URL
+        srcs = page.evaluate(
+            "window.UnfoldModal.state.modalStack.map((modal) => modal.iframe.src)"
+        )
+        assert all("_traceparent=" not in src for src in srcs)
+        assert "unfold_modal_traceparent" not in page.evaluate("document.cookie")
+
+        # The nested modal is a child of the server span that rendered its opener
+        assert traceparents[1] == city_span
+
+        # The whole chain shares one trace
+        trace_id = traceparents[0].split("-")[1]
+        assert city_span.split("-")[1] == trace_id
+        assert country_span.split("-")[1] == trace_id
+        assert len({traceparents[0], city_span, country_span}) == 3
@@ -1,5 +1,22 @@
+import json
+from functools import cache
+from types import MappingProxyType
+
 from django.apps import AppConfig
 from django.conf import settings
+from django.core.signals import setting_changed
+
+# Non-modal settings that affect the compiled config or resolved asset URLs
+DEPENDENT_SETTINGS = {
+    "STATIC_URL",
+    "STORAGES",
+    "ROOT_URLCONF",
+    "FORCE_SCRIPT_NAME",
+    "MIDDLEWARE",
+}
+
+MODAL_REQUEST_MIDDLEWARE = "unfold_modal.middleware.ModalRequestMiddleware"
+MODAL_TRACE_MIDDLEWARE = "unfold_modal.middleware.ModalTraceMiddleware"
 
 
 class UnfoldModalConfig(AppConfig):
@@ -15,6 +32,24 @@ class UnfoldModalConfig(AppConfig):
         "UNFOLD_MODAL_SIZE": "default",  # Presets: "default", "large", "full"
         "UNFOLD_MODAL_RESIZE": False,  # Enable manual resize handle
         "UNFOLD_MODAL_DISABLE_HEADER": True,  # Hide admin header in modal iframes
+        "UNFOLD_MODAL_IFRAME_CACHE_SIZE": 0,  # Closed iframes kept for reuse (0 = off)
+        "UNFOLD_MODAL_IFRAME_CACHE_TTL": 60,  # Seconds a closed iframe stays reusable
+        "UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES": 200,  # Static files kept (LRU)
+        "UNFOLD_MODAL_SERVICE_WORKER_SCOPE": None,  # Pages controlled (default: admin root)
+        "UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS": [],  # Run only outside modal iframes
+        "UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD": 500,  # Larger FK selects use autocomplete
+        "UNFOLD_MODAL_AUTOCOMPLETE_CLIENT_CACHE_SECONDS": 0,  # Browser-side Select2 cache (0 = off)
+        "UNFOLD_MODAL_BULK_ADD": False,  # "Save and add another" in add popups
+        "UNFOLD_MODAL_DEBUG": False,  # Performance HUD for the modal stack
+        "UNFOLD_MODAL_TRACE_HOOK": "unfold_modal.tracing.otel_span",  # Span per traced request
+        "UNFOLD_MODAL_PROFILE_RATE": 0.0,  # Fraction of modal requests profiled
+        "UNFOLD_MODAL_PROFILE_THRESHOLD_MS": None,  # Keep profiles of slower requests
+        "UNFOLD_MODAL_PROFILE_DIR": None,  # Profile ring buffer (default: per-project temp dir)
+        "UNFOLD_MODAL_PROFILE_MAX_FILES": 50,  # Profiles kept in the ring buffer
+        "UNFOLD_MODAL_LOOKUP_CACHE": "default",  # Cache alias of PopupLookupCacheMixin
+        "UNFOLD_MODAL_LOOKUP_CACHE_TIMEOUT": 300,  # Seconds a lookup page is cached
+        "UNFOLD_MODAL_AUTOCOMPLETE_MIN_TERM_LENGTH": 2,  # Shorter terms get no results
+        "UNFOLD_MODAL_AUTOCOMPLETE_CACHE_TIMEOUT": 300,  # Server-side results cache (seconds)
     }
 
     # Size preset dimensions (width, maxWidth, height, maxHeight)
@@ -24,11 +59,20 @@ class UnfoldModalConfig(AppConfig):
         "full": {"width": "98%", "maxWidth": "none", "height": "95vh", "maxHeight": "none"},
     }
 
+    def ready(self):
+        setting_changed.connect(clear_setting_caches)
+        # Compile the frontend config once at startup
+        get_modal_config_js()
 
+
+@cache
 def get_setting(name):
     """
     Get an unfold-modal setting with fallback to default.
 
+    Values are memoized; the cache is cleared on Django's ``setting_changed``
+    signal, so ``override_settings`` keeps working in tests.
+
     Args:
         name: The setting name (e.g., "UNFOLD_MODAL_SIZE")
 
@@ -37,3 +81,60 @@ def get_setting(name):
     """
     default_value = UnfoldModalConfig.default_settings.get(name)
     return getattr(settings, name, default_value)
+
+
+@cache
+def get_modal_config():
+    """
+    Return the compiled frontend configuration.
+
+    Returns:
+        MappingProxyType: Read-only mapping serialized as window.UNFOLD_MODAL_CONFIG.
+    """
+    size_preset = get_setting("UNFOLD_MODAL_SIZE")
+
+    # Get dimensions from preset or use default
+    presets = UnfoldModalConfig.SIZE_PRESETS
+    dimensions = presets.get(size_preset, presets["default"])
+
+    return MappingProxyType(
+        {
+            "size": size_preset,
+            "dimensions": MappingProxyType(dict(dimensions)),
+            "resize": get_setting("UNFOLD_MODAL_RESIZE"),
+            "disableHeader": get_setting("UNFOLD_MODAL_DISABLE_HEADER"),
+            "iframeCacheSize": get_setting("UNFOLD_MODAL_IFRAME_CACHE_SIZE"),
+            "iframeCacheTtl": get_setting("UNFOLD_MODAL_IFRAME_CACHE_TTL"),
+            "autocompleteClientCacheSeconds": get_setting(
+                "UNFOLD_MODAL_AUTOCOMPLETE_CLIENT_CACHE_SECONDS"
+            ),
+            "bulkAdd": get_setting("UNFOLD_MODAL_BULK_ADD"),
+            "debug": get_setting("UNFOLD_MODAL_DEBUG"),
+            # Tag iframe URLs with popup names only if the middleware strips them
+            "tagRequests": MODAL_REQUEST_MIDDLEWARE in settings.MIDDLEWARE,
+            "traceRequests": MODAL_TRACE_MIDDLEWARE in settings.MIDDLEWARE,
+        }
+    )
+
+
+@cache
+def get_modal_config_js():
+    """Return the serialized config script served by the config endpoint."""
+    config = get_modal_config()
+    config_dict = {**config, "dimensions": dict(config["dimensions"])}
+    return f"window.UNFOLD_MODAL_CONFIG = {json.dumps(config_dict)};"
+
+
+def clear_setting_caches(*, setting, **kwargs):
+    """Drop memoized settings, config and asset URLs when settings change."""
+    if not (setting.startswith("UNFOLD_MODAL_") or setting in DEPENDENT_SETTINGS):
+        return
+
+    from .utils import clear_asset_url_cache
+    from .views import _read_service_worker
+
+    get_setting.cache_clear()
+    get_modal_config.cache_clear()
+    get_modal_config_js.cache_clear()
+    clear_asset_url_cache()
+    _read_service_worker.cache_clear()
@@ -0,0 +1,43 @@
+"""Context processors for unfold-modal."""
+
+from functools import cache
+
+from django.utils.module_loading import import_string
+
+from .apps import get_setting
+from .utils import get_modal_request
+
+
+@cache
+def _load_processors(paths):
+    return tuple(import_string(path) for path in paths)
+
+
+def non_modal(request):
+    """
+    Run the UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS only outside modal iframes.
+
+    Move expensive context processors (notification counts, banners) from
+    TEMPLATES to the setting and add this processor in their place:
+
+        TEMPLATES = [{
+            "OPTIONS": {
+                "context_processors": [
+                    # ...
+                    "unfold_modal.context_processors.non_modal",
+                ],
+            },
+        }]
+
+        UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS = [
+            "myproject.context_processors.notifications",
+        ]
+    """
+    if get_modal_request(request).is_modal:
+        return {}
+
+    context = {}
+    paths = tuple(get_setting("UNFOLD_MODAL_SKIP_CONTEXT_PROCESSORS"))
+    for processor in _load_processors(paths):
+        context.update(processor(request))
+    return context
@@ -0,0 +1,227 @@
+"""Middleware for unfold-modal."""
+
+import random
+import time
+
+from .apps import get_setting
+from .profiling import SamplingProfiler, get_profile_store
+from .tracing import (
+    TRACE_COOKIE,
+    TRACE_VAR,
+    get_otel_traceparent,
+    parse_traceparent,
+    trace_request,
+)
+from .utils import (
+    MODAL_PARENT_VAR,
+    MODAL_VAR,
+    classify_request,
+    get_modal_request,
+    get_popup_assets,
+    is_popup_request,
+)
+
+
+class PopupPreloadMiddleware:
+    """
+    Add ``Link: rel=preload`` headers for the assets of popup pages.
+
+    Popup (``_popup``) GET/HEAD HTML pages list the styles and scripts configured
+    in UNFOLD["STYLES"]/["SCRIPTS"] and the modal helpers, so the browser can
+    start fetching them before it parses the iframe document. CDNs and
+    proxies that support 103 Early Hints (e.g. Cloudflare) turn these headers
+    into early hints, overlapping asset fetches with server think-time.
+    Form submissions are skipped: their ``popup_response.html`` page only
+    closes the modal.
+
+    Add after Django's session/auth middleware:
+
+        MIDDLEWARE = [
+            # ...
+            "unfold_modal.middleware.PopupPreloadMiddleware",
+        ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            request.method in ("GET", "HEAD")
+            and response.status_code == 200
+            and is_popup_request(request)
+            and response.get("Content-Type", "").startswith("text/html")
+        ):
+            links = [
+                f"<{url}>; rel=preload; as={kind}"
+                for url, kind in get_popup_assets(request)
+            ]
+            if links:
+                existing = response.get("Link")
+                response["Link"] = ", ".join([existing, *links] if existing else links)
+
+        return response
+
+
+class ModalRequestMiddleware:
+    """
+    Annotate requests with ``request.unfold_modal`` (a ModalRequest).
+
+    Tells views and context processors whether a request comes from an
+    unfold-modal iframe ("modal"), a legacy ``window.open`` popup ("popup")
+    or a regular page ("page"), plus the modal depth and the popup names of
+    the modal and its parent.
+
+    The frontend tags iframe URLs with ``_modal``/``_modal_parent`` when this
+    middleware is installed (config-enabled setup). The parameters are
+    removed from ``request.GET`` so admin views (e.g. changelist lookups)
+    never see them.
+
+        MIDDLEWARE = [
+            # ...
+            "unfold_modal.middleware.ModalRequestMiddleware",
+        ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.unfold_modal = classify_request(request)
+
+        if MODAL_VAR in request.GET or MODAL_PARENT_VAR in request.GET:
+            query = request.GET.copy()
+            query.pop(MODAL_VAR, None)
+            query.pop(MODAL_PARENT_VAR, None)
+            query._mutable = False
+            request.GET = query
+
+        return self.get_response(request)
+
+
+class ModalTraceMiddleware:
+    """
+    Propagate trace context across the requests of a modal chain.
+
+    When this middleware is installed, the frontend sends a W3C
+    ``traceparent`` with modal iframe requests: in the short-lived
+    ``unfold_modal_traceparent`` cookie for popup (``_popup``) documents,
+    which keeps their URLs cacheable, and as the ``_traceparent`` parameter
+    for form submissions. Those requests run in a span created by
+    ``UNFOLD_MODAL_TRACE_HOOK`` (OpenTelemetry if installed, else no-op IDs
+    for log correlation, see ``unfold_modal.tracing``). The parameter is
+    removed from ``request.GET``.
+
+    HTML (and 304) responses expose their span as ``Server-Timing:
+    traceparent``, so modals opened from that document continue the trace as
+    its children.
+
+        MIDDLEWARE = [
+            # ...
+            "unfold_modal.middleware.ModalRequestMiddleware",
+            "unfold_modal.middleware.ModalTraceMiddleware",
+        ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        value = self.get_incoming_traceparent(request)
+        if value is None:
+            response = self.get_response(request)
+            self.expose_trace(response, get_otel_traceparent())
+            return response
+
+        parent = parse_traceparent(value)
+        with trace_request(request, parent) as trace:
+            response = self.get_response(request)
+        self.expose_trace(response, trace.traceparent)
+        return response
+
+    def get_incoming_traceparent(self, request):
+        """Return the traceparent sent by the frontend (stripped from GET), or None."""
+        if TRACE_VAR in request.GET:
+            query = request.GET.copy()
+            value = query.pop(TRACE_VAR)[-1]
+            query._mutable = False
+            request.GET = query
+            return value
+        if is_popup_request(request):
+            return request.COOKIES.get(TRACE_COOKIE)
+        return None
+
+    def expose_trace(self, response, traceparent):
+        """Add the span of an HTML document (or a 304) to its Server-Timing header."""
+        if not traceparent:
+            return
+        if response.status_code != 304 and not response.get(
+            "Content-Type", ""
+        ).startswith("text/html"):
+            return
+        timing = f'traceparent;desc="{traceparent}"'
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+
+class ModalProfilerMiddleware:
+    """
+    Profile modal iframe requests with a low-overhead sampling profiler.
+
+    A fraction of modal requests (``UNFOLD_MODAL_PROFILE_RATE``) is always
+    profiled. With ``UNFOLD_MODAL_PROFILE_THRESHOLD_MS``, other modal requests
+    start sampling once they exceed the threshold, and their profiles (the
+    part after the threshold) are kept. Profiles go to a bounded on-disk ring
+    buffer, listed on the superuser page ``unfold_modal:profiles`` (see
+    ``unfold_modal.profiling``).
+
+        MIDDLEWARE = [
+            # ...
+            "unfold_modal.middleware.ModalRequestMiddleware",
+            "unfold_modal.middleware.ModalProfilerMiddleware",
+        ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_modal_request(request).is_modal:
+            return self.get_response(request)
+
+        rate = get_setting("UNFOLD_MODAL_PROFILE_RATE")
+        threshold = get_setting("UNFOLD_MODAL_PROFILE_THRESHOLD_MS")
+        sampled = bool(rate) and random.random() < rate
+        if not sampled and threshold is None:
+            return self.get_response(request)
+
+        # Unsampled requests are only sampled past the threshold
+        delay = 0.0 if sampled else threshold / 1000
+        start = time.perf_counter()
+        with SamplingProfiler(delay=delay) as profiler:
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if sampled or duration_ms >= threshold:
+            self.save_profile(request, response, profiler, duration_ms)
+        return response
+
+    def save_profile(self, request, response, profiler, duration_ms):
+        info = get_modal_request(request)
+        get_profile_store().save(
+            {
+                "created": time.time(),
+                "method": request.method,
+                "path": request.get_full_path(),
+                "popup": info.name,
+                "depth": info.depth,
+                "status_code": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+                "interval_ms": profiler.interval * 1000,
+                "delay_ms": profiler.delay * 1000,
+                "sample_count": sum(profiler.samples.values()),
+                "samples": dict(profiler.samples),
+            }
+        )
@@ -0,0 +1,366 @@
+"""ModelAdmin mixins for unfold-modal."""
+
+import hashlib
+import uuid
+from functools import update_wrapper
+
+from django.contrib.admin.options import IS_POPUP_VAR, TO_FIELD_VAR
+from django.contrib.admin.utils import unquote
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.urls import path
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+)
+from django.utils.http import quote_etag, urlencode
+
+from .apps import get_setting
+from .utils import get_modal_request, get_permission_fingerprint, is_popup_request
+
+
+class PopupConditionalGetMixin:
+    """
+    Answer repeated popup change/view requests with ``304 Not Modified``.
+
+    Popup (``_popup``) GET requests for the change view get an ETag derived
+    from the object's version, the user's permission fingerprint, the CSRF
+    cookie and the active language. When the browser revalidates with a
+    matching ``If-None-Match``, the form is not rendered again and the modal
+    iframe reuses its cached document.
+
+    Non-popup requests keep Django admin's ``never_cache`` behavior.
+
+    Example:
+        from unfold.admin import ModelAdmin
+        from unfold_modal.mixins import PopupConditionalGetMixin
+
+        @admin.register(Country)
+        class CountryAdmin(PopupConditionalGetMixin, ModelAdmin):
+            popup_version_field = "updated_at"
+    """
+
+    # Model attribute that changes whenever the object is saved
+    popup_version_field = "updated_at"
+
+    def get_popup_version(self, request, obj):
+        """
+        Return a value that changes whenever the rendered popup would.
+
+        Override for models without a version field, or when inlines or
+        related objects affect the form. Returning None disables the ETag.
+        """
+        return getattr(obj, self.popup_version_field, None)
+
+    def get_popup_etag(self, request, obj):
+        """Return the quoted ETag for a popup change/view page, or None."""
+        version = self.get_popup_version(request, obj)
+        if version is None:
+            return None
+
+        parts = [
+            self.opts.label_lower,
+            str(obj.pk),
+            str(version),
+            get_permission_fingerprint(request.user),
+            # Cached forms embed a CSRF token bound to the current cookie
+            request.META.get("CSRF_COOKIE", ""),
+            getattr(request, "LANGUAGE_CODE", ""),
+        ]
+        return quote_etag(hashlib.sha256("|".join(parts).encode()).hexdigest())
+
+    def get_urls(self):
+        """Serve the change view as cacheable so popup ETags can be revalidated."""
+        urls = super().get_urls()
+        name = f"{self.opts.app_label}_{self.opts.model_name}_change"
+
+        def wrapper(*args, **kwargs):
+            return self.admin_site.admin_view(self.change_view, cacheable=True)(
+                *args, **kwargs
+            )
+
+        wrapper.model_admin = self
+        update_wrapper(wrapper, self.change_view)
+
+        return [
+            path("<path:object_id>/change/", wrapper, name=name)
+            if url.name == name
+            else url
+            for url in urls
+        ]
+
+    def get_object(self, request, object_id, from_field=None):
+        # Reuse the object fetched for the ETag when the view is rendered
+        popup_object = request.__dict__.get("_unfold_modal_popup_object")
+        if popup_object is not None and popup_object[:2] == (object_id, from_field):
+            return popup_object[2]
+        return super().get_object(request, object_id, from_field)
+
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        etag = None
+        to_field = request.GET.get(TO_FIELD_VAR)
+        if (
+            request.method in ("GET", "HEAD")
+            and IS_POPUP_VAR in request.GET
+            and (not to_field or self.to_field_allowed(request, to_field))
+        ):
+            pk = unquote(object_id)
+            obj = self.get_object(request, pk, to_field)
+            request._unfold_modal_popup_object = (pk, to_field, obj)
+            if obj is not None and self.has_view_or_change_permission(request, obj):
+                etag = self.get_popup_etag(request, obj)
+
+        if etag:
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                response.headers["ETag"] = etag
+                patch_cache_control(response, private=True, no_cache=True)
+                return response
+
+        response = super().change_view(request, object_id, form_url, extra_context)
+
+        if etag and response.status_code == 200:
+            response.headers["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            add_never_cache_headers(response)
+        return response
+
+
+class PopupAutocompleteMixin:
+    """
+    Render huge ForeignKey selects as autocompletes in popup forms.
+
+    In popup (``_popup``) requests, ForeignKey fields whose related queryset
+    has more than ``popup_autocomplete_threshold`` rows are added to the
+    autocomplete fields, so the modal renders a Select2 widget backed by the
+    admin autocomplete view instead of one ``<option>`` per row. The
+    related-object add/change links are kept.
+
+    Only fields whose related model is registered on the same admin site
+    with ``search_fields`` are switched. Works for ModelAdmin and inlines.
+
+    Example:
+        from unfold.admin import ModelAdmin
+        from unfold_modal.mixins import PopupAutocompleteMixin
+
+        @admin.register(City)
+        class CityAdmin(PopupAutocompleteMixin, ModelAdmin):
+            popup_autocomplete_threshold = 200
+    """
+
+    # Row count above which a select becomes an autocomplete
+    # (None uses UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD)
+    popup_autocomplete_threshold = None
+
+    def get_popup_autocomplete_threshold(self, request):
+        if self.popup_autocomplete_threshold is not None:
+            return self.popup_autocomplete_threshold
+        return get_setting("UNFOLD_MODAL_AUTOCOMPLETE_THRESHOLD")
+
+    def get_autocomplete_fields(self, request):
+        fields = super().get_autocomplete_fields(request)
+        if not is_popup_request(request):
+            return fields
+
+        # Called once per related field while building the form
+        cache = request.__dict__.setdefault("_unfold_modal_autocomplete_fields", {})
+        if self not in cache:
+            cache[self] = tuple(fields) + self._get_large_foreign_keys(request, fields)
+        return cache[self]
+
+    def _get_large_foreign_keys(self, request, autocomplete_fields):
+        threshold = self.get_popup_autocomplete_threshold(request)
+        if threshold is None:
+            return ()
+
+        skipped = {*autocomplete_fields, *self.raw_id_fields, *self.radio_fields}
+        large = []
+        for field in self.opts.get_fields():
+            if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                continue
+            if field.name in skipped:
+                continue
+
+            related_admin = self.admin_site._registry.get(field.related_model)
+            if related_admin is None or not related_admin.get_search_fields(request):
+                continue
+
+            queryset = field.related_model._default_manager.all()
+            # Bounded count: stops scanning once the threshold is exceeded
+            if queryset[: threshold + 1].count() > threshold:
+                large.append(field.name)
+        return tuple(large)
+
+
+def get_lookup_cache():
+    return caches[get_setting("UNFOLD_MODAL_LOOKUP_CACHE")]
+
+
+def get_lookup_version_key(model):
+    return f"unfold_modal:lookup:version:{model._meta.label_lower}"
+
+
+def get_lookup_cache_versions(models):
+    """Return the current cache versions of models, for use in cache keys."""
+    cache = get_lookup_cache()
+    return [
+        cache.get_or_set(get_lookup_version_key(model), uuid.uuid4().hex, None)
+        for model in models
+    ]
+
+
+def invalidate_lookup_cache(model):
+    """Invalidate all cached lookup pages that depend on ``model``."""
+    get_lookup_cache().set(get_lookup_version_key(model), uuid.uuid4().hex, None)
+
+
+def _invalidate_lookup_cache(sender, **kwargs):
+    invalidate_lookup_cache(sender)
+    # Lookups rendered before the commit could be cached under the new version
+    transaction.on_commit(
+        lambda: invalidate_lookup_cache(sender), using=kwargs.get("using")
+    )
+
+
+def connect_lookup_cache_signals(models):
+    """Invalidate the lookup cache versions of models on post_save/post_delete."""
+    for model in models:
+        uid = f"unfold_modal_lookup_cache:{model._meta.label_lower}"
+        post_save.connect(_invalidate_lookup_cache, sender=model, dispatch_uid=uid)
+        post_delete.connect(_invalidate_lookup_cache, sender=model, dispatch_uid=uid)
+
+
+class PopupLookupCacheMixin:
+    """
+    Cache rendered raw ID lookup pages in Django's cache framework.
+
+    Popup changelist requests with ``_to_field`` (raw ID and lookup modals)
+    are rendered once per model, request mode (modal iframe or popup window),
+    query string, permission fingerprint, CSRF cookie and language, and served from the cache until the timeout expires
+    or an instance of the model (or of ``popup_lookup_cache_models``) is
+    saved or deleted. Requests without a CSRF cookie or with pending
+    messages are not cached.
+
+    Changes that bypass signals (``QuerySet.update()``, raw SQL) are not
+    seen; call ``invalidate_lookup_cache(model)`` after them.
+
+    Example:
+        from unfold.admin import ModelAdmin
+        from unfold_modal.mixins import PopupLookupCacheMixin
+
+        @admin.register(Publisher)
+        class PublisherAdmin(PopupLookupCacheMixin, ModelAdmin):
+            popup_lookup_cache_timeout = 600
+    """
+
+    # Seconds a lookup page is cached (None uses UNFOLD_MODAL_LOOKUP_CACHE_TIMEOUT)
+    popup_lookup_cache_timeout = None
+
+    # Other models rendered in the lookup (e.g. in list_display) whose
+    # changes invalidate it as well
+    popup_lookup_cache_models = ()
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        connect_lookup_cache_signals(self.get_popup_lookup_cache_models())
+
+    def get_popup_lookup_cache_models(self):
+        return (self.model, *self.popup_lookup_cache_models)
+
+    def get_popup_lookup_cache_timeout(self, request):
+        if self.popup_lookup_cache_timeout is not None:
+            return self.popup_lookup_cache_timeout
+        return get_setting("UNFOLD_MODAL_LOOKUP_CACHE_TIMEOUT")
+
+    def get_popup_lookup_cache_key(self, request):
+        """Return the cache key of a lookup page request, or None to skip caching."""
+        if request.method != "GET":
+            return None
+        if IS_POPUP_VAR not in request.GET or TO_FIELD_VAR not in request.GET:
+            return None
+        # Cached pages embed a CSRF token bound to the current cookie
+        csrf_cookie = request.META.get("CSRF_COOKIE")
+        if not csrf_cookie:
+            return None
+        # Messages are rendered (and consumed) by the page
+        storage = getattr(request, "_messages", None)
+        if storage is not None and len(storage):
+            return None
+
+        parts = [
+            self.opts.label_lower,
+            request.path,
+            # Modal iframes and window.open popups are rendered differently
+            get_modal_request(request).mode,
+            urlencode(sorted(request.GET.lists()), doseq=True),
+            get_permission_fingerprint(request.user),
+            csrf_cookie,
+            getattr(request, "LANGUAGE_CODE", ""),
+            *get_lookup_cache_versions(self.get_popup_lookup_cache_models()),
+        ]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return f"unfold_modal:lookup:{digest}"
+
+    def changelist_view(self, request, extra_context=None):
+        cache_key = self.get_popup_lookup_cache_key(request)
+        if cache_key is None:
+            return super().changelist_view(request, extra_context)
+
+        cache = get_lookup_cache()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = super().changelist_view(request, extra_context)
+        if response.status_code == 200 and hasattr(response, "render"):
+            response.render()
+            cache.set(
+                cache_key,
+                (response.content, response["Content-Type"]),
+                self.get_popup_lookup_cache_timeout(request),
+            )
+        return response
+
+
+class AutocompleteCacheMixin:
+    """
+    Let CachedAutocompleteJsonView cache autocomplete results for this model.
+
+    Results are cached per source field, term, page, permission fingerprint
+    and language until the timeout expires or an instance of the model (or
+    of ``autocomplete_cache_models``) is saved or deleted. Changes that
+    bypass signals need ``invalidate_lookup_cache(model)``.
+
+    Example:
+        from unfold.admin import ModelAdmin
+        from unfold_modal.mixins import AutocompleteCacheMixin
+
+        @admin.register(Author)
+        class AuthorAdmin(AutocompleteCacheMixin, ModelAdmin):
+            search_fields = ["name"]
+            autocomplete_cache_timeout = 60
+    """
+
+    # Seconds results are cached (None uses UNFOLD_MODAL_AUTOCOMPLETE_CACHE_TIMEOUT)
+    autocomplete_cache_timeout = None
+
+    # Other models rendered in the results (e.g. in __str__) whose changes
+    # invalidate them as well
+    autocomplete_cache_models = ()
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        connect_lookup_cache_signals(self.get_autocomplete_cache_models())
+
+    def get_autocomplete_cache_models(self):
+        return (self.model, *self.autocomplete_cache_models)
+
+    def get_autocomplete_cache_timeout(self, request):
+        if self.autocomplete_cache_timeout is not None:
+            return self.autocomplete_cache_timeout
+        return get_setting("UNFOLD_MODAL_AUTOCOMPLETE_CACHE_TIMEOUT")
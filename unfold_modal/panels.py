@@ -0,0 +1,254 @@
+"""
+django-debug-toolbar panel grouping the requests of nested modal chains.
+
+Every modal iframe request shows up in the toolbar as an unrelated request.
+ModalChainPanel groups them by the popup name hierarchy (``id_venue__1`` →
+``id_city__2`` → ...) and shows per level SQL queries and time, template
+render time, response size and the popup_response submission that closes
+the level, so the slow level of a chain stands out.
+
+Requires ModalRequestMiddleware and the config-enabled setup (the frontend
+tags modal iframe URLs with their popup names):
+
+    DEBUG_TOOLBAR_PANELS = [
+        # ... default panels ...
+        "unfold_modal.panels.ModalChainPanel",
+    ]
+
+Chains are kept in process memory (the most recent MAX_CHAINS), so with
+several server processes a panel only sees the requests its process served.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.local import Local
+from debug_toolbar.panels import Panel
+from django.db import connections
+from django.template.loader import render_to_string
+from django.template.response import SimpleTemplateResponse
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from .utils import get_modal_request
+
+# Chains kept in memory (across all sessions)
+MAX_CHAINS = 50
+
+
+class ChainStore:
+    """Recent modal chains, keyed by (session key, root popup name)."""
+
+    def __init__(self, max_chains=MAX_CHAINS):
+        self.max_chains = max_chains
+        self.chains = OrderedDict()
+        self.roots = {}  # (session key, popup name) -> chain key
+        self.lock = threading.Lock()
+
+    def add(self, session_key, info, record):
+        """Add a request record to its chain and return the chain key."""
+        with self.lock:
+            root = self.roots.get((session_key, info.parent)) if info.parent else None
+            if root is None:
+                root = (session_key, info.name)
+                # Opening a top-level modal (again) starts a new chain
+                if record["method"] == "GET" and root in self.chains:
+                    self.discard(root)
+            if root not in self.chains:
+                self.chains[root] = []
+            self.chains.move_to_end(root)
+            self.chains[root].append(record)
+            self.roots[(session_key, info.name)] = root
+
+            while len(self.chains) > self.max_chains:
+                self.discard(next(iter(self.chains)))
+            return root
+
+    def discard(self, root):
+        self.chains.pop(root, None)
+        for key in [key for key, value in self.roots.items() if value == root]:
+            del self.roots[key]
+
+    def get_chains(self, session_key):
+        """Return the chains of a session, most recent first."""
+        with self.lock:
+            return [
+                (root, list(requests))
+                for root, requests in reversed(self.chains.items())
+                if root[0] == session_key
+            ]
+
+    def clear(self):
+        with self.lock:
+            self.chains.clear()
+            self.roots.clear()
+
+
+chain_store = ChainStore()
+
+_original_render = SimpleTemplateResponse.render
+
+
+def _timed_render(response):
+    panel = ModalChainPanel.current_instance()
+    if panel is None:
+        return _original_render(response)
+    start = time.perf_counter()
+    try:
+        return _original_render(response)
+    finally:
+        panel.render_ms += (time.perf_counter() - start) * 1000
+
+
+def summarize_levels(requests):
+    """Aggregate chain requests per modal level, in nesting order."""
+    levels = OrderedDict()
+    for record in sorted(requests, key=lambda record: record["depth"]):
+        level = levels.setdefault(
+            record["name"],
+            {
+                "name": record["name"],
+                "depth": record["depth"],
+                "model": record["model"],
+                "requests": [],
+                "queries": 0,
+                "sql_ms": 0.0,
+                "render_ms": 0.0,
+                "bytes": 0,
+                "total_ms": 0.0,
+                "popup_response": None,
+            },
+        )
+        level["requests"].append(record)
+        for field in ("queries", "sql_ms", "render_ms", "bytes", "total_ms"):
+            level[field] += record[field]
+        if record["popup_response"]:
+            level["popup_response"] = record
+
+    levels = list(levels.values())
+    if levels:
+        max(levels, key=lambda level: level["total_ms"])["slowest"] = True
+    return levels
+
+
+class ModalChainPanel(Panel):
+    """Requests of nested modal chains, grouped per level."""
+
+    title = _("Modal chains")
+    template = "unfold_modal/debug_toolbar/modal_chain.html"
+
+    _context_locals = Local()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.render_ms = 0.0
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.total_ms = 0.0
+
+    @classmethod
+    def current_instance(cls):
+        """Return the panel instance of the current request, if enabled."""
+        return getattr(cls._context_locals, "current_instance", None)
+
+    def enable_instrumentation(self):
+        if SimpleTemplateResponse.render is not _timed_render:
+            SimpleTemplateResponse.render = _timed_render
+        self._context_locals.current_instance = self
+
+    def disable_instrumentation(self):
+        self._context_locals.current_instance = None
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_ms += (time.perf_counter() - start) * 1000
+
+    def process_request(self, request):
+        start = time.perf_counter()
+        wrapped = connections.all()
+        for connection in wrapped:
+            connection.execute_wrappers.append(self.execute_wrapper)
+        try:
+            response = super().process_request(request)
+        finally:
+            for connection in wrapped:
+                connection.execute_wrappers.remove(self.execute_wrapper)
+        self.total_ms = (time.perf_counter() - start) * 1000
+        return response
+
+    @property
+    def nav_subtitle(self):
+        stats = self.get_stats()
+        if stats.get("name"):
+            return _("Level %(depth)s of %(root)s") % {
+                "depth": stats["depth"],
+                "root": stats["root"],
+            }
+        count = len(chain_store.get_chains(stats.get("session_key", "")))
+        return ngettext("%(count)d chain", "%(count)d chains", count) % {
+            "count": count
+        }
+
+    @property
+    def content(self):
+        stats = self.get_stats()
+        chains = [
+            {
+                "root": root[1],
+                "current": root[1] == stats.get("root"),
+                "levels": summarize_levels(requests),
+            }
+            for root, requests in chain_store.get_chains(stats.get("session_key", ""))
+        ]
+        return render_to_string(self.template, {**stats, "chains": chains})
+
+    def generate_stats(self, request, response):
+        session = getattr(request, "session", None)
+        session_key = getattr(session, "session_key", None) or ""
+        info = get_modal_request(request)
+        stats = {"session_key": session_key, "name": "", "depth": 0, "root": ""}
+
+        if info.is_modal and info.name:
+            record = {
+                "request_id": self.toolbar.request_id,
+                "name": info.name,
+                "depth": info.depth,
+                "model": self.get_model_name(request),
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status_code": response.status_code,
+                "queries": self.queries,
+                "sql_ms": round(self.sql_ms, 2),
+                "render_ms": round(self.render_ms, 2),
+                "bytes": 0 if response.streaming else len(response.content),
+                "total_ms": round(self.total_ms, 2),
+                "popup_response": self.get_popup_response(response),
+            }
+            root = chain_store.add(session_key, info, record)
+            stats.update(name=info.name, depth=info.depth, root=root[1])
+
+        self.record_stats(stats)
+
+    def get_model_name(self, request):
+        """Return the verbose name of the admin view's model, if any."""
+        match = getattr(request, "resolver_match", None)
+        model_admin = getattr(getattr(match, "func", None), "model_admin", None)
+        if model_admin is None:
+            return ""
+        return str(model_admin.model._meta.verbose_name)
+
+    def get_popup_response(self, response):
+        """Return the popup_response action ("add", "change", "delete")."""
+        context = getattr(response, "context_data", None) or {}
+        if "popup_response_data" not in context:
+            return ""
+        try:
+            return json.loads(context["popup_response_data"]).get("action", "add")
+        except (TypeError, ValueError):
+            return "add"
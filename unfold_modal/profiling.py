@@ -0,0 +1,170 @@
+"""
+Sampling profiler for slow modal requests.
+
+ModalProfilerMiddleware samples the stack of the thread handling a modal
+iframe request every SAMPLE_INTERVAL seconds. Requests profiled only for
+being slow start sampling once they exceed the threshold, so fast requests
+cost one idle timer thread. Profiles of sampled or slow requests are kept
+in a bounded on-disk ring buffer (ProfileStore) and listed on a superuser
+page (``unfold_modal:profiles``), where they can be downloaded as collapsed
+stacks for flame graph tools (speedscope, flamegraph.pl).
+"""
+
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.utils.crypto import salted_hmac
+
+from .apps import get_setting
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Frames kept per sample, innermost first (deep template rendering stacks)
+MAX_STACK_DEPTH = 200
+
+PROFILE_NAME_RE = re.compile(r"^\d+-[0-9a-f]{8}$")
+
+
+def format_frame(frame):
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__', '?')}:{name}"
+
+
+def collapse_stack(frame):
+    """Return a frame's stack in collapsed format (outermost first, ``;``-joined)."""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(format_frame(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of one thread from a background thread.
+
+    With a ``delay`` (seconds), sampling starts only if the profiler is still
+    running by then; stopping it earlier collects no samples.
+    """
+
+    def __init__(self, thread_id=None, interval=SAMPLE_INTERVAL, delay=0.0):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.delay = delay
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="unfold-modal-profiler", daemon=True
+        )
+
+    def _run(self):
+        if self.delay and self._stop.wait(self.delay):
+            return
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def to_collapsed(samples):
+    """Return samples as collapsed stack lines (``frame;frame count``)."""
+    return "".join(
+        f"{stack} {count}\n" for stack, count in sorted(samples.items()) if stack
+    )
+
+
+class ProfileStore:
+    """Profiles as JSON files in a directory, keeping the newest ``max_files``."""
+
+    def __init__(self, directory, max_files):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def get_path(self, name):
+        """Return the file of a profile name, or None for invalid names."""
+        if not PROFILE_NAME_RE.match(name):
+            return None
+        return self.directory / f"{name}.json"
+
+    def save(self, profile):
+        """Write a profile dict, evict the oldest files, return the profile name."""
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        name = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        path = self.get_path(name)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(profile), encoding="utf-8")
+        tmp_path.replace(path)
+
+        for old_path in self.get_paths()[self.max_files :]:
+            old_path.unlink(missing_ok=True)
+        return name
+
+    def get_paths(self):
+        """Return profile files, newest first."""
+        if not self.directory.is_dir():
+            return []
+        paths = [
+            path
+            for path in self.directory.glob("*.json")
+            if PROFILE_NAME_RE.match(path.stem)
+        ]
+        return sorted(
+            paths, key=lambda path: int(path.stem.split("-")[0]), reverse=True
+        )
+
+    def load(self, name):
+        """Return a stored profile dict (with its ``name``), or None."""
+        path = self.get_path(name)
+        try:
+            profile = json.loads(path.read_text(encoding="utf-8"))
+        except (AttributeError, OSError, ValueError):
+            return None
+        return {**profile, "name": name}
+
+    def list(self):
+        """Return stored profiles without their samples, newest first."""
+        profiles = []
+        for path in self.get_paths():
+            profile = self.load(path.stem)
+            if profile is not None:
+                profile.pop("samples", None)
+                profiles.append(profile)
+        return profiles
+
+
+def get_default_profile_dir():
+    """
+    Return the default profile directory: a temp dir subdirectory derived
+    from the project's SECRET_KEY, so projects on one host don't share it.
+    """
+    key = salted_hmac("unfold_modal.profiling", "profile_dir").hexdigest()
+    return Path(tempfile.gettempdir()) / f"unfold_modal_profiles_{key[:16]}"
+
+
+def get_profile_store():
+    """Return the ProfileStore configured by the UNFOLD_MODAL_PROFILE_* settings."""
+    directory = get_setting("UNFOLD_MODAL_PROFILE_DIR") or get_default_profile_dir()
+    return ProfileStore(directory, get_setting("UNFOLD_MODAL_PROFILE_MAX_FILES"))
@@ -0,0 +1,77 @@
+/**
+ * Django Unfold Modal - On-demand Loader
+ *
+ * Loads modal.css and the modal scripts (passed as ?css=&js= in this
+ * script's URL) on the first related-widget interaction or when the
+ * browser is idle, and replays the interaction once they are ready.
+ * Modal iframes load them immediately.
+ */
+'use strict';
+
+(function() {
+    const script = document.currentScript;
+    if (!script) return;
+
+    const params = new URL(script.src).searchParams;
+    const EVENTS = 'django:show-related.unfoldModalLoader django:lookup-related.unfoldModalLoader';
+    let loading = null;
+
+    function loadAsset(tag, attrs) {
+        return new Promise(function(resolve) {
+            const el = Object.assign(document.createElement(tag), attrs);
+            el.onload = el.onerror = resolve;
+            document.head.appendChild(el);
+        });
+    }
+
+    function load() {
+        if (!loading) {
+            loading = Promise.all(
+                params.getAll('css').map(function(href) {
+                    return loadAsset('link', { rel: 'stylesheet', href: href });
+                }).concat(params.getAll('js').map(function(src) {
+                    // async = false keeps execution in the given order
+                    return loadAsset('script', { src: src, async: false });
+                }))
+            );
+        }
+        return loading;
+    }
+
+    function intercept(event) {
+        event.preventDefault();
+        const link = event.currentTarget;
+        load().then(function() {
+            // related_modal.js now handles the replayed click
+            django.jQuery('body').off(EVENTS);
+            link.click();
+        });
+    }
+
+    function init() {
+        if (window.parent !== window) {
+            load();
+            return;
+        }
+        if (typeof django === 'undefined' || !django.jQuery) {
+            setTimeout(init, 50);
+            return;
+        }
+        django.jQuery('body')
+            .on('django:show-related.unfoldModalLoader', '.related-widget-wrapper-link[data-popup="yes"]', intercept)
+            .on('django:lookup-related.unfoldModalLoader', '.related-lookup', intercept);
+
+        const idle = window.requestIdleCallback || function(fn) { setTimeout(fn, 2000); };
+        idle(function() {
+            load().then(function() {
+                django.jQuery('body').off(EVENTS);
+            });
+        }, { timeout: 5000 });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
@@ -22,12 +22,24 @@ window.UnfoldModal = window.UnfoldModal || {};
     };
     const resizeEnabled = config.resize || false;
     const disableHeader = config.disableHeader !== false; // Default true
+    const iframeCacheSize = parseInt(config.iframeCacheSize, 10) || 0; // Default off
+    const iframeCacheTtl = (config.iframeCacheTtl || 60) * 1000;
+    const autocompleteCacheTtl = (parseInt(config.autocompleteClientCacheSeconds, 10) || 0) * 1000; // Default off
+    const tagRequests = config.tagRequests || false; // Requires ModalRequestMiddleware
+    const traceRequests = config.traceRequests || false; // Requires ModalTraceMiddleware
+    const debugEnabled = config.debug ||
+        new URLSearchParams(window.location.search).get('unfold_modal_debug') === '1';
 
     // Expose config
     Modal.config = config;
     Modal.dimensions = dimensions;
     Modal.resizeEnabled = resizeEnabled;
     Modal.disableHeader = disableHeader;
+    Modal.iframeCacheSize = iframeCacheSize;
+    Modal.autocompleteCacheTtl = autocompleteCacheTtl;
+    Modal.tagRequests = tagRequests;
+    Modal.traceRequests = traceRequests;
+    Modal.debugEnabled = debugEnabled;
 
     // ---------------------------------------------------------------
     // Message Type Constants
@@ -37,6 +49,8 @@ window.UnfoldModal = window.UnfoldModal || {};
         MODAL_OPEN: 'django:modal:open',
         MODAL_CLOSE: 'django:modal:close',
         MODAL_DISMISS: 'django:modal:dismiss',
+        MODAL_READY: 'django:modal:ready',
+        MODAL_DISMISSED: 'django:modal:dismissed',
         POPUP_ADD: 'django:popup:add',
         POPUP_CHANGE: 'django:popup:change',
         POPUP_DELETE: 'django:popup:delete',
@@ -72,6 +86,20 @@ window.UnfoldModal = window.UnfoldModal || {};
 
     Modal.SELECTORS = SELECTORS;
 
+    // ---------------------------------------------------------------
+    // Modal Classes
+    // ---------------------------------------------------------------
+
+    // Hides stacked/cached overlays while preserving their rendering state
+    // (visibility + content-visibility instead of display: none)
+    const HIDDEN_CLASS = 'unfold-modal-hidden';
+
+    // Set on the container until the iframe document is ready (shows skeleton)
+    const LOADING_CLASS = 'unfold-modal-loading';
+
+    Modal.HIDDEN_CLASS = HIDDEN_CLASS;
+    Modal.LOADING_CLASS = LOADING_CLASS;
+
     // ---------------------------------------------------------------
     // State
     // ---------------------------------------------------------------
@@ -211,6 +239,101 @@ window.UnfoldModal = window.UnfoldModal || {};
         return url;
     }
 
+    /**
+     * Tag a popup URL with the modal's popup name and its parent's, so the
+     * server can classify the request (see ModalRequestMiddleware).
+     * Returns the tagged URL as a string.
+     */
+    function tagModalUrl(href, name, parentName) {
+        const url = ensurePopupParam(new URL(href, window.location.href).href);
+        url.searchParams.set('_modal', name || '1');
+        if (parentName) {
+            url.searchParams.set('_modal_parent', parentName);
+        }
+        return url.toString();
+    }
+
+    /**
+     * Return a random lowercase hex string of the given byte length.
+     */
+    function randomHex(bytes) {
+        const values = crypto.getRandomValues(new Uint8Array(bytes));
+        return Array.from(values, function(value) {
+            return value.toString(16).padStart(2, '0');
+        }).join('');
+    }
+
+    /**
+     * Create a W3C traceparent for a span of the browser, continuing traceId
+     * (32 hex characters) or starting a new trace.
+     */
+    function createTraceparent(traceId) {
+        return '00-' + (traceId || randomHex(16)) + '-' + randomHex(8) + '-01';
+    }
+
+    /**
+     * Return the traceparent a document's server span exposed through
+     * Server-Timing (see ModalTraceMiddleware), or null.
+     */
+    function getDocumentTraceparent(win) {
+        try {
+            const navigation = win.performance.getEntriesByType('navigation')[0];
+            const timing = navigation && (navigation.serverTiming || []).find(function(entry) {
+                return entry.name === 'traceparent';
+            });
+            return timing ? timing.description : null;
+        } catch (e) {
+            // Cross-origin or detached
+            return null;
+        }
+    }
+
+    // Cookie carrying the traceparent of a loading modal document (read by
+    // ModalTraceMiddleware for _popup requests); cleared once it is ready
+    const TRACE_COOKIE = 'unfold_modal_traceparent';
+    const TRACE_COOKIE_MAX_AGE = 10;
+
+    /**
+     * Send traceparent with the next popup document requests, without
+     * changing the document URL (so cached documents can be revalidated).
+     */
+    function setTraceCookie(traceparent) {
+        document.cookie = TRACE_COOKIE + '=' + traceparent +
+            '; path=/; max-age=' + TRACE_COOKIE_MAX_AGE + '; samesite=strict';
+    }
+
+    /**
+     * Stop sending a traceparent set by setTraceCookie().
+     */
+    function clearTraceCookie() {
+        document.cookie = TRACE_COOKIE + '=; path=/; max-age=0; samesite=strict';
+    }
+
+    /**
+     * Add a traceparent to a form action URL (removed again by
+     * ModalTraceMiddleware). Returns the URL as a string.
+     */
+    function addTraceparent(href, traceparent) {
+        const url = new URL(href, window.location.href);
+        url.searchParams.set('_traceparent', traceparent);
+        return url.toString();
+    }
+
+    /**
+     * Extract the app label and model name from an admin object URL path
+     * ('.../<app_label>/<model>/add/' or '.../<app_label>/<model>/<id>/change|delete/').
+     * Returns { appLabel, model } or null.
+     */
+    function getAdminModelFromPath(pathname) {
+        const parts = pathname.split('/').filter(Boolean);
+        const action = parts[parts.length - 1];
+        let index = -1;
+        if (action === 'add') index = parts.length - 2;
+        if (action === 'change' || action === 'delete') index = parts.length - 3;
+        if (index < 1) return null;
+        return { appLabel: parts[index - 1], model: parts[index] };
+    }
+
     /**
      * Get popup name from link ID by stripping prefix and adding popup index.
      * @param {string} linkId - The link element's ID
@@ -229,9 +352,192 @@ window.UnfoldModal = window.UnfoldModal || {};
         setPopupIndex: setPopupIndex,
         addPopupIndex: addPopupIndex,
         ensurePopupParam: ensurePopupParam,
+        tagModalUrl: tagModalUrl,
+        createTraceparent: createTraceparent,
+        getDocumentTraceparent: getDocumentTraceparent,
+        addTraceparent: addTraceparent,
+        setTraceCookie: setTraceCookie,
+        clearTraceCookie: clearTraceCookie,
+        getAdminModelFromPath: getAdminModelFromPath,
         getPopupName: getPopupName
     };
 
+    // ---------------------------------------------------------------
+    // Iframe Cache (recently closed modals, LRU with TTL)
+    // ---------------------------------------------------------------
+
+    // Documents larger than this are discarded on close instead of parked
+    const IFRAME_CACHE_MAX_NODES = 5000;
+
+    // Insertion-ordered: first key is the least recently parked entry
+    const iframeCache = new Map();
+
+    /**
+     * Normalize a popup URL into a cache key (_popup set, modal and trace tags removed,
+     * sorted query, no hash).
+     */
+    function getCacheKey(href) {
+        const url = ensurePopupParam(new URL(href, window.location.href).href);
+        url.hash = '';
+        url.searchParams.delete('_modal');
+        url.searchParams.delete('_modal_parent');
+        url.searchParams.delete('_traceparent');
+        url.searchParams.sort();
+        return url.toString();
+    }
+
+    /**
+     * Drop a cached modal and remove its overlay (and iframe) from the DOM.
+     */
+    function evictCachedModal(key) {
+        const entry = iframeCache.get(key);
+        if (!entry) return;
+
+        iframeCache.delete(key);
+        clearTimeout(entry.timer);
+        disposeModal(entry.modal);
+    }
+
+    /**
+     * Keep a closed modal in the DOM (hidden) so a repeat open can reuse it.
+     * Only pristine documents qualify: loaded exactly once, still showing the
+     * URL the modal was opened with, and below the node cap.
+     * Returns true if the modal was parked, false if the caller should remove it.
+     */
+    function parkModal(modal) {
+        if (!iframeCacheSize || !modal.cacheKey || modal.loadCount !== 1) {
+            return false;
+        }
+
+        try {
+            const iframeDoc = modal.iframe.contentDocument;
+            if (iframeDoc.readyState !== 'complete') return false;
+            if (getCacheKey(modal.iframe.contentWindow.location.href) !== modal.cacheKey) return false;
+            if (iframeDoc.getElementsByTagName('*').length > IFRAME_CACHE_MAX_NODES) return false;
+        } catch (e) {
+            // Cross-origin or detached – cannot be reused
+            return false;
+        }
+
+        const key = modal.cacheKey;
+        evictCachedModal(key);
+
+        modal.overlay.classList.add(HIDDEN_CLASS);
+        iframeCache.set(key, {
+            modal: modal,
+            stale: false,
+            timer: setTimeout(function() { evictCachedModal(key); }, iframeCacheTtl)
+        });
+
+        // Enforce the size cap by evicting the oldest entries
+        while (iframeCache.size > iframeCacheSize) {
+            evictCachedModal(iframeCache.keys().next().value);
+        }
+
+        return true;
+    }
+
+    /**
+     * Remove and return the cache entry for a key, or null.
+     * The caller takes ownership of entry.modal.
+     */
+    function takeCachedModal(key) {
+        const entry = iframeCache.get(key);
+        if (!entry) return null;
+
+        iframeCache.delete(key);
+        clearTimeout(entry.timer);
+        return entry;
+    }
+
+    /**
+     * Flag all cached modals as stale (related data changed since they loaded).
+     */
+    function markCacheStale() {
+        iframeCache.forEach(function(entry) {
+            entry.stale = true;
+        });
+    }
+
+    /**
+     * Dispose of all cached modals.
+     */
+    function clearCache() {
+        Array.from(iframeCache.keys()).forEach(evictCachedModal);
+    }
+
+    // Expose cache operations
+    Modal.cache = {
+        getKey: getCacheKey,
+        park: parkModal,
+        take: takeCachedModal,
+        markStale: markCacheStale,
+        clear: clearCache,
+        get size() { return iframeCache.size; }
+    };
+
+    // ---------------------------------------------------------------
+    // Autocomplete Cache (Select2 results, LRU with TTL)
+    // ---------------------------------------------------------------
+
+    const AUTOCOMPLETE_CACHE_MAX_ENTRIES = 200;
+
+    // Insertion-ordered: first key is the least recently stored entry.
+    // Values are JSON strings, so no objects are shared between frames.
+    const autocompleteCache = new Map();
+
+    /**
+     * Return the cached response (JSON string) for a request key, or null.
+     */
+    function getAutocompleteResults(key) {
+        const entry = autocompleteCache.get(key);
+        if (!entry) return null;
+
+        if (entry.expires <= Date.now()) {
+            autocompleteCache.delete(key);
+            return null;
+        }
+        return entry.json;
+    }
+
+    /**
+     * Store a response (JSON string) and evict the oldest entries.
+     */
+    function setAutocompleteResults(key, json) {
+        if (!autocompleteCacheTtl) return;
+
+        autocompleteCache.delete(key);
+        autocompleteCache.set(key, { json: json, expires: Date.now() + autocompleteCacheTtl });
+
+        while (autocompleteCache.size > AUTOCOMPLETE_CACHE_MAX_ENTRIES) {
+            autocompleteCache.delete(autocompleteCache.keys().next().value);
+        }
+    }
+
+    /**
+     * Return the cache owned by the top-level page, shared with all modal
+     * iframes (falls back to this document's cache).
+     */
+    function getSharedAutocompleteCache() {
+        try {
+            if (window.top.UnfoldModal && window.top.UnfoldModal.autocompleteCache) {
+                return window.top.UnfoldModal.autocompleteCache;
+            }
+        } catch (e) {
+            // Cross-origin top – use this document's cache
+        }
+        return Modal.autocompleteCache;
+    }
+
+    // Expose autocomplete cache operations
+    Modal.autocompleteCache = {
+        get: getAutocompleteResults,
+        set: setAutocompleteResults,
+        clear: function() { autocompleteCache.clear(); },
+        getShared: getSharedAutocompleteCache,
+        get size() { return autocompleteCache.size; }
+    };
+
     // ---------------------------------------------------------------
     // DOM Creation
     // ---------------------------------------------------------------
@@ -255,6 +561,7 @@ window.UnfoldModal = window.UnfoldModal || {};
         container.className = resizeEnabled
             ? 'unfold-modal-container unfold-modal-resizable'
             : 'unfold-modal-container';
+        container.classList.add(LOADING_CLASS);
 
         const hasResizeObserver = typeof ResizeObserver !== 'undefined';
 
@@ -300,9 +607,10 @@ window.UnfoldModal = window.UnfoldModal || {};
     }
 
     /**
-     * Create modal header with maximize button (left), title (center), close button (right)
+     * Create modal header with maximize button (left), title (center), close button (right).
+     * Listeners are removed when the optional AbortSignal is aborted.
      */
-    function createModalHeader(closeCallback) {
+    function createModalHeader(closeCallback, signal) {
         const header = document.createElement('div');
         header.className = 'unfold-modal-header';
         // All styles defined in modal.css
@@ -335,7 +643,7 @@ window.UnfoldModal = window.UnfoldModal || {};
         closeButton.className = 'unfold-modal-close';
         closeButton.title = 'Close';
         closeButton.innerHTML = ICONS.close;
-        closeButton.addEventListener('click', closeCallback);
+        closeButton.addEventListener('click', closeCallback, { signal: signal });
 
         rightButtonGroup.appendChild(closeButton);
 
@@ -346,6 +654,22 @@ window.UnfoldModal = window.UnfoldModal || {};
         return { header, title, maximizeButton };
     }
 
+    /**
+     * Create loading skeleton shown over the iframe until it is ready
+     */
+    function createSkeleton() {
+        const skeleton = document.createElement('div');
+        skeleton.className = 'unfold-modal-skeleton';
+        skeleton.setAttribute('aria-hidden', 'true');
+        // Placeholder lines, styled in modal.css
+        for (let i = 0; i < 4; i++) {
+            const line = document.createElement('div');
+            line.className = 'unfold-modal-skeleton-line';
+            skeleton.appendChild(line);
+        }
+        return skeleton;
+    }
+
     /**
      * Create iframe element
      */
@@ -358,12 +682,255 @@ window.UnfoldModal = window.UnfoldModal || {};
         return iframe;
     }
 
+    /**
+     * Deterministically release a modal.
+     * Removes its listeners (modal.listeners AbortController) and resize
+     * tracking, navigates the iframe to about:blank so any in-flight request,
+     * timers and scripts of the popup document are released immediately,
+     * then removes the overlay and drops all element references so nothing
+     * keeps the detached DOM reachable. Safe to call more than once.
+     */
+    function disposeModal(modal) {
+        const { overlay, iframe, listeners, resizeCleanup } = modal;
+
+        if (listeners) {
+            listeners.abort();
+        }
+        if (resizeCleanup) {
+            resizeCleanup();
+        }
+        if (iframe) {
+            try {
+                iframe.src = 'about:blank';
+            } catch (e) {
+                // Detached – nothing to unload
+            }
+        }
+        if (overlay && overlay.parentNode) {
+            overlay.parentNode.removeChild(overlay);
+        }
+
+        modal.overlay = null;
+        modal.container = null;
+        modal.iframe = null;
+        modal.title = null;
+        modal.maximizeButton = null;
+        modal.listeners = null;
+        modal.resizeCleanup = null;
+        modal.preMaximizeDimensions = null;
+    }
+
     // Expose DOM creation functions
     Modal.dom = {
         createOverlay: createModalOverlay,
         createContainer: createModalContainer,
         createHeader: createModalHeader,
-        createIframe: createIframe
+        createSkeleton: createSkeleton,
+        createIframe: createIframe,
+        dispose: disposeModal
+    };
+
+    // ---------------------------------------------------------------
+    // Debug HUD (UNFOLD_MODAL_DEBUG or ?unfold_modal_debug=1)
+    // ---------------------------------------------------------------
+
+    const HUD_REFRESH_MS = 1000;
+    const HUD_MEMORY_REFRESH_MS = 10000;
+
+    // Listener registrations per AbortSignal (counted while the HUD is enabled)
+    const signalListeners = new WeakMap();
+
+    let hud = null;
+    let hudTimer = null;
+    let memory = null;
+    let memoryPending = false;
+    let memoryMeasuredAt = 0;
+
+    /**
+     * Count listeners registered with an AbortSignal, so the HUD can show
+     * the listeners bound to each modal's modal.listeners controller.
+     */
+    function countSignalListeners() {
+        const addEventListener = EventTarget.prototype.addEventListener;
+        EventTarget.prototype.addEventListener = function(type, listener, options) {
+            const signal = options && options.signal;
+            if (signal && !signal.aborted) {
+                signalListeners.set(signal, (signalListeners.get(signal) || 0) + 1);
+            }
+            return addEventListener.apply(this, arguments);
+        };
+    }
+
+    /**
+     * Measure memory per frame with performance.measureUserAgentSpecificMemory()
+     * (cross-origin isolated pages only). Throttled, since a measurement waits
+     * for the next garbage collection.
+     */
+    function measureMemory() {
+        if (memoryPending || !window.crossOriginIsolated ||
+            typeof performance.measureUserAgentSpecificMemory !== 'function') {
+            return;
+        }
+        if (memory && performance.now() - memoryMeasuredAt < HUD_MEMORY_REFRESH_MS) return;
+
+        memoryPending = true;
+        performance.measureUserAgentSpecificMemory().then(function(result) {
+            memory = result;
+            memoryMeasuredAt = performance.now();
+        }).catch(function() {
+            // Measurement not permitted – keep the previous value
+        }).finally(function() {
+            memoryPending = false;
+        });
+    }
+
+    /**
+     * Return the measured bytes attributed to a modal iframe, or null.
+     */
+    function getIframeMemory(iframe, href) {
+        if (!memory) return null;
+        let bytes = 0;
+        memory.breakdown.forEach(function(entry) {
+            const matches = entry.attribution.some(function(attribution) {
+                return attribution.url === href ||
+                    (attribution.container && attribution.container.src === iframe.getAttribute('src'));
+            });
+            if (matches) bytes += entry.bytes;
+        });
+        return bytes;
+    }
+
+    function formatBytes(bytes) {
+        if (bytes === null || bytes === undefined) return '–';
+        if (bytes < 1024 * 1024) return (bytes / 1024).toFixed(0) + ' KB';
+        return (bytes / 1024 / 1024).toFixed(1) + ' MB';
+    }
+
+    /**
+     * Collect the HUD row of a modal stack level.
+     */
+    function getModalStats(modal, index) {
+        const row = {
+            level: index + 1,
+            name: modal.iframeName,
+            url: '',
+            ready: '…',
+            nodes: '–',
+            memory: '–',
+            listeners: modal.listeners ? (signalListeners.get(modal.listeners.signal) || 0) : 0,
+            pending: modal.pendingDismisses || 0
+        };
+
+        if (modal.readyAt) {
+            row.ready = Math.round(modal.readyAt - modal.openedAt) + ' ms';
+        }
+
+        let href = modal.requestUrl;
+        try {
+            href = modal.iframe.contentWindow.location.href;
+            row.nodes = modal.iframe.contentDocument.getElementsByTagName('*').length;
+        } catch (e) {
+            // Cross-origin or detached
+        }
+        const url = new URL(href, window.location.href);
+        row.url = url.pathname + url.search;
+        row.memory = formatBytes(getIframeMemory(modal.iframe, href));
+
+        return row;
+    }
+
+    /**
+     * Render the HUD for the current modal stack.
+     */
+    function renderHud() {
+        if (!hud) return;
+        measureMemory();
+
+        const columns = ['level', 'name', 'url', 'ready', 'nodes', 'memory', 'listeners', 'pending'];
+        const table = document.createElement('table');
+        const headRow = table.createTHead().insertRow();
+        columns.forEach(function(column) {
+            const cell = document.createElement('th');
+            cell.textContent = column;
+            headRow.appendChild(cell);
+        });
+
+        const body = table.createTBody();
+        modalStack.forEach(function(modal, index) {
+            const stats = getModalStats(modal, index);
+            const row = body.insertRow();
+            columns.forEach(function(column) {
+                row.insertCell().textContent = stats[column];
+            });
+        });
+
+        let summary = 'Modals: ' + modalStack.length + ', cached: ' + iframeCache.size;
+        if (memory) {
+            summary += ', memory: ' + formatBytes(memory.bytes);
+        } else if (performance.memory) {
+            summary += ', JS heap: ' + formatBytes(performance.memory.usedJSHeapSize);
+        }
+
+        hud.summary.textContent = summary;
+        hud.content.replaceChildren(table);
+    }
+
+    /**
+     * Show the debug HUD and refresh it periodically.
+     */
+    function showHud() {
+        if (hud || isInIframe) return;
+
+        const element = document.createElement('div');
+        element.className = 'unfold-modal-hud';
+
+        const closeButton = document.createElement('button');
+        closeButton.type = 'button';
+        closeButton.className = 'unfold-modal-hud-close';
+        closeButton.title = 'Close';
+        closeButton.textContent = '×';
+        closeButton.addEventListener('click', hideHud);
+
+        const summary = document.createElement('div');
+        summary.className = 'unfold-modal-hud-summary';
+        const content = document.createElement('div');
+
+        element.appendChild(closeButton);
+        element.appendChild(summary);
+        element.appendChild(content);
+        document.body.appendChild(element);
+
+        hud = { element: element, summary: summary, content: content };
+        renderHud();
+        hudTimer = setInterval(renderHud, HUD_REFRESH_MS);
+    }
+
+    /**
+     * Remove the debug HUD.
+     */
+    function hideHud() {
+        if (!hud) return;
+        clearInterval(hudTimer);
+        hud.element.remove();
+        hud = null;
+        hudTimer = null;
+    }
+
+    if (debugEnabled && !isInIframe) {
+        countSignalListeners();
+        if (document.readyState === 'loading') {
+            document.addEventListener('DOMContentLoaded', showHud);
+        } else {
+            showHud();
+        }
+    }
+
+    // Expose HUD controls
+    Modal.hud = {
+        show: showHud,
+        hide: hideHud,
+        render: renderHud,
+        get visible() { return hud !== null; }
     };
 
 })(window.UnfoldModal);
@@ -5,12 +5,207 @@
         return;
     }
 
-    // Get message type from core module if available, fallback for safety
-    var MSG_POPUP_LOOKUP = (window.UnfoldModal && window.UnfoldModal.MSG)
-        ? window.UnfoldModal.MSG.POPUP_LOOKUP
-        : 'django:popup:lookup';
+    // Get message types from core module if available, fallback for safety
+    var MSG = (window.UnfoldModal && window.UnfoldModal.MSG) || {};
+    var MSG_POPUP_LOOKUP = MSG.POPUP_LOOKUP || 'django:popup:lookup';
+    var MSG_POPUP_ADD = MSG.POPUP_ADD || 'django:popup:add';
+    var MSG_MODAL_READY = MSG.MODAL_READY || 'django:modal:ready';
+    var config = (window.UnfoldModal && window.UnfoldModal.config) || {};
+
+    /**
+     * Translate a string with Django's JavaScript catalog when it is loaded.
+     */
+    function translate(text) {
+        return typeof window.gettext === 'function' ? window.gettext(text) : text;
+    }
+
+    /**
+     * Return the traceparent of the modal showing this document, or null
+     * (tracing disabled, or not shown by an unfold-modal page).
+     */
+    function getModalTraceparent() {
+        try {
+            var stack = window.parent.UnfoldModal.state.modalStack;
+            for (var i = 0; i < stack.length; i++) {
+                if (stack[i].iframe && stack[i].iframe.contentWindow === window) {
+                    return stack[i].traceparent || null;
+                }
+            }
+        } catch (e) {
+            // Cross-origin parent or no modal page
+        }
+        return null;
+    }
+
+    /**
+     * Return the action URL of a form, with the modal's traceparent when
+     * tracing is enabled (POSTs are not cached, so the URL may vary).
+     */
+    function getFormAction(form) {
+        // Attributes: form.action/form.method may be shadowed by named fields
+        var url = new URL(form.getAttribute('action') || window.location.href, window.location.href);
+        var traceparent = getModalTraceparent();
+        if (traceparent) {
+            url.searchParams.set('_traceparent', traceparent);
+        }
+        return url.toString();
+    }
+
+    /**
+     * Clear validation errors left from a previous submission.
+     */
+    function clearErrors(form) {
+        Array.prototype.forEach.call(
+            document.querySelectorAll('.errornote, .errorlist'),
+            function(el) { el.remove(); }
+        );
+        Array.prototype.forEach.call(form.querySelectorAll('.errors'), function(el) {
+            el.classList.remove('errors');
+        });
+    }
+
+    /**
+     * Reset the add form for the next entry (including Select2 widgets).
+     */
+    function resetForm(form) {
+        form.reset();
+        clearErrors(form);
+        if (window.django && window.django.jQuery) {
+            window.django.jQuery(form).find('select').trigger('change');
+        }
+        window.scrollTo(0, 0);
+
+        var first = form.querySelector(
+            'input:not([type=hidden]):not([disabled]), select:not([disabled]), textarea:not([disabled])'
+        );
+        if (first) {
+            first.focus();
+        }
+    }
+
+    /**
+     * Show a bulk add message (aria-live status above the form).
+     */
+    function showStatus(form, text, isError) {
+        var status = document.getElementById('unfold-modal-bulk-status');
+        if (!status) {
+            status = document.createElement('p');
+            status.id = 'unfold-modal-bulk-status';
+            status.className = 'unfold-modal-bulk-status';
+            status.setAttribute('role', 'status');
+            status.setAttribute('aria-live', 'polite');
+            form.parentNode.insertBefore(status, form);
+        }
+        status.classList.toggle('unfold-modal-bulk-status-error', !!isError);
+        status.textContent = text;
+    }
+
+    /**
+     * Announce the last saved object.
+     */
+    function showSavedStatus(form, repr, count) {
+        showStatus(form, '\u201c' + repr + '\u201d ' + translate('added') + ' (' + count + ')');
+    }
+
+    /**
+     * Handle the response of a background bulk add submission.
+     * A popup response means the object was saved: the result goes to the
+     * parent and the form is reset. A re-rendered form (validation errors)
+     * saved nothing, so the form is submitted again as a regular page load,
+     * which shows the errors with all widgets initialized.
+     */
+    function applyBulkResponse(form, response, html, savedCount) {
+        var doc = new DOMParser().parseFromString(html, 'text/html');
+        var data = doc.body && doc.body.dataset.popupResponse;
+
+        if (!data) {
+            if (response.ok && form.id && doc.getElementById(form.id)) {
+                form.setAttribute('action', getFormAction(form));
+                form.submit();
+                return false;
+            }
+            throw new Error('Unexpected bulk add response (' + response.status + ')');
+        }
+
+        var result = JSON.parse(data);
+        window.parent.postMessage({
+            type: MSG_POPUP_ADD,
+            newId: result.value,
+            newRepr: result.obj,
+            keepOpen: true
+        }, window.location.origin);
+
+        resetForm(form);
+        showSavedStatus(form, result.obj, savedCount + 1);
+        return true;
+    }
+
+    /**
+     * Bulk add mode: "Save and add another" saves in the background, sends
+     * the add result to the parent (the modal stays open) and resets the
+     * form, so entering N objects costs one page load instead of N.
+     * Validation errors are shown by a regular submission (see
+     * applyBulkResponse); a request that never reached the server falls back
+     * to one as well. Other failures are reported in the status element and
+     * never resubmitted, since the object may already be saved.
+     */
+    function setupBulkAdd() {
+        if (!config.bulkAdd || !/\/add\/$/.test(window.location.pathname)) return;
+        if (document.getElementsByName('_popup').length === 0) return;
+
+        var saveButton = document.querySelector('button[name="_save"]');
+        var form = saveButton && (saveButton.form || document.querySelector('form[id$="_form"]'));
+        if (!form) return;
+
+        var button = saveButton.cloneNode(false);
+        button.name = '_addanother';
+        button.textContent = translate('Save and add another');
+        saveButton.insertAdjacentElement('afterend', button);
+
+        var savedCount = 0;
+        var submitting = false;
+
+        button.addEventListener('click', function(event) {
+            event.preventDefault();
+            if (submitting || !form.reportValidity()) return;
+            submitting = true;
+            button.disabled = true;
+
+            fetch(getFormAction(form), {
+                method: 'POST',
+                body: new FormData(form),
+                credentials: 'same-origin'
+            }).then(function(response) {
+                return response.text().then(function(html) {
+                    if (applyBulkResponse(form, response, html, savedCount)) {
+                        savedCount++;
+                    }
+                }).catch(function(error) {
+                    // The server got the request – never submit it again
+                    console.error(error);
+                    showStatus(form, translate('The entry could not be confirmed. Reload the form to check whether it was saved.'), true);
+                });
+            }, function() {
+                // The request never reached the server – fall back to a regular submission
+                form.setAttribute('action', getFormAction(form));
+                form.submit();
+            }).finally(function() {
+                submitting = false;
+                button.disabled = false;
+            });
+        });
+    }
+
+    function onReady() {
+        // Let the parent reveal the modal as soon as the HTML is parsed,
+        // without waiting for images, fonts and widget assets
+        window.parent.postMessage({
+            type: MSG_MODAL_READY,
+            title: document.title,
+            hasHeader: !!document.getElementById('header-inner'),
+            isPopup: document.getElementsByName('_popup').length > 0
+        }, window.location.origin);
 
-    document.addEventListener('DOMContentLoaded', function() {
         document.body.addEventListener('click', function(event) {
             var link = event.target.closest('a[data-popup-opener]');
             if (!link) return;
@@ -21,5 +216,22 @@
                 chosenId: link.dataset.popupOpener
             }, window.location.origin);
         });
-    });
+
+        // Trace form submissions as requests of the modal
+        document.addEventListener('submit', function(event) {
+            var form = event.target;
+            if ((form.getAttribute('method') || '').toLowerCase() === 'post') {
+                form.setAttribute('action', getFormAction(form));
+            }
+        });
+
+        setupBulkAdd();
+    }
+
+    // The on-demand loader may add this script after the document is parsed
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', onReady);
+    } else {
+        onReady();
+    }
 })();
@@ -11,16 +11,25 @@
     const state = Modal.state;
     const utils = Modal.utils;
     const dom = Modal.dom;
+    const cache = Modal.cache;
     const resizeEnabled = Modal.resizeEnabled;
+    const tagRequests = Modal.tagRequests;
+    const traceRequests = Modal.traceRequests;
     const disableHeader = Modal.disableHeader;
     const MSG = Modal.MSG;
     const ICONS = Modal.ICONS;
     const SELECTORS = Modal.SELECTORS;
+    const HIDDEN_CLASS = Modal.HIDDEN_CLASS;
+    const LOADING_CLASS = Modal.LOADING_CLASS;
 
     // Prefix patterns for popup name extraction
     const SHOW_RELATED_PREFIX = /^(change|add|delete|view)_/;
     const LOOKUP_PREFIX = /^lookup_/;
 
+    // Overlay clicks this soon after opening are treated as the second click
+    // of a double click and do not close the modal
+    const OPEN_CLICK_GUARD_MS = 400;
+
     // ---------------------------------------------------------------
     // Resize and Maximize
     // ---------------------------------------------------------------
@@ -68,7 +77,7 @@
         let observer = null;
 
         // Detect resize start by watching for mousedown near the resize handle
-        container.addEventListener('mousedown', function(e) {
+        function handleMouseDown(e) {
             const rect = container.getBoundingClientRect();
             const nearRight = e.clientX > rect.right - 20;
             const nearBottom = e.clientY > rect.bottom - 20;
@@ -76,7 +85,8 @@
             if (nearRight || nearBottom) {
                 state.isResizing = true;
             }
-        });
+        }
+        container.addEventListener('mousedown', handleMouseDown);
 
         // End resize on any mouseup
         function handleMouseUp() {
@@ -130,6 +140,7 @@
 
         // Return cleanup function
         return function cleanup() {
+            container.removeEventListener('mousedown', handleMouseDown);
             document.removeEventListener('mouseup', handleMouseUp);
             window.removeEventListener('resize', handleWindowResize);
             if (observer) {
@@ -142,6 +153,9 @@
     // Modal Operations
     // ---------------------------------------------------------------
 
+    // Cleanup of the modal whose close animation is still running
+    let pendingCloseCleanup = null;
+
     /**
      * Handle ESC key – always closes the topmost modal
      */
@@ -152,33 +166,115 @@
     }
 
     /**
-     * Open modal with iframe.
-     * If a modal is already visible it is hidden and pushed down the stack.
+     * Update modal title and optionally hide the admin header once the
+     * iframe document has loaded.
      */
-    function openModal(url, iframeName) {
-        const currentModal = utils.getActiveModal();
-        const modalStack = state.modalStack;
+    function applyIframeDocument(modal) {
+        try {
+            const iframeDoc = modal.iframe.contentDocument;
 
-        // Hide current modal (don't remove) so it can be restored later
-        if (currentModal) {
-            currentModal.overlay.style.display = 'none';
-        } else {
-            // First modal – lock page scroll
-            utils.lockScroll();
+            // Update modal title from iframe document title
+            const iframeTitle = iframeDoc.title;
+            if (iframeTitle) {
+                modal.title.textContent = iframeTitle;
+            }
+
+            // Hide admin header inside iframe if configured
+            if (disableHeader) {
+                // Find the header container by navigating from #header-inner
+                // Structure: #main > header-container > div > #header-inner
+                const headerInner = iframeDoc.getElementById(SELECTORS.HEADER_INNER);
+                if (headerInner) {
+                    // Navigate up to the header container (grandparent)
+                    let headerContainer = headerInner;
+                    for (let i = 0; i < SELECTORS.HEADER_CONTAINER_DEPTH; i++) {
+                        if (headerContainer.parentElement) {
+                            headerContainer = headerContainer.parentElement;
+                        }
+                    }
+                    // Hide the header container
+                    if (headerContainer && headerContainer !== iframeDoc.body) {
+                        headerContainer.style.display = 'none';
+                    }
+                }
+
+                // Add top spacing to the main content container
+                const mainContent = iframeDoc.getElementById(SELECTORS.MAIN);
+                if (mainContent) {
+                    mainContent.style.paddingTop = '1rem';
+                }
+            }
+        } catch (e) {
+            // Cross-origin – cannot access iframe content
         }
+    }
+
+    /**
+     * Reveal the iframe content and hide the skeleton.
+     * Called on the child's ready message (DOMContentLoaded) or, as a
+     * fallback for pages without popup_iframe.js, on the iframe load event.
+     */
+    function revealModal(modal) {
+        if (!modal.container) return;
+        if (modal.pending && modal.traceparent) {
+            utils.clearTraceCookie();
+        }
+        modal.pending = false;
+        if (!modal.readyAt) {
+            modal.readyAt = performance.now();
+        }
+        applyIframeDocument(modal);
+        modal.container.classList.remove(LOADING_CLASS);
+    }
+
+    /**
+     * Return the traceparent for a new modal's requests.
+     * Continues the server span of the document that opened it (the parent
+     * modal's iframe or the page); otherwise continues the parent modal's
+     * trace, or starts a new one, with a browser span of its own.
+     */
+    function getModalTraceparent(currentModal, documentTraceparent) {
+        if (documentTraceparent) return documentTraceparent;
+        const parentTrace = currentModal && currentModal.traceparent;
+        return utils.createTraceparent(parentTrace ? parentTrace.split('-')[1] : null);
+    }
 
-        // Create modal structure
+    /**
+     * Return the iframe URL of a modal: with tagRequests enabled, tagged with
+     * the popup names of the modal and its parent.
+     */
+    function getModalSrc(url, iframeName, parentName) {
+        return tagRequests ? utils.tagModalUrl(url, iframeName, parentName) : url;
+    }
+
+    /**
+     * Build a new modal (overlay, container, header, iframe) and attach it to the page.
+     * With tagRequests enabled, the iframe URL carries the popup names of the
+     * modal and its parent for server-side request classification; with
+     * traceRequests, the document request carries the modal's traceparent in
+     * the trace cookie (the URL stays stable for conditional GETs).
+     * All listeners are bound to modal.listeners, aborted by dom.dispose().
+     */
+    function createModal(url, iframeName, cacheKey, parentName, traceparent) {
+        if (traceparent) {
+            utils.setTraceCookie(traceparent);
+        }
+        const listeners = new AbortController();
+        const signal = listeners.signal;
         const overlay = dom.createOverlay();
         const container = dom.createContainer();
-        const { header, title, maximizeButton } = dom.createHeader(closeModal);
-        const iframe = dom.createIframe(url, iframeName);
+        const { header, title, maximizeButton } = dom.createHeader(closeModal, signal);
+        const skeleton = dom.createSkeleton();
+        const iframe = dom.createIframe(
+            getModalSrc(url, iframeName, parentName), iframeName
+        );
 
         container.appendChild(header);
+        container.appendChild(skeleton);
         container.appendChild(iframe);
         overlay.appendChild(container);
         document.body.appendChild(overlay);
 
-        // Push onto stack
         const modal = {
             overlay: overlay,
             container: container,
@@ -187,55 +283,182 @@
             title: title,
             maximizeButton: maximizeButton,
             isMaximized: false,
-            preMaximizeDimensions: null
+            preMaximizeDimensions: null,
+            requestUrl: url,
+            cacheKey: cacheKey,
+            loadCount: 0,
+            pending: true, // Current open not yet ready (double-open guard)
+            openedAt: 0,
+            readyAt: 0,
+            pendingDismisses: 0,
+            reusedInPlace: false, // Document reset for a new opener, not reloaded
+            forResult: false, // Opened through UnfoldModal.openForResult()
+            onResult: null,
+            traceparent: traceparent,
+            listeners: listeners,
+            resizeCleanup: null
         };
-        modalStack.push(modal);
 
         // Maximize button handler
         maximizeButton.addEventListener('click', function() {
             toggleMaximize(modal);
-        });
+        }, { signal: signal });
 
-        // Update title and optionally hide admin header when iframe loads
+        // Count navigations (only single-load documents are reusable)
         iframe.addEventListener('load', function() {
-            try {
-                const iframeDoc = iframe.contentDocument;
+            modal.loadCount++;
+            modal.reusedInPlace = false;
+            revealModal(modal);
+        }, { signal: signal });
 
-                // Update modal title from iframe document title
-                const iframeTitle = iframeDoc.title;
-                if (iframeTitle) {
-                    title.textContent = iframeTitle;
-                }
+        // Track mousedown on overlay itself (not bubbled from children)
+        let mousedownOnOverlay = false;
+        overlay.addEventListener('mousedown', function(e) {
+            mousedownOnOverlay = (e.target === overlay);
+        }, { signal: signal });
 
-                // Hide admin header inside iframe if configured
-                if (disableHeader) {
-                    // Find the header container by navigating from #header-inner
-                    // Structure: #main > header-container > div > #header-inner
-                    const headerInner = iframeDoc.getElementById(SELECTORS.HEADER_INNER);
-                    if (headerInner) {
-                        // Navigate up to the header container (grandparent)
-                        let headerContainer = headerInner;
-                        for (let i = 0; i < SELECTORS.HEADER_CONTAINER_DEPTH; i++) {
-                            if (headerContainer.parentElement) {
-                                headerContainer = headerContainer.parentElement;
-                            }
-                        }
-                        // Hide the header container
-                        if (headerContainer && headerContainer !== iframeDoc.body) {
-                            headerContainer.style.display = 'none';
-                        }
-                    }
+        // Close on overlay click only if mousedown was also on overlay
+        overlay.addEventListener('click', function(e) {
+            const isOpening = performance.now() - modal.openedAt < OPEN_CLICK_GUARD_MS;
+            if (e.target === overlay && mousedownOnOverlay && !state.isResizing && !isOpening) {
+                closeModal();
+            }
+            mousedownOnOverlay = false;
+        }, { signal: signal });
 
-                    // Add top spacing to the main content container
-                    const mainContent = iframeDoc.getElementById(SELECTORS.MAIN);
-                    if (mainContent) {
-                        mainContent.style.paddingTop = '1rem';
-                    }
+        return modal;
+    }
+
+    /**
+     * Reuse a parked modal from the iframe cache.
+     * Add forms are reset in place; anything else, or a cached add form whose
+     * related data changed since it was parked, is reloaded. The iframe URL
+     * is re-tagged for the new opener (popup names) and reloads carry its
+     * traceparent, so reloads and form submissions are classified and traced
+     * as its requests.
+     */
+    function reuseModal(entry, iframeName, parentName, traceparent) {
+        const modal = entry.modal;
+        const { overlay, container, iframe } = modal;
+        const src = getModalSrc(modal.cacheKey, iframeName, parentName);
+
+        // Clear leftover close-animation styles
+        overlay.style.background = '';
+        overlay.style.opacity = '';
+        container.style.opacity = '';
+        container.style.transform = '';
+        container.style.transition = '';
+        overlay.classList.remove(HIDDEN_CLASS);
+
+        // Set again by UnfoldModal.openForResult() for result modals
+        modal.forResult = false;
+        modal.onResult = null;
+
+        // Django's dismiss functions resolve the target widget from the window name
+        modal.iframeName = iframeName;
+        modal.traceparent = traceparent;
+        modal.reusedInPlace = false;
+        iframe.name = iframeName;
+
+        try {
+            const iframeWin = iframe.contentWindow;
+            iframeWin.name = iframeName;
+
+            const isAddView = new URL(modal.cacheKey).pathname.endsWith('/add/');
+            if (entry.stale || !isAddView) {
+                if (traceparent) {
+                    utils.setTraceCookie(traceparent);
+                }
+                modal.loadCount = 0;
+                container.classList.add(LOADING_CLASS);
+                iframeWin.location.replace(src);
+            } else {
+                // Form submissions post to the document URL
+                iframeWin.history.replaceState(iframeWin.history.state, '', src);
+                modal.reusedInPlace = true;
+
+                Array.prototype.forEach.call(iframeWin.document.forms, function(form) {
+                    form.reset();
+                });
+                // Let Select2 and related-widget links pick up the reset values
+                if (iframeWin.django && iframeWin.django.jQuery) {
+                    iframeWin.django.jQuery(iframeWin.document).find('select').trigger('change');
+                }
+                iframeWin.scrollTo(0, 0);
+
+                // Nested popups derive their index from the window name
+                if (iframeWin.UnfoldModal && iframeWin.UnfoldModal.utils) {
+                    iframeWin.UnfoldModal.utils.setPopupIndex();
                 }
-            } catch (e) {
-                // Cross-origin – cannot access iframe content
             }
-        });
+        } catch (e) {
+            if (traceparent) {
+                utils.setTraceCookie(traceparent);
+            }
+            modal.loadCount = 0;
+            iframe.src = src;
+        }
+
+        return modal;
+    }
+
+    /**
+     * Check whether the active modal is still opening the same popup: its
+     * document is not ready yet, or (for add forms reused in place, which are
+     * ready at once) it was opened within the double click window.
+     */
+    function isDuplicateOpen(currentModal, url, iframeName) {
+        if (!currentModal) return false;
+        const isOpening = currentModal.pending ||
+            performance.now() - currentModal.openedAt < OPEN_CLICK_GUARD_MS;
+        if (!isOpening) return false;
+        return currentModal.iframeName === iframeName || currentModal.requestUrl === url;
+    }
+
+    /**
+     * Open modal with iframe.
+     * If a modal is already visible it is hidden and pushed down the stack.
+     * A recently closed modal for the same URL is reused when the iframe cache is enabled.
+     * Repeat opens of a popup that is still loading (e.g. double clicks) are ignored.
+     * documentTraceparent is the traceparent of the iframe document requesting
+     * a nested modal (from its MODAL_OPEN message).
+     * Returns the opened modal, or null if the open was ignored.
+     */
+    function openModal(url, iframeName, documentTraceparent) {
+        const currentModal = utils.getActiveModal();
+        const modalStack = state.modalStack;
+
+        if (isDuplicateOpen(currentModal, url, iframeName)) return null;
+
+        // Hide current modal (don't remove) so it can be restored later
+        if (currentModal) {
+            currentModal.overlay.classList.add(HIDDEN_CLASS);
+        } else {
+            // First modal – lock page scroll
+            utils.lockScroll();
+        }
+
+        const parentName = currentModal ? currentModal.iframeName : window.name;
+        // A document reused in place still exposes its previous opener's span
+        const openerTraceparent = currentModal
+            ? (currentModal.reusedInPlace ? null : documentTraceparent)
+            : utils.getDocumentTraceparent(window);
+        const traceparent = traceRequests
+            ? getModalTraceparent(currentModal, openerTraceparent)
+            : null;
+        const cacheKey = Modal.iframeCacheSize ? cache.getKey(url) : null;
+        const cached = cacheKey ? cache.take(cacheKey) : null;
+        const modal = cached
+            ? reuseModal(cached, iframeName, parentName, traceparent)
+            : createModal(url, iframeName, cacheKey, parentName, traceparent);
+        const { overlay, container } = modal;
+
+        // Push onto stack
+        modal.openedAt = performance.now();
+        // Time-to-ready for the debug HUD (reused add forms are ready at once)
+        modal.readyAt = container.classList.contains(LOADING_CLASS) ? 0 : modal.openedAt;
+        modal.pending = !modal.readyAt;
+        modalStack.push(modal);
 
         // Resize tracking
         if (resizeEnabled) {
@@ -248,24 +471,12 @@
             container.style.transform = 'scale(1)';
         });
 
-        // Track mousedown on overlay itself (not bubbled from children)
-        let mousedownOnOverlay = false;
-        overlay.addEventListener('mousedown', function(e) {
-            mousedownOnOverlay = (e.target === overlay);
-        });
-
-        // Close on overlay click only if mousedown was also on overlay
-        overlay.addEventListener('click', function(e) {
-            if (e.target === overlay && mousedownOnOverlay && !state.isResizing) {
-                closeModal();
-            }
-            mousedownOnOverlay = false;
-        });
-
         // ESC handler – attach once for the first modal
         if (modalStack.length === 1) {
             document.addEventListener('keydown', handleEscKey);
         }
+
+        return modal;
     }
 
     /**
@@ -280,22 +491,52 @@
         state.isClosing = true;
 
         const modalToClose = modalStack.pop();
-        const { overlay, container, resizeCleanup } = modalToClose;
+        const { overlay, container, iframe, resizeCleanup } = modalToClose;
         const previousModal = utils.getActiveModal();
 
+        // Closed without a popup result
+        rejectModalResult(modalToClose);
+
         // Clean up resize tracking if present
         if (resizeCleanup) {
             resizeCleanup();
+            modalToClose.resizeCleanup = null;
+        }
+
+        // Its document will not be ready – stop sending its traceparent
+        if (modalToClose.pending && modalToClose.traceparent) {
+            utils.clearTraceCookie();
+        }
+
+        // Abort a navigation that is still in flight
+        if (modalToClose.loadCount === 0) {
+            try {
+                iframe.contentWindow.stop();
+            } catch (e) {}
+        }
+
+        // Listen for transition end on the element that animates
+        const animTarget = previousModal ? container : overlay;
+        function onTransitionEnd(e) {
+            // Only trigger on the expected property to avoid double-fires
+            if (e.target === animTarget) {
+                cleanupAfterClose();
+            }
         }
 
         // Cleanup function to run after animation completes
         let cleanupDone = false;
+        let fallbackTimer = null;
         function cleanupAfterClose() {
             if (cleanupDone) return;
             cleanupDone = true;
+            pendingCloseCleanup = null;
+            animTarget.removeEventListener('transitionend', onTransitionEnd);
+            clearTimeout(fallbackTimer);
 
-            if (overlay.parentNode) {
-                overlay.parentNode.removeChild(overlay);
+            // Park for reuse when cacheable, otherwise dispose
+            if (!cache.park(modalToClose)) {
+                dom.dispose(modalToClose);
             }
 
             if (!previousModal) {
@@ -307,22 +548,16 @@
             state.isClosing = false;
         }
 
-        // Listen for transition end on the element that animates
-        const animTarget = previousModal ? container : overlay;
-        animTarget.addEventListener('transitionend', function onEnd(e) {
-            // Only trigger on the expected property to avoid double-fires
-            if (e.target === animTarget) {
-                animTarget.removeEventListener('transitionend', onEnd);
-                cleanupAfterClose();
-            }
-        });
+        animTarget.addEventListener('transitionend', onTransitionEnd);
+        pendingCloseCleanup = cleanupAfterClose;
 
         // Fallback: cleanup if transitionend doesn't fire (e.g., prefers-reduced-motion)
-        setTimeout(cleanupAfterClose, 200);
+        fallbackTimer = setTimeout(cleanupAfterClose, 200);
 
         if (previousModal) {
-            // Show previous modal immediately to avoid flicker
-            previousModal.overlay.style.display = 'flex';
+            // Show previous modal immediately to avoid flicker (no relayout,
+            // its rendering state was preserved while hidden)
+            previousModal.overlay.classList.remove(HIDDEN_CLASS);
             previousModal.overlay.style.opacity = '1';
 
             // Make closing modal's overlay transparent
@@ -339,14 +574,41 @@
         }
     }
 
+    /**
+     * Synchronously tear down all open and cached modals without animation.
+     * Releases every listener, timer and DOM reference held for them, so
+     * long-lived admin tabs (or pages swapping content without reloads)
+     * return to their pre-modal memory footprint.
+     */
+    function disposeAll() {
+        if (pendingCloseCleanup) {
+            pendingCloseCleanup();
+        }
+
+        const modalStack = state.modalStack;
+        while (modalStack.length > 0) {
+            const modal = modalStack.pop();
+            rejectModalResult(modal);
+            dom.dispose(modal);
+        }
+        cache.clear();
+        Modal.autocompleteCache.clear();
+
+        utils.unlockScroll();
+        document.removeEventListener('keydown', handleEscKey);
+        state.isClosing = false;
+        state.isResizing = false;
+    }
+
     // ---------------------------------------------------------------
     // Django Integration
     // ---------------------------------------------------------------
 
     /**
      * Create a fake window object for Django's dismiss functions.
+     * With keepOpen (bulk add results), closing the fake window is a no-op.
      */
-    function createFakeWindow(modal) {
+    function createFakeWindow(modal, keepOpen) {
         let iframeUrl = '';
         try {
             iframeUrl = modal.iframe.contentWindow.location.href;
@@ -356,7 +618,7 @@
 
         return {
             name: modal.iframeName,
-            close: closeModal,
+            close: keepOpen ? function() {} : closeModal,
             closed: false,
             location: {
                 href: iframeUrl,
@@ -393,6 +655,298 @@
         }
     }
 
+    // ---------------------------------------------------------------
+    // Programmatic API (Promise results)
+    // ---------------------------------------------------------------
+
+    // Popup message types mapped to result actions
+    const RESULT_ACTIONS = {
+        [MSG.POPUP_ADD]: 'add',
+        [MSG.POPUP_CHANGE]: 'change',
+        [MSG.POPUP_DELETE]: 'delete',
+        [MSG.POPUP_LOOKUP]: 'lookup'
+    };
+
+    /**
+     * Convert a popup dismiss message into the result of UnfoldModal.openForResult().
+     */
+    function getPopupResult(data) {
+        const action = RESULT_ACTIONS[data.type];
+        switch (action) {
+            case 'add':
+                return { action: action, id: String(data.newId), repr: data.newRepr };
+            case 'change':
+                return {
+                    action: action,
+                    id: String(data.newId),
+                    repr: data.newRepr,
+                    previousId: String(data.objId)
+                };
+            case 'delete':
+                return { action: action, id: String(data.objId) };
+            default:
+                return { action: action, id: String(data.chosenId) };
+        }
+    }
+
+    /**
+     * Resolve the pending result of a modal opened through UnfoldModal.openForResult().
+     */
+    function resolveModalResult(modal, data) {
+        const pending = modal.result;
+        modal.result = null;
+        pending.resolve(getPopupResult(data));
+    }
+
+    /**
+     * Reject the pending result of a modal closed without a popup result.
+     */
+    function rejectModalResult(modal) {
+        const pending = modal.result;
+        if (!pending) return;
+        modal.result = null;
+        pending.reject(new DOMException('Modal closed without a result', 'AbortError'));
+    }
+
+    /**
+     * Open a popup URL in a modal for the related widget named iframeName.
+     * Its result is passed to Django's dismiss functions, as for widget links.
+     *
+     * @param {string} url - Admin popup URL
+     * @param {string} iframeName - Popup window name (e.g. 'id_country__1')
+     */
+    function openPopup(url, iframeName) {
+        openModal(url, iframeName);
+    }
+
+    /**
+     * Open a popup URL in a modal and wait for its result.
+     * Resolves with {action, id, repr, previousId} when the popup is saved,
+     * deleted or an object is picked in a lookup; rejects with an AbortError
+     * when the modal is closed without a result. Django's dismiss functions
+     * are not called for these modals.
+     *
+     * With bulk add, the promise resolves with the first saved object and
+     * options.onResult receives every saved object.
+     *
+     * Inside a modal iframe, the modal is opened by the top-level page and
+     * stacked above the current one. Its default name follows the iframe's
+     * nesting level (as for widget links), so the server sees its real depth.
+     *
+     * @param {string} url - Admin URL (_popup=1 is added if missing)
+     * @param {Object|string} [options] - {name, onResult}, or the name itself
+     * @returns {Promise<Object>}
+     *
+     * @example
+     * UnfoldModal.openForResult('/admin/app/country/?_to_field=id')
+     *     .then(function(result) { console.log(result.id, result.repr); })
+     *     .catch(function() {}); // Closed without a result
+     */
+    function openForResult(url, options) {
+        const opts = typeof options === 'string' ? { name: options } : (options || {});
+        const href = utils.ensurePopupParam(new URL(url, window.location.href).href).toString();
+
+        if (state.isInIframe) {
+            // Iframes have no result handler – the top-level page owns the stack
+            const forwarded = Object.assign({}, opts, {
+                name: opts.name || utils.addPopupIndex('unfold_modal')
+            });
+            try {
+                return Promise.resolve(window.top.UnfoldModal.openForResult(href, forwarded));
+            } catch (e) {
+                return Promise.reject(new DOMException('No modal page to open the popup', 'NotSupportedError'));
+            }
+        }
+
+        const name = opts.name || utils.addPopupIndex('unfold_modal');
+
+        return new Promise(function(resolve, reject) {
+            const modal = openModal(href, name);
+            if (!modal) {
+                reject(new DOMException('Modal is already opening', 'AbortError'));
+                return;
+            }
+            modal.forResult = true;
+            modal.onResult = typeof opts.onResult === 'function' ? opts.onResult : null;
+            modal.result = { resolve: resolve, reject: reject };
+        });
+    }
+
+    // ---------------------------------------------------------------
+    // Cross-tab Propagation (BroadcastChannel)
+    // ---------------------------------------------------------------
+
+    const BROADCAST_CHANNEL = 'unfold-modal';
+    let channel = null;
+
+    // Identifies the browser tab: iframes share the top-level page's id, so
+    // results already applied through dismiss forwarding are not applied twice
+    const tabId = (function() {
+        try {
+            if (window.top.UnfoldModal && window.top.UnfoldModal.tabId) {
+                return window.top.UnfoldModal.tabId;
+            }
+        } catch (e) {
+            // Cross-origin top – treat this document as its own tab
+        }
+        return Math.random().toString(36).slice(2);
+    })();
+
+    Modal.tabId = tabId;
+
+    /**
+     * Publish an add/change/delete popup result to other tabs.
+     */
+    function publishPopupResult(data, pathname) {
+        if (!channel || data.type === MSG.POPUP_LOOKUP) return;
+
+        const target = utils.getAdminModelFromPath(pathname);
+        if (!target) return;
+
+        channel.postMessage({
+            type: data.type,
+            tabId: tabId,
+            appLabel: target.appLabel,
+            model: target.model,
+            objId: data.objId,
+            newId: data.newId,
+            newRepr: data.newRepr
+        });
+    }
+
+    /**
+     * Return the app label of a related select, from the URL of its
+     * related-widget links (change/add/view/delete), or null without links.
+     * Filter widgets split the field's select into "<id>_from" and "<id>_to".
+     */
+    function getSelectAppLabel(select) {
+        const ids = [select.id, select.id.replace(/_(from|to)$/, '')];
+        for (const id of ids) {
+            for (const action of ['change', 'add', 'view', 'delete']) {
+                const link = id && document.getElementById(action + '_' + id);
+                const href = link && (link.getAttribute('data-href-template') || link.getAttribute('href'));
+                if (href) {
+                    const target = utils.getAdminModelFromPath(new URL(href, window.location.href).pathname);
+                    return target ? target.appLabel : null;
+                }
+            }
+        }
+        return null;
+    }
+
+    /**
+     * Patch related selects for a popup result published by another tab.
+     * Selects are matched by model name, and skipped when their related-widget
+     * links point at another app (e.g. blog.Category vs. shop.Category).
+     * Options are only added to plain selects ("available-source"); existing
+     * options are renamed or removed everywhere, except that selected options
+     * are never removed so unsaved forms keep their value.
+     */
+    function applyBroadcastResult(event) {
+        const data = event.data;
+        if (!data || !data.model || !data.type) return;
+        if (data.tabId === tabId) return;
+
+        Modal.autocompleteCache.clear();
+
+        const $ = django.jQuery;
+        const selects = document.querySelectorAll(
+            '[data-model-ref="' + CSS.escape(data.model) + '"] select'
+        );
+
+        selects.forEach(function(select) {
+            const appLabel = data.appLabel && getSelectAppLabel(select);
+            if (appLabel && appLabel !== data.appLabel) return;
+
+            let changed = false;
+
+            if (data.type === MSG.POPUP_ADD) {
+                const exists = Array.prototype.some.call(select.options, function(option) {
+                    return option.value === String(data.newId);
+                });
+                if (!exists && select.dataset.context === 'available-source') {
+                    const option = new Option(data.newRepr, data.newId);
+                    select.options.add(option);
+                    // Keep SelectBox (filter_horizontal) cache in sync
+                    if (window.SelectBox !== undefined && SelectBox.cache[select.id]) {
+                        SelectBox.add_to_cache(select.id, option);
+                        SelectBox.redisplay(select.id);
+                    }
+                    changed = true;
+                }
+            } else {
+                Array.prototype.slice.call(select.options).forEach(function(option) {
+                    if (option.value !== String(data.objId)) return;
+
+                    if (data.type === MSG.POPUP_CHANGE) {
+                        option.textContent = data.newRepr;
+                        option.value = data.newId;
+                        changed = true;
+                    } else if (data.type === MSG.POPUP_DELETE && !option.selected) {
+                        option.remove();
+                        changed = true;
+                    }
+                });
+            }
+
+            // Re-render Select2 without triggering Django's change handlers
+            if (changed && $.fn.select2 && $(select).data('select2')) {
+                $(select).trigger('change.select2');
+            }
+        });
+    }
+
+    // ---------------------------------------------------------------
+    // Shared Autocomplete Results (Select2)
+    // ---------------------------------------------------------------
+
+    /**
+     * Wrap a Select2 ajax transport so GET requests are answered from the
+     * autocomplete cache shared by the top-level page and its modal iframes.
+     */
+    function createCachedTransport($, transport) {
+        return function(params, success, failure) {
+            if (String(params.type || 'GET').toUpperCase() !== 'GET') {
+                return transport(params, success, failure);
+            }
+
+            const store = Modal.autocompleteCache.getShared();
+            const key = new URL(params.url, window.location.href).href +
+                '?' + $.param(params.data || {});
+            const cached = store.get(key);
+            if (cached !== null) {
+                // Parse in this frame, so Select2 only sees its own objects
+                success(JSON.parse(cached));
+                return { status: 200, abort: function() {} };
+            }
+
+            return transport(params, function(data) {
+                store.set(key, JSON.stringify(data));
+                success(data);
+            }, failure);
+        };
+    }
+
+    /**
+     * Route admin autocomplete (Select2) requests through the shared cache.
+     * Patches the ajax adapter, so widgets initialized before this ran are
+     * covered as well.
+     */
+    function installAutocompleteCache($) {
+        if (!Modal.autocompleteCacheTtl || !$.fn.select2 || !$.fn.select2.amd) return;
+
+        const AjaxAdapter = $.fn.select2.amd.require('select2/data/ajax');
+        const query = AjaxAdapter.prototype.query;
+
+        AjaxAdapter.prototype.query = function(params, callback) {
+            if (!this.unfoldModalCached && this.$element.hasClass('admin-autocomplete')) {
+                this.unfoldModalCached = true;
+                this.ajaxOptions.transport = createCachedTransport($, this.ajaxOptions.transport);
+            }
+            return query.call(this, params, callback);
+        };
+    }
+
     // ---------------------------------------------------------------
     // Parent-mode Message Handling
     // ---------------------------------------------------------------
@@ -411,7 +965,29 @@
         if (data.type === MSG.MODAL_OPEN) {
             if (!activeModal) return;
             if (event.source !== activeModal.iframe.contentWindow) return;
-            openModal(data.url, data.iframeName);
+            openModal(data.url, data.iframeName, data.traceparent);
+            return;
+        }
+
+        // Iframe document parsed – reveal content early
+        if (data.type === MSG.MODAL_READY) {
+            const readyModal = modalStack.find(function(modal) {
+                return modal.iframe && event.source === modal.iframe.contentWindow;
+            });
+            if (readyModal) {
+                revealModal(readyModal);
+            }
+            return;
+        }
+
+        // Forwarded dismiss applied by an iframe
+        if (data.type === MSG.MODAL_DISMISSED) {
+            const dismissedModal = modalStack.find(function(modal) {
+                return modal.iframe && event.source === modal.iframe.contentWindow;
+            });
+            if (dismissedModal && dismissedModal.pendingDismisses > 0) {
+                dismissedModal.pendingDismisses--;
+            }
             return;
         }
 
@@ -428,7 +1004,29 @@
         if (!activeModal) return;
         if (event.source !== activeModal.iframe.contentWindow) return;
 
-        if (modalStack.length > 1) {
+        // Related data changed – cached iframes must reload on reuse,
+        // cached autocomplete results are dropped
+        if (data.type !== MSG.POPUP_LOOKUP) {
+            cache.markStale();
+            Modal.autocompleteCache.clear();
+        }
+
+        if (data.keepOpen) {
+            // Bulk add – apply the result and keep the modal open for the next entry
+            applyBulkResult(activeModal, data);
+        } else if (activeModal.forResult) {
+            // Opened through UnfoldModal.openForResult() – hand the result to the caller
+            let popupUrl = '';
+            try {
+                popupUrl = activeModal.iframe.contentWindow.location.href;
+            } catch (e) {}
+
+            if (activeModal.result) {
+                resolveModalResult(activeModal, data);
+            }
+            closeModal();
+            publishPopupResult(data, popupUrl ? new URL(popupUrl).pathname : '');
+        } else if (modalStack.length > 1) {
             // Nested modal completing
             const previousModal = modalStack[modalStack.length - 2];
             let popupUrl = '';
@@ -438,6 +1036,8 @@
 
             closeModal();
 
+            publishPopupResult(data, popupUrl ? new URL(popupUrl).pathname : '');
+
             // Forward dismiss data to the restored modal's iframe
             try {
                 previousModal.iframe.contentWindow.postMessage({
@@ -447,10 +1047,53 @@
                     iframeName: activeModal.iframeName,
                     popupUrl: popupUrl
                 }, window.location.origin);
+                previousModal.pendingDismisses++;
             } catch (e) {}
         } else {
             // Top-level modal completing
             const fakeWin = createFakeWindow(activeModal);
+            publishPopupResult(data, fakeWin.location.pathname);
+            callDismissFunction(data, fakeWin);
+        }
+    }
+
+    /**
+     * Apply a result saved in bulk add mode without closing the modal.
+     * Widgets are updated as for a regular add (nested modals forward the
+     * result to their parent iframe). Modals opened with UnfoldModal.openForResult()
+     * pass each result to options.onResult and resolve with the first one.
+     */
+    function applyBulkResult(activeModal, data) {
+        const modalStack = state.modalStack;
+        const fakeWin = createFakeWindow(activeModal, true);
+
+        publishPopupResult(data, fakeWin.location.pathname);
+
+        if (activeModal.forResult) {
+            // Never handed to Django's dismiss functions (no opener widget)
+            if (activeModal.onResult) {
+                try {
+                    activeModal.onResult(getPopupResult(data));
+                } catch (e) {
+                    console.error(e);
+                }
+            }
+            if (activeModal.result) {
+                resolveModalResult(activeModal, data);
+            }
+        } else if (modalStack.length > 1) {
+            const previousModal = modalStack[modalStack.length - 2];
+            try {
+                previousModal.iframe.contentWindow.postMessage({
+                    type: MSG.MODAL_DISMISS,
+                    dismissType: data.type,
+                    data: data,
+                    iframeName: activeModal.iframeName,
+                    popupUrl: fakeWin.location.href
+                }, window.location.origin);
+                previousModal.pendingDismisses++;
+            } catch (e) {}
+        } else {
             callDismissFunction(data, fakeWin);
         }
     }
@@ -472,7 +1115,8 @@
         window.parent.postMessage({
             type: MSG.MODAL_OPEN,
             url: url.toString(),
-            iframeName: name
+            iframeName: name,
+            traceparent: utils.getDocumentTraceparent(window)
         }, window.location.origin);
     }
 
@@ -489,7 +1133,8 @@
         window.parent.postMessage({
             type: MSG.MODAL_OPEN,
             url: url.toString(),
-            iframeName: name
+            iframeName: name,
+            traceparent: utils.getDocumentTraceparent(window)
         }, window.location.origin);
     }
 
@@ -514,6 +1159,9 @@
         };
 
         callDismissFunction(data.data, fakeWin);
+
+        // Acknowledge, so the parent's debug HUD can track pending dismisses
+        window.parent.postMessage({ type: MSG.MODAL_DISMISSED }, window.location.origin);
     }
 
     // ---------------------------------------------------------------
@@ -555,6 +1203,13 @@
      */
     function init($) {
         utils.setPopupIndex();
+        installAutocompleteCache($);
+
+        // Receive popup results from other tabs (and from this tab's iframes)
+        if (typeof BroadcastChannel !== 'undefined') {
+            channel = new BroadcastChannel(BROADCAST_CHANNEL);
+            channel.addEventListener('message', applyBroadcastResult);
+        }
 
         if (state.isInIframe) {
             // Running inside a modal iframe
@@ -599,8 +1254,10 @@
     }
 
     // Expose public API via UnfoldModal namespace
-    Modal.open = openModal;
+    Modal.open = openPopup;
+    Modal.openForResult = openForResult;
     Modal.close = closeModal;
+    Modal.dispose = disposeAll;
     Modal.stackDepth = function() { return state.modalStack.length; };
 
 })(window.UnfoldModal);
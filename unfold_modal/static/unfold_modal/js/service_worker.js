@@ -0,0 +1,104 @@
+/**
+ * Django Unfold Modal - Static Asset Service Worker
+ *
+ * Serves hashed (immutable) static assets cache-first to the admin page and
+ * all modal iframes. HTML views are never cached. The cache keeps at most
+ * ?max= entries and evicts the least recently used ones, so hashed files
+ * replaced by later deploys do not accumulate.
+ * Served by unfold_modal.views.service_worker_js; registered by
+ * service_worker_register.js (see unfold_modal.utils.get_service_worker_scripts).
+ */
+'use strict';
+
+const params = new URL(self.location.href).searchParams;
+
+// Absolute static URL prefix (STATIC_URL), passed as ?static=
+const STATIC_BASE = new URL(params.get('static') || '/static/', self.location.origin).href;
+
+// Versioned cache – older versions are removed on activate
+const CACHE_PREFIX = 'unfold-modal-static-';
+const CACHE_NAME = CACHE_PREFIX + (params.get('v') || '0');
+
+// Maximum number of cached files (UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES)
+const MAX_ENTRIES = parseInt(params.get('max'), 10) || 200;
+
+// URLs already moved to the recent end of the cache by this worker instance
+const touched = new Set();
+
+// ManifestStaticFilesStorage names: name.<12 hex chars>.ext
+const HASHED_ASSET = /\.[0-9a-f]{12}\.[A-Za-z0-9]+$/;
+
+/**
+ * Only hashed files below STATIC_URL fetched as subresources are cacheable.
+ */
+function isCacheable(request) {
+    if (request.method !== 'GET' || request.mode === 'navigate') return false;
+    if (request.destination === 'document' || request.destination === 'iframe') return false;
+    if (!request.url.startsWith(STATIC_BASE)) return false;
+    return HASHED_ASSET.test(new URL(request.url).pathname);
+}
+
+/**
+ * Delete the least recently used entries above MAX_ENTRIES.
+ * Cache keys are kept in insertion order, and hits are re-inserted, so the
+ * oldest keys are the least recently used.
+ */
+function trimCache(cache) {
+    return cache.keys().then(function(keys) {
+        return Promise.all(keys.slice(0, Math.max(keys.length - MAX_ENTRIES, 0)).map(function(key) {
+            touched.delete(key.url);
+            return cache.delete(key);
+        }));
+    });
+}
+
+self.addEventListener('install', function() {
+    self.skipWaiting();
+});
+
+self.addEventListener('activate', function(event) {
+    event.waitUntil(
+        caches.keys().then(function(keys) {
+            return Promise.all(keys.filter(function(key) {
+                return key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME;
+            }).map(function(key) {
+                return caches.delete(key);
+            }));
+        }).then(function() {
+            return caches.open(CACHE_NAME).then(trimCache);
+        }).then(function() {
+            return self.clients.claim();
+        })
+    );
+});
+
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (!isCacheable(request)) return;
+
+    event.respondWith(
+        caches.open(CACHE_NAME).then(function(cache) {
+            return cache.match(request).then(function(cached) {
+                if (cached) {
+                    // Mark as recently used (once per worker instance)
+                    if (!touched.has(request.url)) {
+                        touched.add(request.url);
+                        event.waitUntil(cache.put(request, cached.clone()));
+                    }
+                    return cached;
+                }
+
+                return fetch(request).then(function(response) {
+                    const contentType = response.headers.get('Content-Type') || '';
+                    if (response.ok && response.type === 'basic' && !contentType.startsWith('text/html')) {
+                        touched.add(request.url);
+                        event.waitUntil(cache.put(request, response.clone()).then(function() {
+                            return trimCache(cache);
+                        }));
+                    }
+                    return response;
+                });
+            });
+        })
+    );
+});
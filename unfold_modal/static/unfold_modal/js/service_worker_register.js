@@ -0,0 +1,27 @@
+/**
+ * Django Unfold Modal - Service Worker Registration
+ *
+ * Registers the static asset service worker from the top-level admin page.
+ * Modal iframes in scope are controlled by the same registration.
+ * The worker URL and scope are passed in this script's query string.
+ */
+'use strict';
+
+(function() {
+    if (!('serviceWorker' in navigator) || !document.currentScript) return;
+
+    // Only register from the top-level page
+    if (window.parent !== window) return;
+
+    const params = new URL(document.currentScript.src).searchParams;
+    const workerUrl = params.get('sw');
+    if (!workerUrl) return;
+
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register(workerUrl, {
+            scope: params.get('scope') || '/'
+        }).catch(function() {
+            // Registration is an optimization only – ignore failures
+        });
+    });
+})();
@@ -0,0 +1,305 @@
+"""
+Performance budget assertions for popup (modal) admin views.
+
+Drives the popup add/change/delete/lookup views with the Django test client
+and fails when a page exceeds its budget for database queries, response
+size, template render time or referenced static assets.
+
+Enable the fixtures with ``-p unfold_modal.testing`` (or
+``pytest_plugins = ["unfold_modal.testing"]`` in the root conftest.py):
+
+    from unfold_modal.testing import PopupBudget
+
+    def test_country_popups(popup_flows, country):
+        budget = PopupBudget(queries=8, bytes=150_000, render_ms=200, assets=25)
+        popup_flows.add(Country, budget)
+        popup_flows.change(country, budget)
+        popup_flows.lookup(Country, budget._replace(queries=10))
+
+Requires pytest and pytest-django.
+"""
+
+import time
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from typing import NamedTuple
+from unittest import mock
+
+import pytest
+from django.contrib.admin.options import IS_POPUP_VAR, TO_FIELD_VAR
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template.response import SimpleTemplateResponse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+
+# Queries listed in the failure message when the query budget is exceeded
+MAX_REPORTED_QUERIES = 20
+
+
+class PopupBudget(NamedTuple):
+    """Upper limits for a popup page; None leaves a metric unchecked."""
+
+    queries: int | None = None  # Database queries
+    bytes: int | None = None  # Response body size
+    render_ms: float | None = None  # Template rendering time
+    assets: int | None = None  # Distinct scripts and stylesheets referenced
+
+
+class PopupMetrics(NamedTuple):
+    """Measurements of a single popup request."""
+
+    method: str
+    url: str
+    status_code: int
+    queries: int
+    bytes: int
+    render_ms: float
+    assets: int
+    sql: tuple  # Captured SQL statements
+    asset_urls: tuple  # Referenced script and stylesheet URLs
+    popup_response: bool = False  # Rendered popup_response (submission saved)
+    errors: tuple = ()  # Form and inline formset errors of a re-rendered form
+
+
+class _AssetParser(HTMLParser):
+    """Collect script and stylesheet URLs referenced by an HTML document."""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("src"):
+            self.urls.append(attrs["src"])
+        elif tag == "link" and "stylesheet" in (attrs.get("rel") or "").split():
+            if attrs.get("href"):
+                self.urls.append(attrs["href"])
+
+
+def get_asset_urls(content):
+    """Return the distinct script/stylesheet URLs in an HTML document, in order."""
+    parser = _AssetParser()
+    parser.feed(content)
+    return tuple(dict.fromkeys(parser.urls))
+
+
+@contextmanager
+def _time_template_rendering():
+    """Accumulate the time spent rendering template responses (in ms)."""
+    timings = []
+    original = SimpleTemplateResponse.render
+
+    def render(response):
+        start = time.perf_counter()
+        try:
+            return original(response)
+        finally:
+            timings.append((time.perf_counter() - start) * 1000)
+
+    with mock.patch.object(SimpleTemplateResponse, "render", render):
+        yield timings
+
+
+def _get_form_errors(context):
+    """Return the admin form and inline formset errors of a rendered form."""
+    adminform = context.get("adminform")
+    if adminform is None:
+        return ()
+
+    errors = [
+        f"{field}: {message}"
+        for field, messages in adminform.form.errors.items()
+        for message in messages
+    ]
+    for inline in context.get("inline_admin_formsets", ()):
+        formset = inline.formset
+        errors.extend(f"{formset.prefix}: {e}" for e in formset.non_form_errors())
+        for form in formset.forms:
+            errors.extend(
+                f"{form.prefix}-{field}: {message}"
+                for field, messages in form.errors.items()
+                for message in messages
+            )
+    return tuple(errors)
+
+
+def popup_url(model, view, obj=None, site="admin", **params):
+    """
+    Return the popup URL of an admin view.
+
+    Args:
+        model: Model class or instance.
+        view: "add", "change", "delete" or "lookup" (changelist with _to_field).
+        obj: Object for change/delete views (defaults to ``model`` if an instance).
+        site: Admin site URL namespace.
+        **params: Extra query parameters.
+    """
+    opts = model._meta
+    if obj is None and not isinstance(model, type):
+        obj = model
+
+    if view == "lookup":
+        name = "changelist"
+        params.setdefault(TO_FIELD_VAR, opts.pk.attname)
+    else:
+        name = view
+
+    args = (obj.pk,) if view in ("change", "delete") else ()
+    url = reverse(f"{site}:{opts.app_label}_{opts.model_name}_{name}", args=args)
+    return f"{url}?{urlencode({IS_POPUP_VAR: 1, **params})}"
+
+
+def measure_popup(client, url, data=None, method=None, using=DEFAULT_DB_ALIAS):
+    """
+    Request a popup page and measure it.
+
+    GETs ``url``, or POSTs ``data`` (with ``_popup`` added) when given.
+
+    Returns:
+        PopupMetrics
+    """
+    method = method or ("post" if data is not None else "get")
+    if method == "post":
+        data = {IS_POPUP_VAR: "1", **(data or {})}
+
+    with CaptureQueriesContext(connections[using]) as queries:
+        with _time_template_rendering() as timings:
+            response = getattr(client, method)(url, data)
+
+    content = response.content.decode(response.charset or "utf-8")
+    content_type = response.get("Content-Type", "")
+    asset_urls = get_asset_urls(content) if content_type.startswith("text/html") else ()
+    context = response.context or {}
+
+    return PopupMetrics(
+        method=method.upper(),
+        url=url,
+        status_code=response.status_code,
+        queries=len(queries),
+        bytes=len(response.content),
+        render_ms=round(sum(timings), 2),
+        assets=len(asset_urls),
+        sql=tuple(query["sql"] for query in queries.captured_queries),
+        asset_urls=asset_urls,
+        popup_response="popup_response_data" in context,
+        errors=_get_form_errors(context),
+    )
+
+
+def format_budget_report(metrics, budget):
+    """Return a budget vs. actual table, marking exceeded metrics."""
+    lines = [f"{'metric':<10} {'budget':>10} {'actual':>10}"]
+    for field in PopupBudget._fields:
+        limit = getattr(budget, field)
+        actual = getattr(metrics, field)
+        if limit is None:
+            lines.append(f"{field:<10} {'-':>10} {actual:>10}")
+            continue
+        over = actual - limit
+        marker = f"  +{round(over, 2)} over budget" if over > 0 else ""
+        lines.append(f"{field:<10} {limit:>10} {actual:>10}{marker}")
+    return "\n".join(lines)
+
+
+def assert_popup_budget(metrics, budget):
+    """
+    Fail if ``metrics`` exceed ``budget``.
+
+    The assertion message shows budget vs. actual for every metric, plus the
+    captured SQL or referenced assets when those budgets are exceeded.
+    """
+    exceeded = [
+        field
+        for field in PopupBudget._fields
+        if getattr(budget, field) is not None
+        and getattr(metrics, field) > getattr(budget, field)
+    ]
+    if not exceeded:
+        return
+
+    message = [
+        f"Popup budget exceeded for {metrics.method} {metrics.url} "
+        f"({', '.join(exceeded)}):",
+        format_budget_report(metrics, budget),
+    ]
+    if "queries" in exceeded:
+        message.append("Queries:")
+        message.extend(
+            f"  {i}. {sql}"
+            for i, sql in enumerate(metrics.sql[:MAX_REPORTED_QUERIES], 1)
+        )
+        if len(metrics.sql) > MAX_REPORTED_QUERIES:
+            message.append(f"  ... {len(metrics.sql) - MAX_REPORTED_QUERIES} more")
+    if "assets" in exceeded:
+        message.append("Assets:")
+        message.extend(f"  {url}" for url in metrics.asset_urls)
+
+    raise AssertionError("\n".join(message))
+
+
+class PopupFlows:
+    """Measure popup views of a client and assert budgets (see ``popup_flows``)."""
+
+    def __init__(self, client, budget=None, site="admin"):
+        self.client = client
+        self.budget = budget or PopupBudget()
+        self.site = site
+
+    def check(self, url, budget=None, data=None, status_code=None):
+        """
+        Measure ``url``, assert the status code and budget, return metrics.
+
+        Submissions (``data``) must render the popup response, unless an
+        explicit ``status_code`` is expected.
+        """
+        metrics = measure_popup(self.client, url, data=data)
+        expected = 200 if status_code is None else status_code
+        if metrics.status_code != expected:
+            raise AssertionError(
+                f"{metrics.method} {url} returned {metrics.status_code}, "
+                f"expected {expected}"
+            )
+        # Successful popup submissions render popup_response; invalid ones
+        # re-render the form with 200
+        if data is not None and status_code is None and not metrics.popup_response:
+            message = [f"{metrics.method} {url} did not render the popup response"]
+            if metrics.errors:
+                message.append("Errors:")
+                message.extend(f"  {error}" for error in metrics.errors)
+            raise AssertionError("\n".join(message))
+        assert_popup_budget(metrics, budget or self.budget)
+        return metrics
+
+    def add(self, model, budget=None, data=None, **params):
+        """Render the add popup, or submit it when ``data`` is given."""
+        url = popup_url(model, "add", site=self.site, **params)
+        return self.check(url, budget, data)
+
+    def change(self, obj, budget=None, data=None, **params):
+        """Render the change popup of ``obj``, or submit it when ``data`` is given."""
+        url = popup_url(obj, "change", site=self.site, **params)
+        return self.check(url, budget, data)
+
+    def delete(self, obj, budget=None, confirm=False, **params):
+        """Render the delete confirmation popup, or confirm it."""
+        url = popup_url(obj, "delete", site=self.site, **params)
+        return self.check(url, budget, {"post": "yes"} if confirm else None)
+
+    def lookup(self, model, budget=None, **params):
+        """Render the raw ID lookup changelist popup."""
+        url = popup_url(model, "lookup", site=self.site, **params)
+        return self.check(url, budget)
+
+
+@pytest.fixture
+def popup_budget():
+    """Default budget for ``popup_flows``; override to set project-wide limits."""
+    return PopupBudget()
+
+
+@pytest.fixture
+def popup_flows(admin_client, popup_budget):
+    """PopupFlows for pytest-django's ``admin_client`` and ``popup_budget``."""
+    return PopupFlows(admin_client, popup_budget)
@@ -0,0 +1,210 @@
+"""
+Trace context propagation across modal chains.
+
+The frontend passes a W3C ``traceparent`` to every modal iframe request, so
+the parent page, each iframe, its POSTs and the popup_response of a nested
+flow share one trace. Iframe documents get it from a short-lived cookie
+(``unfold_modal_traceparent``), so their URLs stay stable and cached
+documents can be revalidated (e.g. by PopupConditionalGetMixin); form
+submissions carry it as the ``_traceparent`` URL parameter.
+ModalTraceMiddleware runs traced requests in a span created by
+``UNFOLD_MODAL_TRACE_HOOK``:
+
+- ``otel_span`` (default): an OpenTelemetry server span, child of the
+  incoming context, if ``opentelemetry-api`` is installed; otherwise
+  ``noop_span``.
+- ``noop_span``: only generates span IDs, for log correlation.
+
+The span is exposed to the browser as ``Server-Timing: traceparent``, so a
+modal opened from that document becomes its child. Add TraceContextFilter to
+a logging handler for ``%(trace_id)s``/``%(span_id)s`` in log records.
+"""
+
+import logging
+import re
+import secrets
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache
+from typing import NamedTuple
+
+from django.utils.module_loading import import_string
+
+from .apps import get_setting
+from .utils import get_modal_request
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace.propagation.tracecontext import (
+        TraceContextTextMapPropagator,
+    )
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+TRACE_VAR = "_traceparent"
+TRACE_COOKIE = "unfold_modal_traceparent"
+
+# version-trace_id-parent_id-flags (https://www.w3.org/TR/trace-context/)
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+
+_current_trace = ContextVar("unfold_modal_trace", default=None)
+
+
+class TraceContext(NamedTuple):
+    """Trace context of a request (hex IDs, W3C trace context format)."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str = ""  # Span ID of the caller, empty for root spans
+    sampled: bool = True
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value):
+    """
+    Parse a ``traceparent`` value.
+
+    Returns:
+        TraceContext whose ``span_id`` is the caller's span, or None if invalid.
+    """
+    match = TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return TraceContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1))
+
+
+def get_current_trace():
+    """Return the TraceContext of the request being handled, or None."""
+    return _current_trace.get()
+
+
+def get_span_name(request):
+    info = get_modal_request(request)
+    return f"{info.mode} {request.method} {request.path}"
+
+
+def get_span_attributes(request):
+    info = get_modal_request(request)
+    return {
+        "unfold_modal.mode": info.mode,
+        "unfold_modal.depth": info.depth,
+        "unfold_modal.name": info.name,
+        "unfold_modal.parent": info.parent,
+    }
+
+
+@contextmanager
+def noop_span(request, parent):
+    """Generate a span ID (and a trace ID for root spans) without recording."""
+    if parent is None:
+        yield TraceContext(secrets.token_hex(16), secrets.token_hex(8))
+    else:
+        yield TraceContext(
+            parent.trace_id, secrets.token_hex(8), parent.span_id, parent.sampled
+        )
+
+
+@contextmanager
+def otel_span(request, parent):
+    """
+    Run the request in an OpenTelemetry server span (no-op without the SDK).
+
+    The span is a child of ``parent`` (the modal's incoming trace context),
+    or of the current span when the request is not traced by the frontend.
+    """
+    if otel_trace is None:
+        with noop_span(request, parent) as trace:
+            yield trace
+        return
+
+    context = None
+    if parent is not None:
+        context = TraceContextTextMapPropagator().extract(
+            {"traceparent": parent.traceparent}
+        )
+    tracer = otel_trace.get_tracer("unfold_modal")
+    with tracer.start_as_current_span(
+        get_span_name(request),
+        context=context,
+        kind=otel_trace.SpanKind.SERVER,
+        attributes=get_span_attributes(request),
+    ) as span:
+        if not span.is_recording():
+            # No SDK configured – the API only passes the parent context on
+            with noop_span(request, parent) as trace:
+                yield trace
+            return
+        span_context = span.get_span_context()
+        yield TraceContext(
+            format(span_context.trace_id, "032x"),
+            format(span_context.span_id, "016x"),
+            parent.span_id if parent else "",
+            span_context.trace_flags.sampled,
+        )
+
+
+def get_otel_traceparent():
+    """Return the ``traceparent`` of the current recording OTel span, or None."""
+    if otel_trace is None:
+        return None
+    span = otel_trace.get_current_span()
+    if not span.is_recording():
+        return None
+    span_context = span.get_span_context()
+    return TraceContext(
+        format(span_context.trace_id, "032x"),
+        format(span_context.span_id, "016x"),
+        sampled=span_context.trace_flags.sampled,
+    ).traceparent
+
+
+@cache
+def _import_hook(path):
+    return import_string(path)
+
+
+def get_trace_hook():
+    """Return the span hook configured by ``UNFOLD_MODAL_TRACE_HOOK``."""
+    return _import_hook(get_setting("UNFOLD_MODAL_TRACE_HOOK"))
+
+
+@contextmanager
+def trace_request(request, parent):
+    """Run a request in a span of the configured hook and make it current."""
+    with get_trace_hook()(request, parent) as trace:
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Add ``trace_id``, ``span_id`` and ``parent_span_id`` to log records.
+
+    Empty strings outside traced requests.
+
+        LOGGING = {
+            "filters": {"trace": {"()": "unfold_modal.tracing.TraceContextFilter"}},
+            "formatters": {
+                "traced": {"format": "%(trace_id)s %(span_id)s %(message)s"},
+            },
+            # ...
+        }
+    """
+
+    def filter(self, record):
+        trace = get_current_trace()
+        record.trace_id = trace.trace_id if trace else ""
+        record.span_id = trace.span_id if trace else ""
+        record.parent_span_id = trace.parent_id if trace else ""
+        return True
@@ -8,4 +8,7 @@ app_name = "unfold_modal"
 
 urlpatterns = [
     path("config.js", views.modal_config_js, name="config_js"),
+    path("sw.js", views.service_worker_js, name="service_worker"),
+    path("profiles/", views.profile_list, name="profiles"),
+    path("profiles/<str:name>/", views.profile_download, name="profile_download"),
 ]
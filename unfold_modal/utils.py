@@ -1,7 +1,106 @@
 """Utility functions for unfold-modal."""
 
+import hashlib
+import re
+from functools import cache, update_wrapper
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.templatetags.static import static
-from django.urls import reverse
+from django.urls import get_script_prefix, reverse
+from django.utils.module_loading import import_string
+
+from . import __version__
+from .apps import get_setting
+
+# Query parameters added to modal iframe URLs (stripped by ModalRequestMiddleware)
+MODAL_VAR = "_modal"
+MODAL_PARENT_VAR = "_modal_parent"
+
+# Popup names follow Django's scheme: <name>__<index>
+POPUP_INDEX_RE = re.compile(r"__(\d+)$")
+
+
+@cache
+def _resolve_static(path, script_prefix):
+    return static(path)
+
+
+@cache
+def _resolve_reverse(viewname, script_prefix):
+    return reverse(viewname)
+
+
+def get_static_url(path):
+    """
+    Return the memoized static URL for a path.
+
+    Avoids repeated storage (manifest) lookups on every admin render. Keyed by
+    script prefix, since relative STATIC_URLs depend on it.
+    """
+    return _resolve_static(path, get_script_prefix())
+
+
+def get_reverse_url(viewname):
+    """Return the memoized URL for a view name (no arguments)."""
+    return _resolve_reverse(viewname, get_script_prefix())
+
+
+@cache
+def _resolve_service_worker_scope(script_prefix):
+    return get_setting("UNFOLD_MODAL_SERVICE_WORKER_SCOPE") or reverse("admin:index")
+
+
+def get_service_worker_scope():
+    """
+    Return the URL path controlled by the service worker.
+
+    Defaults to the admin root, so the worker neither controls other pages of
+    the site nor replaces a service worker the project registers at ``/``.
+    """
+    return _resolve_service_worker_scope(get_script_prefix())
+
+
+@cache
+def _resolve_service_worker_register(script_prefix):
+    worker_query = urlencode(
+        {
+            "static": settings.STATIC_URL,
+            "v": __version__,
+            "max": get_setting("UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES"),
+        }
+    )
+    worker_url = f"{reverse('unfold_modal:service_worker')}?{worker_query}"
+    query = urlencode(
+        {"sw": worker_url, "scope": _resolve_service_worker_scope(script_prefix)}
+    )
+    return f"{static('unfold_modal/js/service_worker_register.js')}?{query}"
+
+
+@cache
+def _resolve_modal_loader(with_config, script_prefix):
+    scripts = [
+        static("unfold_modal/js/modal_core.js"),
+        static("unfold_modal/js/related_modal.js"),
+        static("unfold_modal/js/popup_iframe.js"),
+    ]
+    if with_config:
+        scripts.insert(0, reverse("unfold_modal:config_js"))
+    query = urlencode(
+        [("css", static("unfold_modal/css/modal.css"))]
+        + [("js", url) for url in scripts]
+    )
+    return f"{static('unfold_modal/js/loader.js')}?{query}"
+
+
+def clear_asset_url_cache():
+    """Clear memoized asset URLs (called on ``setting_changed``)."""
+    _resolve_static.cache_clear()
+    _resolve_reverse.cache_clear()
+    _resolve_service_worker_scope.cache_clear()
+    _resolve_service_worker_register.cache_clear()
+    _resolve_modal_loader.cache_clear()
 
 
 def get_modal_styles():
@@ -25,7 +124,7 @@ def get_modal_styles():
         }
     """
     return [
-        lambda request: static("unfold_modal/css/modal.css"),
+        lambda request: get_static_url("unfold_modal/css/modal.css"),
     ]
 
 
@@ -59,11 +158,11 @@ def get_modal_scripts():
     """
     return [
         # Core module (state, utilities, DOM creation) - must load first
-        lambda request: static("unfold_modal/js/modal_core.js"),
+        lambda request: get_static_url("unfold_modal/js/modal_core.js"),
         # Main modal script
-        lambda request: static("unfold_modal/js/related_modal.js"),
+        lambda request: get_static_url("unfold_modal/js/related_modal.js"),
         # Popup iframe script
-        lambda request: static("unfold_modal/js/popup_iframe.js"),
+        lambda request: get_static_url("unfold_modal/js/popup_iframe.js"),
     ]
 
 
@@ -90,11 +189,211 @@ def get_modal_scripts_with_config():
     """
     return [
         # Config script (dynamic, sets window.UNFOLD_MODAL_CONFIG)
-        lambda request: reverse("unfold_modal:config_js"),
+        lambda request: get_reverse_url("unfold_modal:config_js"),
         # Core module (state, utilities, DOM creation) - must load first
-        lambda request: static("unfold_modal/js/modal_core.js"),
+        lambda request: get_static_url("unfold_modal/js/modal_core.js"),
         # Main modal script
-        lambda request: static("unfold_modal/js/related_modal.js"),
+        lambda request: get_static_url("unfold_modal/js/related_modal.js"),
         # Popup iframe script
-        lambda request: static("unfold_modal/js/popup_iframe.js"),
+        lambda request: get_static_url("unfold_modal/js/popup_iframe.js"),
+    ]
+
+
+def get_modal_loader_scripts():
+    """
+    Return a script callable for the on-demand modal loader.
+
+    Use instead of get_modal_styles() and get_modal_scripts(): the loader is
+    a tiny script that loads modal.css and the modal scripts on the first
+    related-widget click (replaying it) or when the browser is idle, so
+    admin pages do not block first paint on modal code. Modal iframes load
+    them immediately.
+
+    Example:
+        from unfold_modal.utils import get_modal_loader_scripts
+
+        UNFOLD = {
+            "SCRIPTS": [
+                *get_modal_loader_scripts(),
+            ],
+        }
+    """
+    return [
+        lambda request: _resolve_modal_loader(False, get_script_prefix()),
     ]
+
+
+def get_modal_loader_scripts_with_config():
+    """
+    Return the on-demand loader callable, loading the config endpoint first.
+
+    Use instead of get_modal_styles() and get_modal_scripts_with_config()
+    when the app's URLs are included in your ROOT_URLCONF.
+    """
+    return [
+        lambda request: _resolve_modal_loader(True, get_script_prefix()),
+    ]
+
+
+def get_permission_fingerprint(user):
+    """
+    Return a short, stable hash of a user's identity and permissions.
+
+    Used to key cached or conditional popup responses so that users with
+    different permissions never share a cached representation.
+
+    Args:
+        user: The request user (may be anonymous).
+
+    Returns:
+        str: A 16 character hex digest.
+    """
+    perms = sorted(user.get_all_permissions()) if user.is_active else []
+    raw = f"{user.pk}:{user.is_superuser}:{','.join(perms)}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def get_service_worker_scripts():
+    """
+    Return a script callable that registers the static asset service worker.
+
+    The worker caches hashed static files (ManifestStaticFilesStorage)
+    cache-first for the admin page and all modal iframes, so nested modals do
+    not revalidate the same CSS/JS/fonts. HTML views are never cached. At most
+    UNFOLD_MODAL_SERVICE_WORKER_MAX_ENTRIES files are kept; the least recently
+    used ones are evicted.
+
+    Requires the app's URLs in your ROOT_URLCONF:
+
+        path("unfold-modal/", include("unfold_modal.urls")),
+
+    Example:
+        from unfold_modal.utils import get_modal_scripts, get_service_worker_scripts
+
+        UNFOLD = {
+            "SCRIPTS": [
+                *get_modal_scripts(),
+                *get_service_worker_scripts(),
+            ],
+        }
+    """
+    return [
+        lambda request: _resolve_service_worker_register(get_script_prefix()),
+    ]
+
+
+def is_popup_request(request):
+    """Return True if the request targets an admin popup (``_popup`` set)."""
+    # Imported lazily: this module is imported from settings files
+    from django.contrib.admin.options import IS_POPUP_VAR
+
+    return IS_POPUP_VAR in request.GET
+
+
+def get_popup_assets(request):
+    """
+    Return the (url, kind) pairs a popup page loads from Unfold's config.
+
+    Collects UNFOLD["STYLES"] and UNFOLD["SCRIPTS"] (callables or strings)
+    plus the modal helpers, de-duplicated in load order. ``kind`` is
+    ``"style"`` or ``"script"``.
+    """
+    unfold_config = getattr(settings, "UNFOLD", {})
+    sources = [
+        ("style", [*unfold_config.get("STYLES", []), *get_modal_styles()]),
+        ("script", [*unfold_config.get("SCRIPTS", []), *get_modal_scripts()]),
+    ]
+
+    assets = {}
+    for kind, items in sources:
+        for item in items:
+            url = item(request) if callable(item) else item
+            if url:
+                assets.setdefault(str(url), kind)
+    return list(assets.items())
+
+
+class ModalRequest(NamedTuple):
+    """Classification of a request, set as ``request.unfold_modal``."""
+
+    mode: str  # "modal" (unfold_modal iframe), "popup" (window.open) or "page"
+    depth: int  # Nesting level (1 = opened from a regular page, 0 for pages)
+    name: str  # Popup name, e.g. "id_country__2"
+    parent: str  # Popup name of the modal that opened this one
+
+    @property
+    def is_modal(self):
+        return self.mode == "modal"
+
+
+def classify_request(request):
+    """
+    Classify a request as modal iframe, legacy popup window or regular page.
+
+    Modal iframes are recognized by the ``_modal`` parameter the frontend adds
+    to iframe URLs, or by the ``Sec-Fetch-Dest: iframe`` header.
+
+    Returns:
+        ModalRequest
+    """
+    if not is_popup_request(request):
+        return ModalRequest("page", 0, "", "")
+
+    name = request.GET.get(MODAL_VAR, "")
+    parent = request.GET.get(MODAL_PARENT_VAR, "")
+    match = POPUP_INDEX_RE.search(name)
+    depth = int(match.group(1)) if match else 1
+
+    if name or request.headers.get("Sec-Fetch-Dest") == "iframe":
+        return ModalRequest("modal", depth, name, parent)
+    return ModalRequest("popup", depth, name, parent)
+
+
+def get_modal_request(request):
+    """Return ``request.unfold_modal``, classifying the request if unset."""
+    info = getattr(request, "unfold_modal", None)
+    if info is None:
+        info = classify_request(request)
+    return info
+
+
+def skip_in_modal(callback=None, default=None):
+    """
+    Wrap an Unfold callback so it is not run for modal iframe requests.
+
+    Use for expensive callbacks in the UNFOLD setting whose output is not
+    shown inside modals. Unfold only imports ``GLOBAL_CALLBACK`` from a
+    dotted path, so decorate the callback where it is defined and keep
+    referencing it by path. Keys whose values may be callables
+    (``ENVIRONMENT``, ``SITE_TITLE``, ``SITE_HEADER``, ``SITE_URL``, ...)
+    also accept the wrapped callable directly.
+
+    Args:
+        callback: A callable taking the request, or its dotted import path.
+        default: Value returned for modal requests.
+
+    Example:
+        # myproject/utils.py
+        @skip_in_modal
+        def global_callback(request):
+            return {"notification_count": Notification.objects.count()}
+
+        # settings.py
+        UNFOLD = {
+            "GLOBAL_CALLBACK": "myproject.utils.global_callback",
+            "ENVIRONMENT": skip_in_modal("myproject.utils.environment_callback"),
+        }
+    """
+    if callback is None:
+        # Used as @skip_in_modal(default=...)
+        return lambda func: skip_in_modal(func, default)
+
+    def wrapper(request, *args, **kwargs):
+        if get_modal_request(request).is_modal:
+            return default
+        func = import_string(callback) if isinstance(callback, str) else callback
+        return func(request, *args, **kwargs)
+
+    if callable(callback):
+        update_wrapper(wrapper, callback)
+    return wrapper
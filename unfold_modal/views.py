@@ -1,10 +1,30 @@
 """Views for unfold-modal."""
 
-import json
+import hashlib
+from datetime import datetime, timezone
+from functools import cache
+from pathlib import Path
 
-from django.http import HttpResponse
+from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.response import TemplateResponse
 
-from .apps import UnfoldModalConfig, get_setting
+from .apps import get_modal_config_js, get_setting
+from .mixins import AutocompleteCacheMixin, get_lookup_cache, get_lookup_cache_versions
+from .profiling import get_profile_store, to_collapsed
+from .utils import get_permission_fingerprint, get_service_worker_scope
+
+SERVICE_WORKER_PATH = (
+    Path(__file__).resolve().parent / "static/unfold_modal/js/service_worker.js"
+)
+
+
+@cache
+def _read_service_worker():
+    return SERVICE_WORKER_PATH.read_text(encoding="utf-8")
 
 
 def modal_config_js(request):
@@ -13,23 +33,158 @@ def modal_config_js(request):
 
     This view returns a small JS snippet that sets up window.UNFOLD_MODAL_CONFIG
     with the current settings. Include this in UNFOLD["SCRIPTS"] before the
-    main modal script.
+    main modal script. The snippet is compiled once and cached until settings
+    change.
+    """
+    return HttpResponse(get_modal_config_js(), content_type="application/javascript")
+
+
+def service_worker_js(request):
+    """
+    Serve the static asset service worker.
+
+    The worker source ships as a static file but is served through this view
+    so it can control admin pages outside its own directory
+    (``Service-Worker-Allowed``, limited to the worker scope). It is revalidated on every registration
+    check, so new package versions take effect immediately.
     """
-    size_preset = get_setting("UNFOLD_MODAL_SIZE")
-    resize_enabled = get_setting("UNFOLD_MODAL_RESIZE")
-    disable_header = get_setting("UNFOLD_MODAL_DISABLE_HEADER")
+    response = HttpResponse(
+        _read_service_worker(), content_type="application/javascript"
+    )
+    response["Service-Worker-Allowed"] = get_service_worker_scope()
+    response["Cache-Control"] = "no-cache"
+    return response
 
-    # Get dimensions from preset or use default
-    presets = UnfoldModalConfig.SIZE_PRESETS
-    dimensions = presets.get(size_preset, presets["default"])
 
-    config = {
-        "size": size_preset,
-        "dimensions": dimensions,
-        "resize": resize_enabled,
-        "disableHeader": disable_header,
+def _check_superuser(request):
+    if not request.user.is_superuser:
+        raise PermissionDenied
+
+
+@staff_member_required
+def profile_list(request):
+    """
+    List the request profiles recorded by ModalProfilerMiddleware.
+
+    Superusers only; profiles contain source paths and request URLs.
+    """
+    _check_superuser(request)
+    profiles = get_profile_store().list()
+    for profile in profiles:
+        profile["created"] = datetime.fromtimestamp(profile["created"], tz=timezone.utc)
+
+    context = {
+        **admin.site.each_context(request),
+        "title": "Modal request profiles",
+        "profiles": profiles,
     }
+    return TemplateResponse(request, "unfold_modal/profile_list.html", context)
+
+
+@staff_member_required
+def profile_download(request, name):
+    """Download a profile as collapsed stacks (speedscope, flamegraph.pl)."""
+    _check_superuser(request)
+    profile = get_profile_store().load(name)
+    if profile is None:
+        raise Http404("Profile not found")
+
+    response = HttpResponse(
+        to_collapsed(profile["samples"]), content_type="text/plain; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.folded"'
+    return response
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    """
+    Admin autocomplete view with cached results.
+
+    Select2 widgets in the page and in every modal iframe query the
+    autocomplete view on each keystroke. This view:
+
+    - Answers non-empty terms shorter than
+      ``UNFOLD_MODAL_AUTOCOMPLETE_MIN_TERM_LENGTH`` (default 2) with no
+      results, without querying. The empty term (a dropdown opening) is
+      always served, and cached like any other term.
+    - Caches results for related models whose ModelAdmin uses
+      AutocompleteCacheMixin, keyed by source field, term, page, permission
+      fingerprint, language and the cache versions of the mixin's models, so
+      saving or deleting an object invalidates them.
+
+    Install it as the admin site's autocomplete view:
+
+        class AdminSite(UnfoldAdminSite):
+            def autocomplete_view(self, request):
+                return CachedAutocompleteJsonView.as_view(admin_site=self)(request)
+
+    or, for the default site, route it before the admin URLs:
+
+        path(
+            "admin/autocomplete/",
+            admin.site.admin_view(
+                CachedAutocompleteJsonView.as_view(admin_site=admin.site)
+            ),
+        ),
+    """
+
+    def get(self, request, *args, **kwargs):
+        (
+            self.term,
+            self.model_admin,
+            self.source_field,
+            to_field_name,
+        ) = self.process_request(request)
+
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        min_length = get_setting("UNFOLD_MODAL_AUTOCOMPLETE_MIN_TERM_LENGTH")
+        if 0 < len(self.term.strip()) < min_length:
+            return JsonResponse({"results": [], "pagination": {"more": False}})
+
+        if not isinstance(self.model_admin, AutocompleteCacheMixin):
+            return self.get_results_response(to_field_name)
+
+        cache = get_lookup_cache()
+        cache_key = self.get_cache_key(request)
+        content = cache.get(cache_key)
+        if content is None:
+            response = self.get_results_response(to_field_name)
+            cache.set(
+                cache_key,
+                response.content,
+                self.model_admin.get_autocomplete_cache_timeout(request),
+            )
+            return response
+        return HttpResponse(content, content_type="application/json")
 
-    js_content = f"window.UNFOLD_MODAL_CONFIG = {json.dumps(config)};"
+    def get_results_response(self, to_field_name):
+        """Query and serialize one page of results (AutocompleteJsonView.get)."""
+        self.object_list = self.get_queryset()
+        context = self.get_context_data()
+        return JsonResponse(
+            {
+                "results": [
+                    self.serialize_result(obj, to_field_name)
+                    for obj in context["object_list"]
+                ],
+                "pagination": {"more": context["page_obj"].has_next()},
+            }
+        )
 
-    return HttpResponse(js_content, content_type="application/javascript")
+    def get_cache_key(self, request):
+        parts = [
+            self.admin_site.name,
+            self.source_field.model._meta.label_lower,
+            self.source_field.name,
+            self.term,
+            request.GET.get(self.page_kwarg, "1"),
+            get_permission_fingerprint(request.user),
+            getattr(request, "LANGUAGE_CODE", ""),
+            *get_lookup_cache_versions(
+                self.model_admin.get_autocomplete_cache_models()
+            ),
+        ]
+        digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+        return f"unfold_modal:autocomplete:{digest}"